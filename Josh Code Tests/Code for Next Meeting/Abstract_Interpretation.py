@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:43:12 2026
+
+@author: joshc
+
+Deciding jumps before symbolic execution, the way the kernel verifier tracks registers
+
+    Most jumps in our programs can be decided from cheap facts (the register is a known constant, or it was
+        just ANDed down below the value it's compared to), but check_jump still asks z3 every time.
+        decide_jumps runs an abstract interpreter over the block CFG first, and Program_Holder only asks
+        the solver about the jumps it couldn't decide.
+
+    What is tracked for every register
+        A tnum (Sammy's tnum.py, on plain Python ints: the bits that are known, and a mask of the unknown ones)
+        and unsigned and signed min/max bounds, all of them at reg_size bits.  After every operation the two
+        are synced with each other, the same idea as the kernel's reg_bounds_sync.
+        None means the register might not have been set yet on some path.  Reading it would break those paths
+        (create_program stops there), so a jump reading it is never decided here, and after anything reads it
+        the register is known to be set (but could be anything) on every path that keeps going.
+
+    Operations
+        ADD, SUB, MUL, AND, OR, XOR and the shifts go through the tnum operations plus interval arithmetic on the
+        bounds (falling back to the tnum's bounds when the interval could wrap around).  DIV and MOD are
+        exact on constants, DIV and MOD by a constant shrink the bounds, END casts and byte swaps the tnum,
+        and anything else (registers loaded from memory) can be any value.  32 bit ALU instructions work on the
+        low 32 bits and zero extend.
+
+    Worklist fixpoint
+        Blocks are rerun every time the registers coming into them change.  Each jump is checked on the
+        registers coming into it: if the jump always goes (or never goes) the other edge is dead.
+        Comparisons against constants also narrow the register on each edge (r1 < 4000 after not jumping on
+        JGEXC 1 4000), which is what lets the bounds follow a loop counter.  Loops go around again until nothing
+        changes, and bounds that keep growing at a block are widened to the whole range after WIDEN_AFTER rounds,
+        so the fixpoint always ends (the tnum masks can only gain bits).
+
+    The registers coming into a block cover every visit to it along every path, so a decided jump goes the
+        same way every single time, including every trip around a loop.  The narrowing on each edge matches
+        create_program, which keeps the way every jump went in the path formula (branch_condition), so a value
+        ruled out here is one the solver can't pick on that path either.
+"""
+from Basic_Block_CFG_Creator import *
+from Memory_Model import *
+import os, sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Sammy Code Tests", "Deliverables"))
+from tnum import tnum, tnum_const, tnum_unknown, tnum_range
+
+# Times the registers coming into a block can change before growing bounds are widened
+WIDEN_AFTER = 3
+
+def signed_value(value, width):
+    return value - (value >> (width - 1) << width)
+
+def swap_bytes(value, width):
+    # Reversing the bytes only moves bits around, so it works on a tnum's value and mask one at a time
+    return int.from_bytes(value.to_bytes(width // 8, "little"), "big")
+
+class Abstract_Register:
+    def __init__(self, number, umin, umax, smin, smax):
+        """
+        Parameters
+        ----------
+        number : TYPE : tnum (Python ints)
+            Known bits (min) and unknown bits (range)
+
+        umin, umax, smin, smax : TYPE : Int
+            Unsigned and signed bounds on the register
+        """
+        self.number = number
+        self.umin, self.umax = umin, umax
+        self.smin, self.smax = smin, smax
+
+    def __eq__(self, other):
+        return isinstance(other, Abstract_Register) and \
+            (self.number.min, self.number.range, self.umin, self.umax, self.smin, self.smax) == \
+            (other.number.min, other.number.range, other.umin, other.umax, other.smin, other.smax)
+
+    def __str__(self):
+        return f'{self.number} u[{self.umin}, {self.umax}] s[{self.smin}, {self.smax}]'
+
+    def constant_value(self):
+        return self.number.min if self.number.range == 0 else None
+
+def constant_register(value, width):
+    value &= 2 ** width - 1
+    return Abstract_Register(tnum_const(value, width), value, value, signed_value(value, width), signed_value(value, width))
+
+def unknown_register(width):
+    return Abstract_Register(tnum_unknown(width), 0, 2 ** width - 1, -2 ** (width - 1), 2 ** (width - 1) - 1)
+
+def register_from_bounds(number, umin, umax, smin, smax, width):
+    """
+    Syncs the tnum with both sets of bounds (both ways, like the kernel's reg_bounds_sync)
+
+    Returns
+    -------
+    TYPE : Abstract_Register or None
+        None if nothing fits all of them (an edge that can't be taken)
+    """
+    number = tnum(number.min, number.range, width)
+    sign_bit = 2 ** (width - 1)
+    umin = max(umin, number.min)
+    umax = min(umax, number.min | number.range)
+    smin = max(smin, signed_value(number.min | (number.range & sign_bit), width))
+    smax = min(smax, signed_value(number.min | (number.range & (sign_bit - 1)), width))
+
+    # Unsigned and signed bounds agree whenever the values can't be on both sides of the sign bit
+    if smin >= 0:
+        umin, umax = max(umin, smin), min(umax, smax)
+    elif smax < 0:
+        umin, umax = max(umin, smin + 2 ** width), min(umax, smax + 2 ** width)
+    if umax < sign_bit:
+        smin, smax = max(smin, umin), min(smax, umax)
+    elif umin >= sign_bit:
+        smin, smax = max(smin, umin - 2 ** width), min(smax, umax - 2 ** width)
+
+    if umin > umax or smin > smax:
+        return None
+    number = number.intersect(tnum_range(umin, umax, width))
+    # The intersect can leave a tnum with nothing inside the bounds (known 0 with u[7, 254]), so clamp them again
+    umin, umax = max(umin, number.min), min(umax, number.min | number.range)
+    smin = max(smin, signed_value(number.min | (number.range & sign_bit), width))
+    smax = min(smax, signed_value(number.min | (number.range & (sign_bit - 1)), width))
+    if umin > umax or smin > smax:
+        return None
+    if umin == umax:
+        if (umin & ~number.range) != number.min:
+            return None
+        return constant_register(umin, width)
+    return Abstract_Register(number, umin, umax, smin, smax)
+
+def register_from_tnum(number, width):
+    return register_from_bounds(number, 0, 2 ** width - 1, -2 ** (width - 1), 2 ** (width - 1) - 1, width)
+
+def join_registers(first, second, width, widen = False):
+    if first is None or second is None:
+        return None
+    umin, umax = min(first.umin, second.umin), max(first.umax, second.umax)
+    smin, smax = min(first.smin, second.smin), max(first.smax, second.smax)
+    if widen:
+        umin = 0 if umin < first.umin else umin
+        umax = 2 ** width - 1 if umax > first.umax else umax
+        smin = -2 ** (width - 1) if smin < first.smin else smin
+        smax = 2 ** (width - 1) - 1 if smax > first.smax else smax
+    return register_from_bounds(first.number.union(second.number), umin, umax, smin, smax, width)
+
+def truncate_register(register, width):
+    # The low width bits of a register (for 32 bit instructions on bigger registers)
+    if register.umax < 2 ** width:
+        return register_from_bounds(register.number, register.umin, register.umax, -2 ** (width - 1), 2 ** (width - 1) - 1, width)
+    return register_from_tnum(register.number, width)
+
+def zero_extend_register(register, width, reg_size):
+    if width == reg_size:
+        return register
+    return register_from_bounds(register.number, register.umin, register.umax, register.umin, register.umax, reg_size)
+
+def alu_transfer(opcode, target, source, shift, width):
+    """
+    Parameters
+    ----------
+    opcode : TYPE : ALU_Op
+
+    target, source : TYPE : Abstract_Register
+        Both at width bits (target is None for a MOV into a register that isn't set yet)
+
+    shift : TYPE : Int (None for register sources)
+        input_value, which is the shift amount for immediate shifts (register shifts use the low bits of source,
+        see shift_amount)
+
+    Returns
+    -------
+    TYPE : Abstract_Register
+        Everything the target register could hold afterwards, at width bits
+    """
+    full = 2 ** width
+    smallest, largest = -2 ** (width - 1), 2 ** (width - 1) - 1
+    if opcode == ALU_Op.MOV:
+        return source
+    target_value, source_value = target.constant_value(), source.constant_value()
+
+    if opcode == ALU_Op.ADD:
+        umin, umax = target.umin + source.umin, target.umax + source.umax
+        smin, smax = target.smin + source.smin, target.smax + source.smax
+        if umax >= full:
+            umin, umax = 0, full - 1
+        if smin < smallest or smax > largest:
+            smin, smax = smallest, largest
+        return register_from_bounds(target.number.add(source.number), umin, umax, smin, smax, width)
+    if opcode == ALU_Op.SUB:
+        umin, umax = target.umin - source.umax, target.umax - source.umin
+        smin, smax = target.smin - source.smax, target.smax - source.smin
+        if umin < 0:
+            umin, umax = 0, full - 1
+        if smin < smallest or smax > largest:
+            smin, smax = smallest, largest
+        return register_from_bounds(target.number.sub(source.number), umin, umax, smin, smax, width)
+    if opcode == ALU_Op.NEG:
+        return alu_transfer(ALU_Op.SUB, constant_register(0, width), target, shift, width)
+    if opcode == ALU_Op.AND:
+        return register_from_bounds(target.number.tnum_and(source.number), 0, min(target.umax, source.umax), smallest, largest, width)
+    if opcode == ALU_Op.OR:
+        return register_from_bounds(target.number.tnum_or(source.number), max(target.umin, source.umin), full - 1, smallest, largest, width)
+    if opcode == ALU_Op.XOR:
+        return register_from_tnum(target.number.tnum_xor(source.number), width)
+    if opcode in (ALU_Op.END_LE, ALU_Op.END_BE):
+        # shift is how many bits to convert, same checks as byte_order_conversion (anything else breaks the path)
+        if shift not in (16, 32, 64) or shift > width:
+            return unknown_register(width)
+        low_bits = target.number.cast(shift // 8)
+        if opcode == ALU_Op.END_BE:
+            low_bits = tnum(swap_bytes(low_bits.min, shift), swap_bytes(low_bits.range, shift), width)
+        return register_from_tnum(low_bits, width)
+
+    if shift is not None:
+        shift &= full - 1
+    elif opcode in (ALU_Op.LSH, ALU_Op.RSH, ALU_Op.ARSH):
+        # A register shift could be any shift at all if the register isn't known
+        if source_value is None:
+            return unknown_register(width)
+        shift = source_value & (width - 1)
+    if opcode == ALU_Op.LSH:
+        if shift >= width:
+            return constant_register(0, width)
+        shifted = target.number.lshift(shift)
+        if target.umax << shift < full:
+            return register_from_bounds(shifted, target.umin << shift, target.umax << shift, smallest, largest, width)
+        return register_from_tnum(shifted, width)
+    if opcode == ALU_Op.RSH:
+        if shift >= width:
+            return constant_register(0, width)
+        return register_from_bounds(target.number.rshift(shift), target.umin >> shift, target.umax >> shift, smallest, largest, width)
+    if opcode == ALU_Op.ARSH:
+        shift = min(shift, width - 1)
+        return register_from_bounds(target.number.arshift(shift), 0, full - 1, target.smin >> shift, target.smax >> shift, width)
+
+    # The kernel defines division by 0 as 0, and modulo by 0 as leaving the target register alone
+    if opcode == ALU_Op.MUL:
+        if target.umax * source.umax < full:
+            return register_from_bounds(target.number.mult(source.number), target.umin * source.umin, target.umax * source.umax,
+                                        smallest, largest, width)
+        return register_from_tnum(target.number.mult(source.number), width)
+    if opcode == ALU_Op.DIV and source_value is not None:
+        if source_value == 0:
+            return constant_register(0, width)
+        return register_from_bounds(tnum_unknown(width), target.umin // source_value, target.umax // source_value, smallest, largest, width)
+    if opcode == ALU_Op.MOD and source_value is not None:
+        if source_value == 0:
+            return target
+        if target_value is not None:
+            return constant_register(target_value % source_value, width)
+        return register_from_bounds(tnum_unknown(width), 0, min(target.umax, source_value - 1), smallest, largest, width)
+    return unknown_register(width)
+
+def jump_taken(opcode, target, source, width, same_register = False):
+    """
+    Parameters
+    ----------
+    same_register : TYPE : Boolean, optional
+        The jump compares a register with itself, so both sides are the same value (not just the same bounds)
+
+    Returns
+    -------
+    TYPE : Boolean or None
+        True if the jump is always taken, False if it never is, None if it depends
+    """
+    if opcode == Jump_Condition.JA:
+        return True
+    if same_register and opcode != Jump_Condition.JSET:
+        return opcode in (Jump_Condition.JEQ, Jump_Condition.JGE, Jump_Condition.JLE, Jump_Condition.JSGE, Jump_Condition.JSLE)
+    if opcode in (Jump_Condition.JEQ, Jump_Condition.JNE):
+        target_value, source_value = target.constant_value(), source.constant_value()
+        if target_value is not None and source_value is not None:
+            equal = target_value == source_value
+        elif target.umax < source.umin or target.umin > source.umax or target.smax < source.smin or target.smin > source.smax or \
+                (target.number.min ^ source.number.min) & ~(target.number.range | source.number.range):
+            equal = False
+        else:
+            return None
+        return equal if opcode == Jump_Condition.JEQ else not equal
+    if opcode == Jump_Condition.JSET:
+        if same_register:
+            return True if target.umin > 0 else (False if target.umax == 0 else None)
+        if target.number.min & source.number.min:
+            return True
+        if (target.number.min | target.number.range) & (source.number.min | source.number.range) == 0:
+            return False
+        return None
+
+    # (always true, never true) for target > source style comparisons, on the unsigned or signed bounds
+    comparisons = {
+        Jump_Condition.JGT:  (target.umin > source.umax, target.umax <= source.umin),
+        Jump_Condition.JGE:  (target.umin >= source.umax, target.umax < source.umin),
+        Jump_Condition.JLT:  (target.umax < source.umin, target.umin >= source.umax),
+        Jump_Condition.JLE:  (target.umax <= source.umin, target.umin > source.umax),
+        Jump_Condition.JSGT: (target.smin > source.smax, target.smax <= source.smin),
+        Jump_Condition.JSGE: (target.smin >= source.smax, target.smax < source.smin),
+        Jump_Condition.JSLT: (target.smax < source.smin, target.smin >= source.smax),
+        Jump_Condition.JSLE: (target.smax <= source.smin, target.smin > source.smax),
+    }
+    if opcode not in comparisons:
+        return None
+    always, never = comparisons[opcode]
+    return True if always else (False if never else None)
+
+def narrow_on_edge(opcode, target, constant, taken, width):
+    """
+    What target can still hold after a jump against a constant goes (taken) or falls through
+
+    Returns
+    -------
+    TYPE : Abstract_Register or None
+        None if target can't go that way at all
+    """
+    largest_unsigned, smallest, largest = 2 ** width - 1, -2 ** (width - 1), 2 ** (width - 1) - 1
+    signed_constant = signed_value(constant, width)
+    if (opcode == Jump_Condition.JEQ and taken) or (opcode == Jump_Condition.JNE and not taken):
+        equal = register_from_bounds(target.number, constant, constant, signed_constant, signed_constant, width)
+        return equal
+
+    # Bounds the register ends up inside: (umin, umax, smin, smax)
+    inside = {
+        (Jump_Condition.JGT, True): (constant + 1, largest_unsigned, smallest, largest),
+        (Jump_Condition.JGT, False): (0, constant, smallest, largest),
+        (Jump_Condition.JGE, True): (constant, largest_unsigned, smallest, largest),
+        (Jump_Condition.JGE, False): (0, constant - 1, smallest, largest),
+        (Jump_Condition.JLT, True): (0, constant - 1, smallest, largest),
+        (Jump_Condition.JLT, False): (constant, largest_unsigned, smallest, largest),
+        (Jump_Condition.JLE, True): (0, constant, smallest, largest),
+        (Jump_Condition.JLE, False): (constant + 1, largest_unsigned, smallest, largest),
+        (Jump_Condition.JSGT, True): (0, largest_unsigned, signed_constant + 1, largest),
+        (Jump_Condition.JSGT, False): (0, largest_unsigned, smallest, signed_constant),
+        (Jump_Condition.JSGE, True): (0, largest_unsigned, signed_constant, largest),
+        (Jump_Condition.JSGE, False): (0, largest_unsigned, smallest, signed_constant - 1),
+        (Jump_Condition.JSLT, True): (0, largest_unsigned, smallest, signed_constant - 1),
+        (Jump_Condition.JSLT, False): (0, largest_unsigned, signed_constant, largest),
+        (Jump_Condition.JSLE, True): (0, largest_unsigned, smallest, signed_constant),
+        (Jump_Condition.JSLE, False): (0, largest_unsigned, signed_constant + 1, largest),
+    }.get((opcode, taken))
+    if inside is None:
+        return target
+    umin, umax, smin, smax = inside
+    return register_from_bounds(target.number, max(target.umin, umin), min(target.umax, umax),
+                                max(target.smin, smin), min(target.smax, smax), width)
+
+def read_source(instruction, registers, num_regs, reg_size):
+    # The source as an Abstract_Register (None if it might not be set, or the constant doesn't fit)
+    if instruction.input_value_is_const:
+        if instruction.input_value_concrete is None:
+            return None
+        return constant_register(instruction.input_value_concrete, reg_size)
+    if instruction.input_value >= num_regs:
+        return None
+    return registers[instruction.input_value]
+
+def set_register(registers, register_number, value):
+    if register_number >= len(registers):
+        return registers
+    return registers[:register_number] + (value,) + registers[register_number + 1:]
+
+def run_block(block, registers, num_regs, reg_size):
+    """
+    Returns
+    -------
+    registers : TYPE : Tuple of Abstract_Registers (or None)
+        After every instruction but the jump at the end
+
+    jump : TYPE : Instruction_Info object or None
+        The jump at the end of the block
+    """
+    for instruction in block.block_instructions:
+        if instruction.instruction_class == Instruction_Class.JUMP:
+            return registers, instruction
+        if instruction.instruction_class == Instruction_Class.EXIT:
+            continue
+        if instruction.instruction_class == Instruction_Class.STORE:
+            # Anything read here is set on every path that keeps going (the others broke)
+            for register_number in [instruction.target_reg] + ([] if instruction.input_value_is_const else [instruction.input_value]):
+                if register_number < num_regs and registers[register_number] is None:
+                    registers = set_register(registers, register_number, unknown_register(reg_size))
+            continue
+        if instruction.instruction_class == Instruction_Class.LOAD:
+            if instruction.input_value < num_regs and registers[instruction.input_value] is None:
+                registers = set_register(registers, instruction.input_value, unknown_register(reg_size))
+            # Loads zero extend whatever bytes they read
+            loaded = register_from_tnum(tnum_unknown(reg_size).cast(instruction.opcode), reg_size)
+            registers = set_register(registers, instruction.target_reg, loaded)
+            continue
+
+        source = read_source(instruction, registers, num_regs, reg_size)
+        target = registers[instruction.target_reg] if instruction.target_reg < num_regs else None
+        if source is None or (target is None and instruction.opcode != ALU_Op.MOV):
+            if not instruction.input_value_is_const and instruction.input_value < num_regs:
+                registers = set_register(registers, instruction.input_value, unknown_register(reg_size))
+            registers = set_register(registers, instruction.target_reg, unknown_register(reg_size))
+            continue
+        width = 32 if instruction.bit_size == 32 and reg_size > 32 else reg_size
+        if width != reg_size:
+            source = truncate_register(source, width)
+            target = truncate_register(target, width) if target is not None else None
+            if source is None or (target is None and instruction.opcode != ALU_Op.MOV):
+                # Nothing fits the low bits, so this path can't really get here (keep going as if it could be anything)
+                registers = set_register(registers, instruction.target_reg, unknown_register(reg_size))
+                continue
+        shift = None if instruction.source_kind == Source_Kind.REGISTER else instruction.input_value
+        new_value = alu_transfer(instruction.opcode, target, source, shift, width)
+        registers = set_register(registers, instruction.target_reg, zero_extend_register(new_value, width, reg_size))
+    return registers, None
+
+def edge_registers(jump, registers, taken, num_regs, reg_size):
+    # Registers going down one edge of the jump (None if that edge can't be taken)
+    if jump.opcode == Jump_Condition.JA:
+        return registers
+    source = read_source(jump, registers, num_regs, reg_size)
+    target = registers[jump.target_reg] if jump.target_reg < num_regs else None
+    if source is None or target is None:
+        for register_number in (jump.target_reg, None if jump.input_value_is_const else jump.input_value):
+            if register_number is not None and register_number < num_regs and registers[register_number] is None:
+                registers = set_register(registers, register_number, unknown_register(reg_size))
+        return registers
+    if jump.bit_size == 32 and reg_size > 32 or source.constant_value() is None:
+        return registers
+    narrowed = narrow_on_edge(jump.opcode, target, source.constant_value(), taken, reg_size)
+    if narrowed is None:
+        return None
+    return set_register(registers, jump.target_reg, narrowed)
+
+def decide_jumps(block_graph, start_block, num_regs, reg_size, entry_values = {}):
+    """
+    Parameters
+    ----------
+    block_graph : TYPE : nx.DiGraph or Array_Block_Graph
+        The block CFG
+
+    start_block : TYPE : Basic_Block object
+
+    num_regs, reg_size : TYPE : Int
+
+    entry_values : TYPE : Dict, optional
+        register number -> value for registers set before the program starts (the entry pointers)
+
+    Returns
+    -------
+    jump_decisions : TYPE : Dict (Basic_Block -> Boolean)
+        For every jump the analysis decided, what check_jump would have said: True to fall through
+        to the next instruction, False to take the jump.  Jumps that depend on the values are left out.
+    """
+    start_registers = tuple(constant_register(entry_values[register_number], reg_size) if register_number in entry_values else None
+                            for register_number in range(num_regs))
+    registers_before = {start_block: start_registers}
+    changes = {}
+    jump_decisions = {}
+    work_list = [start_block]
+    while work_list:
+        block = work_list.pop()
+        registers, jump = run_block(block, registers_before[block], num_regs, reg_size)
+
+        # (next block, registers going into it) for every edge that can be taken
+        edges = []
+        if len(block.output_links) == 0 or block.block_instructions[-1].instruction_class == Instruction_Class.EXIT:
+            pass
+        elif jump is None:
+            edges = [(next_block, registers) for next_block in block_graph.successors(block)]
+        else:
+            taken = None
+            width = 32 if jump.bit_size == 32 and reg_size > 32 else reg_size
+            source = read_source(jump, registers, num_regs, reg_size)
+            target = registers[jump.target_reg] if jump.target_reg < num_regs else None
+            if jump.opcode == Jump_Condition.JA or jump.offset == 0:
+                taken = True
+            elif source is not None and target is not None:
+                if width != reg_size:
+                    source, target = truncate_register(source, width), truncate_register(target, width)
+                # (None after truncating means nothing fits the low bits, so the jump is left to the solver)
+                if source is not None and target is not None:
+                    same_register = not jump.input_value_is_const and jump.input_value == jump.target_reg
+                    taken = jump_taken(jump.opcode, target, source, width, same_register)
+            jump_decisions[block] = None if taken is None else not taken
+            fall_through_block, jump_block = branch_successors(block_graph, block)
+            if jump.offset == 0:
+                # Both ways end up at the next block, so there's nothing to narrow
+                edges = [(fall_through_block, registers)] if fall_through_block is not None else []
+            else:
+                for next_block, falls_through in ((fall_through_block, True), (jump_block, False)):
+                    if next_block is None or (taken is not None and taken == falls_through):
+                        continue
+                    edges.append((next_block, edge_registers(jump, registers, not falls_through, num_regs, reg_size)))
+
+        for next_block, next_registers in edges:
+            if next_registers is None:
+                continue
+            old_registers = registers_before.get(next_block)
+            if old_registers is None:
+                registers_before[next_block] = next_registers
+                work_list.append(next_block)
+                continue
+            widen = changes.get(next_block, 0) >= WIDEN_AFTER
+            joined = tuple(join_registers(old, new, reg_size, widen) for old, new in zip(old_registers, next_registers))
+            if joined != old_registers:
+                changes[next_block] = changes.get(next_block, 0) + 1
+                registers_before[next_block] = joined
+                work_list.append(next_block)
+    return {block: decision for block, decision in jump_decisions.items() if decision is not None}
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:11:38 2026
+
+@author: joshc
+
+Compact array backend for the control flow graphs in Basic_Block_CFG_Creator
+
+    For 100k+ instruction programs, an nx.DiGraph with a full Basic_Block object as every node
+        spends a lot of memory on per node/per edge dictionaries.  These graphs hold the same edges
+        as integer arrays (CSR style), indexed by instruction number or block id:
+
+        successor_offsets[node] to successor_offsets[node + 1] is the slice of successor_targets
+            holding the nodes that node links to (predecessors are stored the same way)
+
+    Only the parts of the nx.DiGraph interface that the verifier actually uses are here
+        (successors, predecessors, edges, in_edges, iterating over the nodes), so Program_Holder
+        and phi_function_locations work the same on either backend.
+
+    to_networkx makes a normal nx.DiGraph copy, for drawing the graph
+"""
+from array import array
+import networkx as nx
+
+def csr_from_edges(number_of_nodes, edge_starts, edge_ends):
+    """
+    Parameters
+    ----------
+    number_of_nodes : TYPE : Int
+        Nodes are numbered 0 to number_of_nodes - 1
+
+    edge_starts, edge_ends : TYPE : array of ints
+        Edge i goes from edge_starts[i] to edge_ends[i]
+
+    Returns
+    -------
+    offsets : TYPE : array of ints (length number_of_nodes + 1)
+        Where each node's targets start in targets
+
+    targets : TYPE : array of ints (length of the edge list)
+        Edge end points, grouped by start node, in the order the edges were given
+    """
+    offsets = array('l', bytes(array('l').itemsize * (number_of_nodes + 1)))
+    for start in edge_starts:
+        offsets[start + 1] += 1
+    for node in range(number_of_nodes):
+        offsets[node + 1] += offsets[node]
+
+    targets = array('l', bytes(array('l').itemsize * len(edge_starts)))
+    next_slot = offsets[:-1]
+    for start, end in zip(edge_starts, edge_ends):
+        targets[next_slot[start]] = end
+        next_slot[start] += 1
+    return offsets, targets
+
+class Array_Instruction_Graph:
+    def __init__(self, number_of_instructions, edge_starts, edge_ends):
+        """
+        Parameters
+        ----------
+        number_of_instructions : TYPE : Int
+            How many nodes the graph needs (jump targets past the end of the program still get a node)
+
+        edge_starts, edge_ends : TYPE : array of ints
+            Instruction number pairs for each link between instructions
+        """
+        self.number_of_nodes = number_of_instructions
+        self.successor_offsets, self.successor_targets = \
+            csr_from_edges(number_of_instructions, edge_starts, edge_ends)
+        self.predecessor_offsets, self.predecessor_targets = \
+            csr_from_edges(number_of_instructions, edge_ends, edge_starts)
+
+    def successors(self, node):
+        return iter(self.successor_targets[self.successor_offsets[node]:self.successor_offsets[node + 1]])
+
+    def predecessors(self, node):
+        return iter(self.predecessor_targets[self.predecessor_offsets[node]:self.predecessor_offsets[node + 1]])
+
+    # Same (start, end) tuples as nx.DiGraph.edges/in_edges for a list of nodes
+    def edges(self, nodes):
+        return [(node, end) for node in nodes if node < self.number_of_nodes for end in self.successors(node)]
+
+    def in_edges(self, nodes):
+        return [(start, node) for node in nodes if node < self.number_of_nodes for start in self.predecessors(node)]
+
+    def to_networkx(self):
+        instruction_graph = nx.DiGraph()
+        for node in range(self.number_of_nodes):
+            instruction_graph.add_edges_from(self.edges([node]))
+        return instruction_graph
+
+class Array_Block_Graph:
+    def __init__(self, block_list, edge_starts, edge_ends):
+        """
+        Parameters
+        ----------
+        block_list : TYPE : List of Basic_Block objects
+            Every block in the program, where block_list[block.block_id] is block
+
+        edge_starts, edge_ends : TYPE : array of ints
+            Block id pairs for each link between blocks
+        """
+        self.block_list = block_list
+        self.successor_offsets, self.successor_targets = \
+            csr_from_edges(len(block_list), edge_starts, edge_ends)
+        self.predecessor_offsets, self.predecessor_targets = \
+            csr_from_edges(len(block_list), edge_ends, edge_starts)
+
+        # Just like the nx version, a block is only in the graph if it has an edge (or is the start block,
+            # which has none when it ends in an exit)
+        self.in_graph = array('b', bytes(len(block_list)))
+        for block_id in list(edge_starts) + list(edge_ends):
+            self.in_graph[block_id] = 1
+        self.in_graph[0] = 1
+
+    def successors(self, block):
+        block_id = block.block_id
+        for next_id in self.successor_targets[self.successor_offsets[block_id]:self.successor_offsets[block_id + 1]]:
+            yield self.block_list[next_id]
+
+    def predecessors(self, block):
+        block_id = block.block_id
+        for previous_id in self.predecessor_targets[self.predecessor_offsets[block_id]:self.predecessor_offsets[block_id + 1]]:
+            yield self.block_list[previous_id]
+
+    def edges(self):
+        return [(block, next_block) for block in self for next_block in self.successors(block)]
+
+    def __iter__(self):
+        return (block for block in self.block_list if self.in_graph[block.block_id])
+
+    def __len__(self):
+        return sum(self.in_graph)
+
+    def __contains__(self, block):
+        return self.in_graph[block.block_id] == 1
+
+    def to_networkx(self):
+        block_graph = nx.DiGraph()
+        block_graph.add_nodes_from(self)
+        block_graph.add_edges_from(self.edges())
+        return block_graph
+
+# Lets any graph function that needs networkx take either backend
+def as_networkx(graph):
+    if isinstance(graph, nx.DiGraph):
+        return graph
+    return graph.to_networkx()
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:10:12 2026
+
+@author: joshc
+
+Loads compiled eBPF bytecode straight into the Decoded_Instruction records the CFG builder takes,
+    instead of going through keyword strings or the SmartNic inst(...) text.
+
+    Raw bytecode
+        An array of 8 byte struct bpf_insn (include/uapi/linux/bpf.h):
+            u8 code, u8 dst_reg:4 src_reg:4, s16 off, s32 imm
+        The whole array is unpacked with one struct.iter_unpack over a memoryview, and each code byte
+            is looked up in opcode_table (built once, below), so nothing is ever split or parsed as text.
+
+    ELF object files (clang -target bpf -c prog.c -o prog.o)
+        Every section that is PROGBITS and executable (.text, xdp, socket, kprobe/...) is a program.
+        Relocations (map file descriptors, calls into other functions) aren't applied,
+            so a map load is just an LDDW of whatever placeholder clang left in the immediate.
+
+    LD_IMM64
+        The only 16 byte instruction: the low 32 bits of the constant in the first slot's imm, the high 32 bits
+            in the second slot's imm.  It comes out as one "LDDW dst constant" instruction holding the whole 64 bit
+            constant (Source_Kind.WIDE_IMMEDIATE), which a MOV64XC can't hold, since that only takes a 32 bit immediate.
+        Jump offsets in bytecode count 8 byte slots, and the CFG counts instructions, so every jump offset
+            is remapped around the LDDWs it jumps over.
+
+Keywords
+    Every opcode gets a keyword in the same form the rest of the verifier uses ({OP}{64|32}{XC|XY} for ALU,
+        {JOP}{32|}{XC|XY} for jumps, EXIT), even the ones FOL_from_BPF can't run yet
+        (those only break the program if they are reached, the same as any other unsupported keyword).
+    Memory instructions are LDX{size}, ST{size}, STX{size}, ATOMIC{op}{size}, LDABS{size}, LDIND{size}
+        with size B, H, W or DW, and keep their memory offset in the offset field.
+    encode_bpf_instructions goes the other way, so keyword programs can be written out as bytecode.
+"""
+import struct
+from Basic_Block_CFG_Creator import *
+
+BPF_INSTRUCTION_SIZE = 8
+
+# Instruction classes (code & 0x07)
+BPF_LD, BPF_LDX, BPF_ST, BPF_STX, BPF_ALU, BPF_JMP, BPF_JMP32, BPF_ALU64 = range(8)
+
+# Source bit for ALU/jumps (0 uses imm, BPF_X uses src_reg)
+BPF_X = 0x08
+
+# BPF_LD | BPF_IMM | BPF_DW
+LD_IMM64 = 0x18
+
+alu_operation_names = {0x00: "ADD", 0x10: "SUB", 0x20: "MUL", 0x30: "DIV", 0x40: "OR", 0x50: "AND", 0x60: "LSH", 0x70: "RSH",
+                       0x80: "NEG", 0x90: "MOD", 0xa0: "XOR", 0xb0: "MOV", 0xc0: "ARSH", 0xd0: "END"}
+jump_operation_names = {0x10: "JEQ", 0x20: "JGT", 0x30: "JGE", 0x40: "JSET", 0x50: "JNE", 0x60: "JSGT", 0x70: "JSGE",
+                        0xa0: "JLT", 0xb0: "JLE", 0xc0: "JSLT", 0xd0: "JSLE"}
+BPF_JA, BPF_CALL, BPF_EXIT = 0x00, 0x80, 0x90
+
+memory_size_names = {0x00: "W", 0x08: "H", 0x10: "B", 0x18: "DW"}
+BPF_IMM, BPF_ABS, BPF_IND, BPF_MEM, BPF_ATOMIC = 0x00, 0x20, 0x40, 0x60, 0xc0
+
+# Where an instruction's input value and offset come from, as places in a (src, imm, off, 0) tuple
+SRC, IMM, OFF, NONE = range(4)
+
+def build_bpf_opcode_table():
+    """
+    Returns
+    -------
+    opcode_table : TYPE : List of Tuples (one per code byte, None for codes with no meaning)
+        (keyword, input_field, offset_field, is_jump), where the fields say which part of the struct
+        (SRC, IMM, OFF or NONE) holds the input value and offset, and is_jump says the offset counts
+        instruction slots (so it gets remapped).  The target register is always dst.
+    """
+    opcode_table = [None] * 256
+    for operation, name in alu_operation_names.items():
+        for instruction_class, bit_size in [(BPF_ALU, "32"), (BPF_ALU64, "64")]:
+            opcode_table[instruction_class | operation] = (f'{name}{bit_size}XC', IMM, NONE, False)
+            opcode_table[instruction_class | operation | BPF_X] = (f'{name}{bit_size}XY', SRC, NONE, False)
+    # Byte swaps: the source bit picks to_le (XC) or to_be (XY), and imm is how many bits to swap
+    for instruction_class, bit_size in [(BPF_ALU, "32"), (BPF_ALU64, "64")]:
+        opcode_table[instruction_class | 0xd0 | BPF_X] = (f'END{bit_size}XY', IMM, NONE, False)
+
+    for operation, name in jump_operation_names.items():
+        for instruction_class, bit_size in [(BPF_JMP, ""), (BPF_JMP32, "32")]:
+            opcode_table[instruction_class | operation] = (f'{name}{bit_size}XC', IMM, OFF, True)
+            opcode_table[instruction_class | operation | BPF_X] = (f'{name}{bit_size}XY', SRC, OFF, True)
+    opcode_table[BPF_JMP | BPF_JA] = ("JA", NONE, OFF, True)
+    # gotol, the 32 bit offset goes in imm
+    opcode_table[BPF_JMP32 | BPF_JA] = ("JA32", NONE, IMM, True)
+    opcode_table[BPF_JMP | BPF_CALL] = ("CALL", IMM, NONE, False)
+    opcode_table[BPF_JMP | BPF_EXIT] = ("EXIT", NONE, NONE, False)
+
+    for size, size_name in memory_size_names.items():
+        opcode_table[BPF_LDX | BPF_MEM | size] = (f'LDX{size_name}', SRC, OFF, False)
+        opcode_table[BPF_ST | BPF_MEM | size] = (f'ST{size_name}', IMM, OFF, False)
+        opcode_table[BPF_STX | BPF_MEM | size] = (f'STX{size_name}', SRC, OFF, False)
+        opcode_table[BPF_LD | BPF_ABS | size] = (f'LDABS{size_name}', IMM, NONE, False)
+        opcode_table[BPF_LD | BPF_IND | size] = (f'LDIND{size_name}', SRC, IMM, False)
+        # The atomic operation itself is in imm, load_bpf_bytecode puts it in the keyword
+        opcode_table[BPF_STX | BPF_ATOMIC | size] = (f'ATOMIC{size_name}', SRC, OFF, False)
+    return opcode_table
+
+opcode_table = build_bpf_opcode_table()
+
+def signed_32(value):
+    # Low 32 bits of value, as the s32 the imm field holds
+    return ((value & 0xffffffff) ^ 0x80000000) - 0x80000000
+
+def decode_bpf_slot(slot, little_endian):
+    """
+    Parameters
+    ----------
+    slot : TYPE : Tuple
+        (code, registers, off, imm) of one struct bpf_insn (anything but LD_IMM64)
+
+    Returns
+    -------
+    record : TYPE : Decoded_Instruction
+
+    jump_offset : TYPE : Int or None
+        The offset in slots, for instructions whose offset has to be remapped
+    """
+    code, registers, offset, imm = slot
+    # The register nibbles follow the byte order of the bitfields
+    if little_endian:
+        dst, src = registers & 0x0f, registers >> 4
+    else:
+        dst, src = registers >> 4, registers & 0x0f
+
+    decoded = opcode_table[code]
+    if decoded is None:
+        return Decoded_Instruction(f'UNKNOWN{code:02X}', dst, imm, offset), None
+    keyword, input_field, offset_field, is_jump = decoded
+    fields = (src, imm, offset, 0)
+    if code & 0xe7 == BPF_STX | BPF_ATOMIC:
+        # ATOMIC00DW (add), ATOMICE1W (xchg)... in hex, so no operation name gets mistaken for an ALU keyword
+        keyword = f'ATOMIC{imm & 0xff:02X}{keyword[6:]}'
+    record = Decoded_Instruction(keyword, dst, fields[input_field], fields[offset_field])
+    return record, fields[offset_field] if is_jump else None
+
+def load_bpf_bytecode(bytecode, byte_order = "<"):
+    """
+    Parameters
+    ----------
+    bytecode : TYPE : bytes, bytearray or memoryview
+        An array of struct bpf_insn
+
+    byte_order : TYPE : String, optional
+        "<" for little endian (x86, arm64, what clang makes by default), ">" for big endian
+
+    Returns
+    -------
+    instructions : TYPE : List of Decoded_Instruction records
+        One per instruction (LD_IMM64 is a single LDDW), with jump offsets counting instructions.
+        Records can't be changed, so every copy of the same 8 bytes shares one record (unless a jump needed remapping)
+    """
+    view = memoryview(bytecode).cast("B")
+    if len(view) % BPF_INSTRUCTION_SIZE != 0:
+        raise ValueError(f'Bytecode is {len(view)} bytes, which isn\'t a whole number of {BPF_INSTRUCTION_SIZE} byte instructions')
+    slots = list(struct.iter_unpack(byte_order + "BBhi", view))
+
+    little_endian = byte_order == "<"
+    decoded_slots = {}
+    instructions = []
+    jump_targets = []
+    instruction_of_slot = [None] * (len(slots) + 1)
+    second_half = False
+    for slot_number, slot in enumerate(slots):
+        if second_half:
+            second_half = False
+            continue
+        instruction_number = len(instructions)
+        instruction_of_slot[slot_number] = instruction_number
+        
+        if slot[0] == LD_IMM64:
+            if slot_number + 1 == len(slots):
+                raise ValueError(f'LD_IMM64 at slot {slot_number} is missing its second half')
+            dst = slot[1] & 0x0f if little_endian else slot[1] >> 4
+            constant = (slot[3] & 0xffffffff) | (slots[slot_number + 1][3] << 32)
+            instructions.append(Decoded_Instruction("LDDW", dst, constant, 0))
+            second_half = True
+            continue
+
+        decoded = decoded_slots.get(slot)
+        if decoded is None:
+            decoded = decoded_slots[slot] = decode_bpf_slot(slot, little_endian)
+        record, jump_offset = decoded
+        instructions.append(record)
+        if jump_offset is not None:
+            jump_targets.append((instruction_number, slot_number + 1 + jump_offset))
+    instruction_of_slot[len(slots)] = len(instructions)
+
+    # Slot offsets -> instruction offsets (only different if the jump goes over an LD_IMM64)
+    for instruction_number, target_slot in jump_targets:
+        if not 0 <= target_slot <= len(slots) or instruction_of_slot[target_slot] is None:
+            raise ValueError(f'Jump at instruction {instruction_number} lands outside the program or inside an LD_IMM64')
+        offset = instruction_of_slot[target_slot] - instruction_number - 1
+        if offset != instructions[instruction_number].offset:
+            instructions[instruction_number] = instructions[instruction_number]._replace(offset = offset)
+    return instructions
+
+def bpf_elf_program_sections(elf_bytes):
+    """
+    Parameters
+    ----------
+    elf_bytes : TYPE : bytes, bytearray or memoryview
+        A 64 bit BPF ELF object file
+
+    Returns
+    -------
+    program_sections : TYPE : Dictionary (section name -> (byte order, memoryview))
+        The bytecode of every executable section with something in it, in file order
+    """
+    view = memoryview(elf_bytes).cast("B")
+    if bytes(view[:4]) != b"\x7fELF":
+        raise ValueError("Not an ELF file")
+    if view[4] != 2:
+        raise ValueError("Only 64 bit ELF files hold BPF programs")
+    byte_order = "<" if view[5] == 1 else ">"
+    machine, = struct.unpack_from(byte_order + "H", view, 18)
+    if machine != 247:
+        raise ValueError(f'ELF file is for machine {machine}, not BPF (247)')
+    section_header_offset, = struct.unpack_from(byte_order + "Q", view, 0x28)
+    header_size, number_of_sections, names_section = struct.unpack_from(byte_order + "HHH", view, 0x3a)
+
+    # (name, type, flags, offset, size) of every section
+    section_headers = []
+    for section_number in range(number_of_sections):
+        name, section_type, flags, address, offset, size, link, info, alignment, entry_size = \
+            struct.unpack_from(byte_order + "IIQQQQIIQQ", view, section_header_offset + section_number * header_size)
+        section_headers.append((name, section_type, flags, offset, size))
+    names_offset = section_headers[names_section][3]
+
+    program_sections = {}
+    for name, section_type, flags, offset, size in section_headers:
+        # SHT_PROGBITS and SHF_EXECINSTR
+        if section_type == 1 and flags & 0x4 and size > 0:
+            name_start = names_offset + name
+            name_end = bytes(view[name_start:name_start + 256]).index(b"\x00") + name_start
+            program_sections[bytes(view[name_start:name_end]).decode()] = (byte_order, view[offset:offset + size])
+    return program_sections
+
+def load_bpf_elf(elf_bytes):
+    """
+    Returns
+    -------
+    TYPE : Dictionary (section name -> List of Decoded_Instruction records)
+        Every program in the object file (see bpf_elf_program_sections)
+    """
+    return {name: load_bpf_bytecode(bytecode, byte_order)
+            for name, (byte_order, bytecode) in bpf_elf_program_sections(elf_bytes).items()}
+
+def load_bpf_file(file_path, section = None):
+    """
+    Parameters
+    ----------
+    file_path : TYPE : String
+        A clang compiled object file, or a raw (little endian) array of struct bpf_insn
+
+    section : TYPE : String, optional
+        Which program to load from an object file.  Only needed if the file holds more than one
+
+    Returns
+    -------
+    TYPE : List of Decoded_Instruction records
+        Ready for create_program (or any other function taking a keyword program)
+    """
+    with open(file_path, "rb") as bytecode_file:
+        file_bytes = bytecode_file.read()
+    if file_bytes[:4] != b"\x7fELF":
+        return load_bpf_bytecode(file_bytes)
+
+    programs = load_bpf_elf(file_bytes)
+    if section is None:
+        if len(programs) != 1:
+            raise ValueError(f'{file_path} holds programs {list(programs)}, pick one with section')
+        section = next(iter(programs))
+    return programs[section]
+
+# Keyword -> (code, input_field, offset_field, is_jump), for going back to bytecode
+keyword_opcodes = {decoded[0]: (code,) + decoded[1:] for code, decoded in enumerate(opcode_table) if decoded is not None}
+
+def split_keyword_instruction(instruction):
+    # The same parts Instruction_Info reads out of a keyword string
+    if isinstance(instruction, Decoded_Instruction):
+        return instruction
+    split_ins = instruction.split(" ")
+    if len(split_ins) == 1:
+        return Decoded_Instruction(split_ins[0], 0, 0, 0)
+    offset = int(split_ins[3]) if len(split_ins) > 3 else 0
+    return Decoded_Instruction(split_ins[0], int(split_ins[1]), get_input_value(split_ins[2]), offset)
+
+def encode_bpf_instructions(program_list, byte_order = "<"):
+    """
+    Parameters
+    ----------
+    program_list : TYPE : List of strings (or Decoded_Instruction records)
+        A keyword program
+
+    Returns
+    -------
+    TYPE : bytes
+        The same program as an array of struct bpf_insn (load_bpf_bytecode gives it back)
+    """
+    instructions = [split_keyword_instruction(instruction) for instruction in program_list]
+
+    # Instruction offsets -> slot offsets
+    slot_of_instruction = [0]
+    for instruction in instructions:
+        slot_of_instruction.append(slot_of_instruction[-1] + (2 if instruction.keyword == "LDDW" else 1))
+
+    packer = struct.Struct(byte_order + "BBhi")
+    bytecode = bytearray(packer.size * slot_of_instruction[-1])
+    for instruction_number, (keyword, target_reg, input_value, offset) in enumerate(instructions):
+        slot_start = slot_of_instruction[instruction_number] * packer.size
+        if keyword == "LDDW":
+            registers = target_reg if byte_order == "<" else target_reg << 4
+            constant = input_value & 0xffffffffffffffff
+            packer.pack_into(bytecode, slot_start, LD_IMM64, registers, 0, signed_32(constant))
+            packer.pack_into(bytecode, slot_start + packer.size, 0, 0, 0, signed_32(constant >> 32))
+            continue
+
+        atomic_operation = None
+        if keyword.startswith("ATOMIC"):
+            atomic_operation, keyword = int(keyword[6:8], 16), "ATOMIC" + keyword[8:]
+        if keyword not in keyword_opcodes:
+            raise ValueError(f'Instruction {instruction_number} ({keyword}) has no eBPF opcode')
+        code, input_field, offset_field, is_jump = keyword_opcodes[keyword]
+        if is_jump:
+            target = instruction_number + 1 + offset
+            if not 0 <= target < len(slot_of_instruction):
+                raise ValueError(f'Jump at instruction {instruction_number} lands outside the program')
+            offset = slot_of_instruction[target] - slot_of_instruction[instruction_number] - 1
+
+        fields = [0, 0, 0, 0]
+        fields[input_field] = input_value
+        fields[offset_field] = offset
+        if atomic_operation is not None:
+            fields[IMM] = atomic_operation
+        src = fields[SRC]
+        registers = target_reg | src << 4 if byte_order == "<" else target_reg << 4 | src
+        try:
+            packer.pack_into(bytecode, slot_start, code, registers, fields[OFF], fields[IMM])
+        except struct.error:
+            raise ValueError(f'Instruction {instruction_number} ({program_list[instruction_number]}) doesn\'t fit in a struct bpf_insn')
+    return bytes(bytecode)
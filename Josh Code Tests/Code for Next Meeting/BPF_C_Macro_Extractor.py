@@ -0,0 +1,544 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:49:34 2026
+
+@author: joshc
+
+get_eBPF_from_Outside_File, finally built (the plan for it is the docstring in
+    Non Meeting Stuff/Early Verifier Attempts/Translate_eBPF_Ops_to_FOL (verifier round 1).py)
+
+    Pulls eBPF programs written with the kernel's instruction macros out of C source, like sock_example.c:
+        struct bpf_insn prog[] = {
+            BPF_MOV64_REG(BPF_REG_6, BPF_REG_1),
+            BPF_LD_ABS(BPF_B, ETH_HLEN + offsetof(struct iphdr, protocol)),
+            ...
+        };
+    and the kernel verifier selftests, where each test is { "description", .insns = { ... }, ... }.
+    It is the inverse of translate_to_bpf_in_c (the current keyword form version is at the bottom of this file).
+
+Lexer
+    One regular expression pass over each file: comments are dropped, preprocessor lines (with their \\ line continuations)
+        come out whole, and every other token (names, numbers, string literals, operators) comes out on its own.
+    Braces are matched as the tokens go by, so a program is everything between the { after "bpf_insn name[] ="
+        (or ".insns =") and the } that closes it, however much nesting is in between.
+
+#define expansion
+    Object like (#define ETH_HLEN 14) and function like (#define BPF_MAP_GET(idx, dst) BPF_MOV64_REG(...), ...)
+        defines are both expanded inside programs, including defines that expand to several instructions.
+        Only defines that come before a program in the same file are used, like the C preprocessor would.
+    The kernel instruction macros themselves (instruction_macros below) are never expanded from a #define,
+        so scanning the headers that define them doesn't change anything.
+    #if/#ifdef aren't followed, every branch's defines are read and the last one wins.
+
+Decoding
+    Each instruction macro becomes the same struct bpf_insn fields its kernel definition (include/linux/filter.h) makes,
+        and the whole program goes through load_bpf_bytecode (BPF_Bytecode_Loader.py), so BPF_LD_IMM64 and friends
+        are single LDDW instructions and jump offsets are remapped around them exactly like compiled programs.
+    Operands are evaluated as C constant expressions (numbers, + - * / % << >> & | ^ ~, casts, and every BPF_* name
+        in bpf_constants), with / and % truncating toward zero like C does.  Anything else (sizeof, offsetof, helper names
+        we don't know, dividing by zero, a macro with the wrong number of operands) leaves the program with a problem
+        instead of instructions, so one odd program doesn't stop a whole source tree from being scanned.
+"""
+import ast, inspect, operator, os, re, struct
+from BPF_Bytecode_Loader import *
+
+BPF_MOV, BPF_END = 0xb0, 0xd0
+
+# Names the instruction macros take, with the values from include/uapi/linux/bpf.h
+bpf_constants = {"BPF_LD": BPF_LD, "BPF_LDX": BPF_LDX, "BPF_ST": BPF_ST, "BPF_STX": BPF_STX, "BPF_ALU": BPF_ALU,
+                 "BPF_JMP": BPF_JMP, "BPF_JMP32": BPF_JMP32, "BPF_ALU64": BPF_ALU64, "BPF_K": 0x00, "BPF_X": BPF_X,
+                 "BPF_IMM": BPF_IMM, "BPF_ABS": BPF_ABS, "BPF_IND": BPF_IND, "BPF_MEM": BPF_MEM, "BPF_ATOMIC": BPF_ATOMIC,
+                 "BPF_XADD": BPF_ATOMIC, "BPF_FETCH": 0x01, "BPF_XCHG": 0xe1, "BPF_CMPXCHG": 0xf1,
+                 "BPF_TO_LE": 0x00, "BPF_TO_BE": 0x08, "BPF_FROM_LE": 0x00, "BPF_FROM_BE": 0x08,
+                 "BPF_JA": BPF_JA, "BPF_CALL": BPF_CALL, "BPF_EXIT": BPF_EXIT,
+                 "BPF_PSEUDO_MAP_FD": 1, "BPF_PSEUDO_MAP_VALUE": 2, "BPF_PSEUDO_CALL": 1,
+                 "BPF_REG_FP": 10, "BPF_REG_CTX": 6}
+bpf_constants.update({f'BPF_{name}': operation for operation, name in alu_operation_names.items()})
+bpf_constants.update({f'BPF_{name}': operation for operation, name in jump_operation_names.items()})
+bpf_constants.update({f'BPF_{name}': size for size, name in memory_size_names.items()})
+bpf_constants.update({f'BPF_REG_{register_number}': register_number for register_number in range(11)})
+bpf_constants.update({f'BPF_REG_ARG{register_number}': register_number for register_number in range(1, 6)})
+
+# The first helper functions, in enum bpf_func_id order (BPF_FUNC_unspec is 0)
+helper_functions = ["unspec", "map_lookup_elem", "map_update_elem", "map_delete_elem", "probe_read", "ktime_get_ns",
+                    "trace_printk", "get_prandom_u32", "get_smp_processor_id", "skb_store_bytes", "l3_csum_replace",
+                    "l4_csum_replace", "tail_call", "clone_redirect", "get_current_pid_tgid", "get_current_uid_gid",
+                    "get_current_comm", "get_cgroup_classid", "skb_vlan_push", "skb_vlan_pop", "skb_get_tunnel_key",
+                    "skb_set_tunnel_key", "perf_event_read", "redirect", "get_route_realm", "perf_event_output", "skb_load_bytes"]
+bpf_constants.update({f'BPF_FUNC_{name}': number for number, name in enumerate(helper_functions)})
+
+def ld_imm64(dst, src, first_imm, second_imm):
+    # The only two slot instruction, the 64 bit constant is split over both imm fields
+    return [(LD_IMM64, dst, src, 0, first_imm), (0, 0, 0, 0, second_imm)]
+
+# Instruction macro -> function of its evaluated operands, giving the (code, dst, src, off, imm) of every slot it fills
+instruction_macros = {
+    "BPF_ALU64_REG":    lambda op, dst, src: [(BPF_ALU64 | op | BPF_X, dst, src, 0, 0)],
+    "BPF_ALU32_REG":    lambda op, dst, src: [(BPF_ALU | op | BPF_X, dst, src, 0, 0)],
+    "BPF_ALU64_IMM":    lambda op, dst, imm: [(BPF_ALU64 | op, dst, 0, 0, imm)],
+    "BPF_ALU32_IMM":    lambda op, dst, imm: [(BPF_ALU | op, dst, 0, 0, imm)],
+    "BPF_ENDIAN":       lambda kind, dst, length: [(BPF_ALU | BPF_END | kind, dst, 0, 0, length)],
+    "BPF_BSWAP":        lambda dst, length: [(BPF_ALU64 | BPF_END, dst, 0, 0, length)],
+    "BPF_MOV64_REG":    lambda dst, src: [(BPF_ALU64 | BPF_MOV | BPF_X, dst, src, 0, 0)],
+    "BPF_MOV32_REG":    lambda dst, src: [(BPF_ALU | BPF_MOV | BPF_X, dst, src, 0, 0)],
+    "BPF_MOV64_IMM":    lambda dst, imm: [(BPF_ALU64 | BPF_MOV, dst, 0, 0, imm)],
+    "BPF_MOV32_IMM":    lambda dst, imm: [(BPF_ALU | BPF_MOV, dst, 0, 0, imm)],
+    "BPF_MOV64_RAW":    lambda kind, dst, src, imm: [(BPF_ALU64 | BPF_MOV | kind, dst, src, 0, imm)],
+    "BPF_MOV32_RAW":    lambda kind, dst, src, imm: [(BPF_ALU | BPF_MOV | kind, dst, src, 0, imm)],
+    "BPF_LD_IMM64":     lambda dst, imm: ld_imm64(dst, 0, imm, imm >> 32),
+    "BPF_LD_IMM64_RAW": lambda dst, src, imm: ld_imm64(dst, src, imm, imm >> 32),
+    "BPF_LD_MAP_FD":    lambda dst, map_fd: ld_imm64(dst, 1, map_fd, 0),
+    "BPF_LD_MAP_VALUE": lambda dst, map_fd, value_offset: ld_imm64(dst, 2, map_fd, value_offset),
+    "BPF_LD_ABS":       lambda size, imm: [(BPF_LD | size | BPF_ABS, 0, 0, 0, imm)],
+    "BPF_LD_IND":       lambda size, src, imm: [(BPF_LD | size | BPF_IND, 0, src, 0, imm)],
+    "BPF_LDX_MEM":      lambda size, dst, src, off: [(BPF_LDX | size | BPF_MEM, dst, src, off, 0)],
+    "BPF_STX_MEM":      lambda size, dst, src, off: [(BPF_STX | size | BPF_MEM, dst, src, off, 0)],
+    "BPF_ST_MEM":       lambda size, dst, off, imm: [(BPF_ST | size | BPF_MEM, dst, 0, off, imm)],
+    "BPF_STX_XADD":     lambda size, dst, src, off: [(BPF_STX | size | BPF_ATOMIC, dst, src, off, 0x00)],
+    "BPF_ATOMIC_OP":    lambda size, op, dst, src, off: [(BPF_STX | size | BPF_ATOMIC, dst, src, off, op)],
+    "BPF_JMP_REG":      lambda op, dst, src, off: [(BPF_JMP | op | BPF_X, dst, src, off, 0)],
+    "BPF_JMP_IMM":      lambda op, dst, imm, off: [(BPF_JMP | op, dst, 0, off, imm)],
+    "BPF_JMP32_REG":    lambda op, dst, src, off: [(BPF_JMP32 | op | BPF_X, dst, src, off, 0)],
+    "BPF_JMP32_IMM":    lambda op, dst, imm, off: [(BPF_JMP32 | op, dst, 0, off, imm)],
+    "BPF_JMP_A":        lambda off: [(BPF_JMP | BPF_JA, 0, 0, off, 0)],
+    "BPF_JMP32_A":      lambda imm: [(BPF_JMP32 | BPF_JA, 0, 0, 0, imm)],
+    "BPF_CALL_REL":     lambda imm: [(BPF_JMP | BPF_CALL, 0, 1, 0, imm)],
+    "BPF_EMIT_CALL":    lambda function: [(BPF_JMP | BPF_CALL, 0, 0, 0, function)],
+    "BPF_RAW_INSN":     lambda code, dst, src, off, imm: [(code, dst, src, off, imm)],
+    "BPF_EXIT_INSN":    lambda: [(BPF_JMP | BPF_EXIT, 0, 0, 0, 0)],
+    }
+
+# One pass over a whole file.  Comments (and line continuations outside of directives) are skipped,
+    # a directive comes out as one token with its continuations, and everything else is a single token
+c_token_pattern = re.compile(r'''
+      (?P<skip>/\*.*?\*/|//[^\n]*|\\\n)
+    | (?P<directive>^[ \t]*\#(?:\\\n|/\*.*?\*/|[^\n])*)
+    | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+    | (?P<token>[A-Za-z_]\w*|0[xX][0-9a-fA-F]+[uUlL]*|\d+[uUlL]*|<<|>>|->|\+\+|--|&&|\|\||[-+*/%&|^~!<>=(){}\[\],;.?:\#])
+    ''', re.X | re.S | re.M)
+
+define_pattern = re.compile(r'\#\s*define\s+(\w+)(\([^)]*\))?(.*)', re.S)
+undef_pattern = re.compile(r'\#\s*undef\s+(\w+)')
+
+def c_tokens(source_text):
+    """
+    Yields
+    ------
+    (kind, token, position) : TYPE : (String, String, Int)
+        kind is "directive", "string" or "token", position is where it starts in source_text
+    """
+    for match in c_token_pattern.finditer(source_text):
+        kind = match.lastgroup
+        if kind != "skip":
+            yield kind, match.group(kind), match.start()
+
+def read_define(directive, defines):
+    """
+    Adds (or removes, for #undef) the define in a directive line
+
+    defines : TYPE : Dictionary (name -> (parameters, body tokens))
+        parameters is None for object like defines, a list of names for function like ones
+    """
+    directive = re.sub(r'\\\n', ' ', re.sub(r'/\*.*?\*/', ' ', directive, flags = re.S))
+    undef = undef_pattern.match(directive.strip())
+    if undef:
+        defines.pop(undef.group(1), None)
+        return
+    define = define_pattern.match(directive.strip())
+    if define is None:
+        return
+    name, parameters, body = define.groups()
+    if parameters is not None:
+        parameters = [parameter.strip() for parameter in parameters[1:-1].split(",") if parameter.strip()]
+    defines[name] = (parameters, [token for kind, token, position in c_tokens(body)])
+
+def split_call_arguments(tokens, open_paren):
+    """
+    Parameters
+    ----------
+    tokens : TYPE : List of strings
+
+    open_paren : TYPE : Int
+        Place of the ( starting the argument list
+
+    Returns
+    -------
+    arguments : TYPE : List of Lists of strings
+        Tokens of each argument (commas inside nested (), {} or [] don't split)
+
+    after_call : TYPE : Int
+        Place just past the matching )
+    """
+    arguments, argument = [], []
+    depth = 0
+    for position in range(open_paren, len(tokens)):
+        token = tokens[position]
+        if token in "({[":
+            depth += 1
+            if depth == 1:
+                continue
+        elif token in ")}]":
+            depth -= 1
+            if depth == 0:
+                if argument or arguments:
+                    arguments.append(argument)
+                return arguments, position + 1
+        elif token == "," and depth == 1:
+            arguments.append(argument)
+            argument = []
+            continue
+        argument.append(token)
+    raise ValueError("Macro call is missing its closing )")
+
+def expand_defines(tokens, defines, expanding = ()):
+    """
+    Returns
+    -------
+    expanded : TYPE : List of strings
+        tokens with every #define used in them expanded (over and over, until none are left).
+        A define is never expanded inside its own expansion, same as the C preprocessor
+    """
+    expanded = []
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        definition = defines.get(token)
+        if definition is None or token in expanding or token in instruction_macros:
+            expanded.append(token)
+            position += 1
+            continue
+        parameters, body = definition
+        if parameters is None:
+            expanded.extend(expand_defines(body, defines, expanding + (token,)))
+            position += 1
+            continue
+        if position + 1 == len(tokens) or tokens[position + 1] != "(":
+            expanded.append(token)
+            position += 1
+            continue
+
+        arguments, position = split_call_arguments(tokens, position + 1)
+        if parameters and parameters[-1] == "...":
+            # Everything past the named parameters goes into __VA_ARGS__, commas and all
+            variable_arguments = arguments[len(parameters) - 1:]
+            arguments = arguments[:len(parameters) - 1] + [[token for argument in variable_arguments
+                                                               for token in argument + [","]][:-1]]
+            parameters = parameters[:-1] + ["__VA_ARGS__"]
+        substituted = []
+        for body_token in body:
+            if body_token in parameters:
+                substituted.extend(expand_defines(arguments[parameters.index(body_token)], defines, expanding))
+            else:
+                substituted.append(body_token)
+        expanded.extend(expand_defines(substituted, defines, expanding + (token,)))
+    return expanded
+
+# Words that can make up a cast, "(u32)-1" is just -1 here (the struct fields truncate it anyway)
+c_type_words = {"u8", "u16", "u32", "u64", "s8", "s16", "s32", "s64", "__u8", "__u16", "__u32", "__u64", "__s8", "__s16",
+                "__s32", "__s64", "int", "long", "short", "char", "unsigned", "signed", "uint8_t", "uint16_t", "uint32_t",
+                "uint64_t", "int8_t", "int16_t", "int32_t", "int64_t", "size_t"}
+
+def c_divide(dividend, divisor):
+    # C division truncates toward zero, python's // floors (-7/2 is -3 in C, -7//2 is -4)
+    if divisor == 0:
+        raise ValueError("Division by zero")
+    quotient = abs(dividend) // abs(divisor)
+    return -quotient if (dividend < 0) != (divisor < 0) else quotient
+
+# The only operations an operand can use ("/" comes out of the parser as FloorDiv, but is evaluated the C way)
+c_binary_operations = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.FloorDiv: c_divide,
+                       ast.Mod: lambda dividend, divisor: dividend - divisor * c_divide(dividend, divisor),
+                       ast.LShift: operator.lshift, ast.RShift: operator.rshift, ast.BitAnd: operator.and_,
+                       ast.BitOr: operator.or_, ast.BitXor: operator.xor}
+c_unary_operations = {ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Invert: operator.invert}
+
+def evaluate_expression_node(node):
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in c_binary_operations:
+        return c_binary_operations[type(node.op)](evaluate_expression_node(node.left), evaluate_expression_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in c_unary_operations:
+        return c_unary_operations[type(node.op)](evaluate_expression_node(node.operand))
+    raise ValueError("Not a constant expression")
+
+def evaluate_c_expression(tokens):
+    """
+    Parameters
+    ----------
+    tokens : TYPE : List of strings
+        A C constant expression, defines already expanded
+
+    Returns
+    -------
+    TYPE : Int
+    """
+    python_tokens = []
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        if token == "(":
+            # Skip casts
+            cast_end = position + 1
+            while cast_end < len(tokens) and tokens[cast_end] in c_type_words:
+                cast_end += 1
+            if cast_end > position + 1 and cast_end < len(tokens) and tokens[cast_end] == ")":
+                position = cast_end + 1
+                continue
+        if token in bpf_constants:
+            python_tokens.append(str(bpf_constants[token]))
+        elif token[0].isdigit():
+            number = token.rstrip("uUlL")
+            if len(number) > 1 and number[0] == "0" and number[1] not in "xX":
+                python_tokens.append(str(int(number, 8)))
+            else:
+                python_tokens.append(str(int(number, 0)))
+        elif token == "/":
+            python_tokens.append("//")
+        elif token in ["+", "-", "*", "%", "<<", ">>", "&", "|", "^", "~", "(", ")"]:
+            python_tokens.append(token)
+        else:
+            raise ValueError(f'Can\'t evaluate "{" ".join(tokens)}" (stuck at {token})')
+        position += 1
+    try:
+        expression = ast.parse(" ".join(python_tokens), mode = "eval")
+    except SyntaxError:
+        raise ValueError(f'Can\'t evaluate "{" ".join(tokens)}"')
+    try:
+        return evaluate_expression_node(expression.body)
+    except ValueError as problem:
+        # Division by zero, a negative shift, or something that isn't an operation at all
+        raise ValueError(f'Can\'t evaluate "{" ".join(tokens)}" ({problem})')
+
+def program_slots(program_tokens):
+    """
+    Parameters
+    ----------
+    program_tokens : TYPE : List of strings
+        Everything between the braces of one program, defines already expanded
+
+    Returns
+    -------
+    slots : TYPE : List of Tuples
+        (code, dst, src, off, imm) of every struct bpf_insn in the program
+    """
+    slots = []
+    position = 0
+    while position < len(program_tokens):
+        macro = program_tokens[position]
+        if macro == ",":
+            position += 1
+            continue
+        if macro not in instruction_macros:
+            raise ValueError(f'{macro} isn\'t an instruction macro')
+        if position + 1 == len(program_tokens) or program_tokens[position + 1] != "(":
+            raise ValueError(f'{macro} is missing its operands')
+        arguments, position = split_call_arguments(program_tokens, position + 1)
+        operand_count = len(inspect.signature(instruction_macros[macro]).parameters)
+        if len(arguments) != operand_count:
+            raise ValueError(f'{macro} takes {operand_count} operands, not {len(arguments)}')
+        slots.extend(instruction_macros[macro](*[evaluate_c_expression(argument) for argument in arguments]))
+    return slots
+
+def slots_to_bytecode(slots):
+    # Packed the way the C struct initializers would truncate each field
+    packer = struct.Struct("<BBhi")
+    bytecode = bytearray(packer.size * len(slots))
+    for slot_number, (code, dst, src, off, imm) in enumerate(slots):
+        packer.pack_into(bytecode, slot_number * packer.size, code & 0xff, (dst & 0x0f) | (src & 0x0f) << 4,
+                         ((off & 0xffff) ^ 0x8000) - 0x8000, signed_32(imm))
+    return bytes(bytecode)
+
+class Extracted_Program:
+    def __init__(self, name, source_file, line, instructions = None, problem = ""):
+        """
+        Parameters
+        ----------
+        name : TYPE : String
+            Array name (prog in "struct bpf_insn prog[]"), or the test description for selftest .insns
+
+        source_file : TYPE : String
+
+        line : TYPE : Int
+            Line the program starts on
+
+        instructions : TYPE : List of Decoded_Instruction records, or None
+            The program, ready for create_program (None if it couldn't be decoded)
+
+        problem : TYPE : String
+            Why the program couldn't be decoded ("" if it was)
+        """
+        self.name = name
+        self.source_file = source_file
+        self.line = line
+        self.instructions = instructions
+        self.problem = problem
+
+    def __str__(self):
+        summary = f'{self.source_file}:{self.line} {self.name}: '
+        if self.instructions is None:
+            return summary + f'not decoded ({self.problem})'
+        return summary + f'{len(self.instructions)} instructions'
+
+def extract_programs_from_source(source_text, source_file = "<string>"):
+    """
+    Parameters
+    ----------
+    source_text : TYPE : String
+        A whole C file
+
+    Returns
+    -------
+    programs : TYPE : List of Extracted_Program objects
+        Every struct bpf_insn array and selftest .insns in the file, in order
+    """
+    defines = {}
+    programs = []
+    recent_tokens = []
+    last_string = None
+    depth = 0
+    program_start = None
+    program_tokens = []
+    for kind, token, position in c_tokens(source_text):
+        if kind == "directive":
+            if program_start is None:
+                read_define(token, defines)
+            continue
+        if program_start is not None:
+            # Inside a program, only waiting for its closing brace
+            if token == "{":
+                depth += 1
+            elif token == "}":
+                depth -= 1
+                if depth == program_start[0]:
+                    name, line = program_start[1:]
+                    try:
+                        slots = program_slots(expand_defines(program_tokens, defines))
+                        programs.append(Extracted_Program(name, source_file, line, load_bpf_bytecode(slots_to_bytecode(slots))))
+                    except (ValueError, TypeError, ZeroDivisionError) as problem:
+                        programs.append(Extracted_Program(name, source_file, line, problem = str(problem)))
+                    program_start = None
+                    continue
+            program_tokens.append(token)
+            continue
+
+        if kind == "string":
+            last_string = token
+        elif token == "{" and recent_tokens[-1:] == ["="]:
+            name = program_name(recent_tokens, last_string)
+            if name is not None:
+                program_start = (depth, name, source_text.count("\n", 0, position) + 1)
+                program_tokens = []
+            depth += 1
+        elif token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        recent_tokens = (recent_tokens + [token])[-8:]
+    return programs
+
+def program_name(recent_tokens, last_string):
+    """
+    Returns
+    -------
+    TYPE : String or None
+        The name of the program starting at this "= {", or None if it isn't a program
+    """
+    # struct bpf_insn prog[] = {   (or prog[SIZE])
+    if "bpf_insn" in recent_tokens and recent_tokens[-2] == "]":
+        open_bracket = len(recent_tokens) - 1 - recent_tokens[::-1].index("[")
+        if recent_tokens[open_bracket - 2] == "bpf_insn":
+            return recent_tokens[open_bracket - 1]
+    # .insns = {   (kernel verifier selftests, named by the test's description string)
+    if recent_tokens[-3:-1] == [".", "insns"]:
+        return last_string.strip('"') if last_string is not None else "insns"
+    return None
+
+def get_eBPF_from_Outside_File(file_path):
+    """
+    Parameters
+    ----------
+    file_path : TYPE : String
+        A C file holding eBPF programs written with the instruction macros
+
+    Returns
+    -------
+    TYPE : List of Extracted_Program objects
+    """
+    with open(file_path, errors = "replace") as source_file:
+        return extract_programs_from_source(source_file.read(), file_path)
+
+def scan_source_tree(root_directory, extensions = (".c",)):
+    """
+    Yields
+    ------
+    program : TYPE : Extracted_Program object
+        Every program in every file under root_directory (walked in sorted order), as each file is read
+    """
+    for directory, subdirectories, file_names in os.walk(root_directory):
+        subdirectories.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(extensions):
+                yield from get_eBPF_from_Outside_File(os.path.join(directory, file_name))
+
+def translate_to_bpf_in_c(program_list):
+    """
+    Keyword program -> the same program written with the kernel instruction macros
+        (the old version in Non Meeting Stuff/Random_Program_Creation.py took the older keyword form)
+
+    Parameters
+    ----------
+    program_list : TYPE : List of strings (or Decoded_Instruction records)
+
+    Returns
+    -------
+    TYPE : String
+        One macro per line, ready to go between the braces of a struct bpf_insn prog[] = { ... };
+    """
+    slots = list(struct.iter_unpack("<BBhi", encode_bpf_instructions(program_list)))
+    macros = []
+    slot_number = 0
+    while slot_number < len(slots):
+        code, registers, off, imm = slots[slot_number]
+        dst, src = f'BPF_REG_{registers & 0x0f}', f'BPF_REG_{registers >> 4}'
+        instruction_class, operation, uses_src, size = code & 0x07, code & 0xf0, code & BPF_X, code & 0x18
+        slot_number += 1
+        if code == LD_IMM64:
+            macros.append(f'BPF_LD_IMM64({dst}, {(imm & 0xffffffff) | (slots[slot_number][3] << 32)})')
+            slot_number += 1
+        elif instruction_class in [BPF_ALU, BPF_ALU64]:
+            bit_size = "64" if instruction_class == BPF_ALU64 else "32"
+            if operation == BPF_MOV:
+                macros.append(f'BPF_MOV{bit_size}_REG({dst}, {src})' if uses_src else f'BPF_MOV{bit_size}_IMM({dst}, {imm})')
+            elif operation == BPF_END:
+                macros.append(f'BPF_BSWAP({dst}, {imm})' if bit_size == "64" else
+                              f'BPF_ENDIAN({"BPF_TO_BE" if uses_src else "BPF_TO_LE"}, {dst}, {imm})')
+            else:
+                name = f'BPF_{alu_operation_names[operation]}'
+                macros.append(f'BPF_ALU{bit_size}_REG({name}, {dst}, {src})' if uses_src else f'BPF_ALU{bit_size}_IMM({name}, {dst}, {imm})')
+        elif instruction_class in [BPF_JMP, BPF_JMP32] and operation in jump_operation_names:
+            jump = "BPF_JMP32" if instruction_class == BPF_JMP32 else "BPF_JMP"
+            name = f'BPF_{jump_operation_names[operation]}'
+            macros.append(f'{jump}_REG({name}, {dst}, {src}, {off})' if uses_src else f'{jump}_IMM({name}, {dst}, {imm}, {off})')
+        elif code == BPF_JMP | BPF_EXIT:
+            macros.append('BPF_EXIT_INSN()')
+        elif code == BPF_JMP | BPF_JA:
+            macros.append(f'BPF_JMP_A({off})')
+        elif code == BPF_JMP | BPF_CALL:
+            macros.append(f'BPF_EMIT_CALL({imm})')
+        elif code & 0xe7 == BPF_LD | BPF_ABS:
+            macros.append(f'BPF_LD_ABS(BPF_{memory_size_names[size]}, {imm})')
+        elif code & 0xe7 == BPF_LD | BPF_IND:
+            macros.append(f'BPF_LD_IND(BPF_{memory_size_names[size]}, {src}, {imm})')
+        elif code & 0xe7 in [BPF_LDX | BPF_MEM, BPF_STX | BPF_MEM, BPF_ST | BPF_MEM, BPF_STX | BPF_ATOMIC]:
+            size_name = f'BPF_{memory_size_names[size]}'
+            if instruction_class == BPF_LDX:
+                macros.append(f'BPF_LDX_MEM({size_name}, {dst}, {src}, {off})')
+            elif instruction_class == BPF_ST:
+                macros.append(f'BPF_ST_MEM({size_name}, {dst}, {off}, {imm})')
+            elif code & 0xe0 == BPF_MEM:
+                macros.append(f'BPF_STX_MEM({size_name}, {dst}, {src}, {off})')
+            else:
+                macros.append(f'BPF_ATOMIC_OP({size_name}, {imm}, {dst}, {src}, {off})')
+        else:
+            macros.append(f'BPF_RAW_INSN({code:#04x}, {registers & 0x0f}, {registers >> 4}, {off}, {imm})')
+    return "".join(macro + ",\n" for macro in macros)
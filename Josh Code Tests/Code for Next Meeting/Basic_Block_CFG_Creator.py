@@ -6,7 +6,7 @@ Created on Mon Aug 10 16:07:01 2020
 Purpose of File:
     
     basic_block_CFG_and_phi_function_setup will take in a list of special keyworded instructions,
-        break the list into basic blocks, form the proper control flow graph, and create a dictionary
+        break the list into basic blocks, form the proper control flow graph, and create a table
         holding z3 BitVector objects to be referenced in the FOL_from_BPF.py file.
         
     These functions do not actually execute or evaluate the instruction list, they only make
@@ -17,6 +17,19 @@ Main Ideas in this code:
         Takes an individual instruction from the instruction list, and splits 
         it up to allow for future execution based on the specifics in the instruction string
         
+        The keyword is decoded once (decode_keyword) into enums (classes of int constants): instruction_class (ALU, JUMP, EXIT,
+            LOAD or STORE), opcode (an ALU_Op, a Jump_Condition, or the access size in bytes for memory instructions),
+            bit_size (a Width) and source_kind (REGISTER or IMMEDIATE),
+            so nothing after parsing has to search the keyword string for "J", "ARSH", "32XC"...
+            FOL_from_BPF.py runs instructions through tables indexed by opcode instead.
+        The object is slotted, since large programs hold one per instruction.
+        The z3 constant for an immediate is only made the first time a formula asks for it (input_value_bitVec_Constant),
+            so execute_concrete and cached CFG setups never pay for the ones they don't use.
+        
+        Instructions can also come in already split up, as Decoded_Instruction records 
+            (BPF_Bytecode_Loader.py makes these straight from eBPF bytecode), so there is no string to split at all.
+            A record prints as the same keyword string, so the two forms can be mixed in one program.
+        
     Basic_Block object
         Collects all the Instruction_Info objects in a straightline group of code
         
@@ -27,28 +40,263 @@ Main Ideas in this code:
 Assumptions about instruction links:
     There are two types of links
         1) Directly forward (all instructions link to the next one)
-        2) Jump offset to a future instruction (found in the Instruction_Info.offset value)
+        2) Jump offset to another instruction (found in the Instruction_Info.offset value)
+            Negative offsets jump backward, so the CFG can have loops (bounded loops are legal eBPF since kernel 5.3).
+            Loops.py finds them, and create_program unrolls them up to a bound.
+        
+CFG backends:
+    cfg_backend = "networkx" (default) builds nx.DiGraph objects for the instruction and block graphs
+    cfg_backend = "array" stores the same edges in integer arrays instead (see Array_CFG.py), which
+        uses much less memory on very large programs.  Anything needing networkx itself 
+        (drawing) goes through as_networkx.  Dominators and dominance frontiers come from Dominators.py,
+        which works on either backend directly.
+        
+SSA ids:
+    Every version of every register is numbered densely in program order (an SSA id), instead of being
+        named with a string.  Instruction_Info.target_reg_new_name is the id an instruction's target gets
+        (None for jumps and EXIT, which don't set a register), phi functions are numbered after all of those,
+        and UNINITIALIZED (0) stands for a register that was never set.
+    Register_BitVec_Table holds the z3 bitVecs in a list indexed by SSA id, and only makes a bitVec
+        the first time its id is used.  The "r{register_number}_{instruction}" string is only built then,
+        as the z3 name of the bitVec.
+
+Register files:
+    The register names going into and out of a block are tuples of SSA ids, not lists.
+    A tuple can't be changed, so the next block on a path just shares its predecessor's tuple 
+        (no copying on a block transition), and an instruction changing a register makes a new tuple
+        with rename_register, leaving every tuple other blocks still hold alone.
+        
+CFG cache:
+    use_cfg_cache = True saves the block partition, edges and SSA ids of a program to disk
+        (see CFG_Cache.py), and the next setup of the same program rebuilds the CFG straight from that
+        instead of searching for leaders and edges again.
 """
-import copy
+from array import array
+import re
+from collections import namedtuple
 import networkx as nx
 from z3 import *
+from Array_CFG import *
+from CFG_Cache import *
+from Dominators import *
+
+# SSA id for a register that was never initialized (has no bitVec)
+UNINITIALIZED = 0
 
-# Internal representation for one instance of a register
+# Internal representation for every instance of a register, indexed by SSA id
     # Made a class for this because eventually we may need to make the registers more complex,
     # since all we do now is add ints to ints, but what about pointers?
-class Register_BitVec:
-    def __init__(self, name, reg_bit_size):
-        self.name = BitVec(name, reg_bit_size)
-        self.reg_name = name 
+class Register_BitVec_Table:
+    def __init__(self, reg_bit_size, register_numbers = (), locations = ()):
+        """
+        Parameters
+        ----------
+        reg_bit_size : TYPE : Int
+            How big the bitVector objects need to be to model our registers
+            
+        register_numbers : TYPE : List of Ints, optional
+            Which register each SSA version (in SSA id order, starting from id 1) is a version of
+            
+        locations : TYPE : List of Ints, optional
+            Instruction number setting each SSA version
+
+        Returns
+        -------
+        None.
+        """
+        self.reg_bit_size = reg_bit_size
+        self.register_numbers = [None] + list(register_numbers)
+        self.locations = [None] + list(locations)
+        
+        # Preallocated, but the bitVecs themselves only get made when an SSA id is first used
+        self.bitVecs = [None] * len(self.register_numbers)
+        
+    def new_version(self, register_number, location):
+        """
+        Adds one more SSA version (used for phi functions, whose location is "{block_ID}_phi")
+        
+        Returns
+        -------
+        ssa_id : TYPE : Int
+        """
+        self.register_numbers.append(register_number)
+        self.locations.append(location)
+        self.bitVecs.append(None)
+        return len(self.bitVecs) - 1
+        
+    def reg_name(self, ssa_id):
+        if ssa_id == UNINITIALIZED:
+            return '0'
+        return f'r{self.register_numbers[ssa_id]}_{self.locations[ssa_id]}'
+    
+    def __len__(self):
+        return len(self.bitVecs)
+        
+    def __getitem__(self, ssa_id):
+        bitVec = self.bitVecs[ssa_id]
+        if bitVec is None:
+            if ssa_id == UNINITIALIZED:
+                raise KeyError("Register was never initialized, so it has no bitVec")
+            bitVec = BitVec(self.reg_name(ssa_id), self.reg_bit_size)
+            self.bitVecs[ssa_id] = bitVec
+        return bitVec
+
+# Decoded parts of a keyword (see decode_keyword)
+    # Plain classes of int constants, not enum.IntEnum, since looking up an IntEnum member 
+    # costs more than the substring checks these replace (these get checked for every instruction run)
+class Instruction_Class:
+    ALU = 0
+    JUMP = 1
+    EXIT = 2
+    # LDX{size} (sets its target register, from the address in the source register + offset)
+    LOAD = 3
+    # ST{size}/STX{size} (stores the immediate/source register at the address in the target register + offset)
+    STORE = 4
+
+# Classes whose instructions give their target register a new value (and so get an SSA id)
+register_setting_classes = frozenset((Instruction_Class.ALU, Instruction_Class.LOAD))
+
+class ALU_Op:
+    INVALID = 0
+    ADD = 1
+    MOV = 2
+    LSH = 3
+    RSH = 4
+    ARSH = 5
+    SUB = 6
+    MUL = 7
+    DIV = 8
+    MOD = 9
+    AND = 10
+    OR = 11
+    XOR = 12
+    NEG = 13
+    # Byte order conversions (END), for a little endian machine: END_LE only cuts the value down to
+        # the width in the immediate, END_BE (and the 64 bit END, an unconditional swap) also swaps its bytes
+    END_LE = 14
+    END_BE = 15
+
+class Jump_Condition:
+    INVALID = 0
+    JNE = 1
+    JEQ = 2
+    JGT = 3
+    JSGT = 4
+    JGE = 5
+    JSGE = 6
+    JLT = 7
+    JLE = 8
+    JSLT = 9
+    JSLE = 10
+    JSET = 11
+    # Always jumps, and doesn't read any registers
+    JA = 12
+
+class Width:
+    W32 = 32
+    W64 = 64
+
+class Source_Kind:
+    REGISTER = 0
+    IMMEDIATE = 1
+    # A full register sized constant (LDDW, the 16 byte LD_IMM64 instruction), never extended from half size
+    WIDE_IMMEDIATE = 2
+
+# The operation part of a keyword has to match exactly, a substring search would find "ADD" in "ADDR", "OR" in "XOR"...
+alu_op_keywords = {"ADD": ALU_Op.ADD, "SUB": ALU_Op.SUB, "MUL": ALU_Op.MUL, "DIV": ALU_Op.DIV, "MOD": ALU_Op.MOD,
+                   "AND": ALU_Op.AND, "OR": ALU_Op.OR, "XOR": ALU_Op.XOR, "NEG": ALU_Op.NEG, "MOV": ALU_Op.MOV,
+                   "LSH": ALU_Op.LSH, "RSH": ALU_Op.RSH, "LRSH": ALU_Op.RSH, "ARSH": ALU_Op.ARSH, "END": ALU_Op.END_LE}
+jump_condition_keywords = {"JNE": Jump_Condition.JNE, "JEQ": Jump_Condition.JEQ, "JGT": Jump_Condition.JGT, "JSGT": Jump_Condition.JSGT,
+                           "JGE": Jump_Condition.JGE, "JSGE": Jump_Condition.JSGE, "JLT": Jump_Condition.JLT, "JLE": Jump_Condition.JLE,
+                           "JSLT": Jump_Condition.JSLT, "JSLE": Jump_Condition.JSLE, "JSET": Jump_Condition.JSET, "JA": Jump_Condition.JA}
+
+# {operation}{64|32|}{XC|XY|}, the shortest operation name that leaves a valid ending
+keyword_pattern = re.compile(r'([A-Z]+?)(64|32)?(XC|XY)?')
+
+# LDX{size}, STX{size}, ST{size}, with the access size in bytes as the opcode
+memory_keyword_pattern = re.compile(r'(LDX|STX|ST)(B|H|W|DW)')
+memory_access_sizes = {"B": 1, "H": 2, "W": 4, "DW": 8}
+
+# Every keyword is only decoded once per run, programs only use a handful of different ones
+decoded_keywords = {}
+
+def decode_keyword(keyword):
+    """
+    Parameters
+    ----------
+    keyword : TYPE : String
+        The first part of an instruction (MOV64XC, JNEXY, EXIT...)
+
+    Returns
+    -------
+    TYPE : Tuple
+        (instruction_class, opcode, bit_size, source_kind).
+        opcode is an ALU_Op for ALU instructions, a Jump_Condition for jumps, the access size in bytes
+        for LOAD/STORE, and None for EXIT.
+        Unsupported keywords decode to ALU_Op.INVALID/Jump_Condition.INVALID, and only break the program once they run.
+    """
+    decoded = decoded_keywords.get(keyword)
+    if decoded is not None:
+        return decoded
+    memory_parts = memory_keyword_pattern.fullmatch(keyword)
+    if memory_parts:
+        memory_class, access_size = memory_parts.groups()
+        if memory_class == "LDX":
+            decoded = (Instruction_Class.LOAD, memory_access_sizes[access_size], Width.W64, Source_Kind.REGISTER)
+        else:
+            decoded = (Instruction_Class.STORE, memory_access_sizes[access_size], Width.W64, 
+                       Source_Kind.REGISTER if memory_class == "STX" else Source_Kind.IMMEDIATE)
+        decoded_keywords[keyword] = decoded
+        return decoded
+    keyword_parts = keyword_pattern.fullmatch(keyword)
+    name, size, source = keyword_parts.groups() if keyword_parts else (keyword, None, None)
+    source_kind = Source_Kind.IMMEDIATE if source == "XC" else Source_Kind.REGISTER
+    if keyword == "LDDW":
+        decoded = (Instruction_Class.ALU, ALU_Op.MOV, Width.W64, Source_Kind.WIDE_IMMEDIATE)
+    elif "EXIT" in keyword:
+        decoded = (Instruction_Class.EXIT, None, Width.W64, Source_Kind.REGISTER)
+    elif keyword.startswith("J"):
+        # Jumps compare whole registers unless they say 32 (the JMP32 class, only the low 32 bits are compared)
+        opcode = jump_condition_keywords.get(name, Jump_Condition.INVALID)
+        decoded = (Instruction_Class.JUMP, opcode, Width.W32 if size == "32" else Width.W64, source_kind)
+    elif name == "END":
+        # The immediate is how many bits to convert (16, 32 or 64), and the result is never cut down to 32 bits after
+        opcode = ALU_Op.END_BE if source == "XY" or size == "64" else ALU_Op.END_LE
+        decoded = (Instruction_Class.ALU, opcode, Width.W64, Source_Kind.IMMEDIATE)
+    else:
+        opcode = alu_op_keywords.get(name, ALU_Op.INVALID)
+        decoded = (Instruction_Class.ALU, opcode, Width.W64 if size == "64" else Width.W32, source_kind)
+    decoded_keywords[keyword] = decoded
+    return decoded
+
+# An instruction that has already been split into its parts, holding the same values the keyword string would
+    # keyword : String, target_reg : Int, input_value : Int (register number or immediate), offset : Int
+class Decoded_Instruction(namedtuple("Decoded_Instruction", ["keyword", "target_reg", "input_value", "offset"])):
+    __slots__ = ()
+
+    def __str__(self):
+        # The keyword string form ("EXIT", "ADD64XC 1 5", "JNEXY 2 1 3")
+        if self.keyword == "EXIT":
+            return "EXIT"
+        if self.offset != 0 or "J" in self.keyword:
+            return f'{self.keyword} {self.target_reg} {self.input_value} {self.offset}'
+        return f'{self.keyword} {self.target_reg} {self.input_value}'
+
+# Jumps keep their jump offset, memory instructions their memory offset (everything else has none)
+offset_classes = frozenset((Instruction_Class.JUMP, Instruction_Class.LOAD, Instruction_Class.STORE))
 
 # All the info for parsing a single instruction from a program
 class Instruction_Info:
+    __slots__ = ["full_instruction", "instruction_number", "keyword", "instruction_class", "opcode", "bit_size", 
+                 "source_kind", "input_value", "target_reg", "offset", "input_value_is_const", "input_value_concrete",
+                 "reg_bit_size", "bitVec_constant", "target_reg_new_name"]
+    
     def __init__ (self, instruction, number, reg_bit_size):
         """
         Parameters
         ----------
-        instruction : TYPE : String
-            String literal holding the instruction in specific keyword form
+        instruction : TYPE : String or Decoded_Instruction
+            String literal holding the instruction in specific keyword form (or the same thing already split up)
             
         number : TYPE : Int
             Instruction number from program order
@@ -64,44 +312,72 @@ class Instruction_Info:
         self.instruction_number = number
         
         # Breaking a keyword into the parts needed to interpret it
-        split_ins = instruction.split(" ")        
-        self.keyword = split_ins[0]
-        self.bit_size = 64 if "64" in self.keyword else 32
-        self.input_value, self.target_reg, self.offset = 0,0,0
+        if isinstance(instruction, Decoded_Instruction):
+            self.keyword, self.target_reg, self.input_value, self.offset = instruction
+            self.instruction_class, self.opcode, self.bit_size, self.source_kind = decode_keyword(self.keyword)
+            if self.instruction_class not in offset_classes:
+                self.offset = 0
+            split_ins = ()
+        else:
+            split_ins = instruction.split(" ")        
+            self.keyword = split_ins[0]
+            self.instruction_class, self.opcode, self.bit_size, self.source_kind = decode_keyword(self.keyword)
+            self.input_value, self.target_reg, self.offset = 0,0,0
         if len(split_ins) > 1:
             self.target_reg = int(split_ins[1])        
             self.input_value = get_input_value(split_ins[2])
-            if "J" in self.keyword:
+            if self.instruction_class in offset_classes:
                 try:
                     self.offset = int(split_ins[3])
                 except Exception:
                     pass
 
         # Defining how to treat self.input_value (as a constant, or register location)
+            # input_value_concrete is the same constant as a plain int, for execute_concrete
+            # (None if the input isn't a usable constant)
+            # (the z3 constant is only made if a formula asks for it, see input_value_bitVec_Constant)
+        self.input_value_concrete = None
+        self.reg_bit_size = reg_bit_size
+        self.bitVec_constant = None
         if self.input_value > 2 ** (reg_bit_size - 1) - 1 or \
                         self.input_value < -1 * (2 ** (reg_bit_size - 1)):
             self.input_value_is_const = True
-            
-            # Poision Pill for input size being too large, forcing unsat
-            a = Int('a')
-            self.input_value_bitVec_Constant = And(a == 2, a == 1)
-            
         else:    
-            if "32XC" in self.keyword:
+            if self.source_kind == Source_Kind.WIDE_IMMEDIATE or \
+                    (self.source_kind == Source_Kind.IMMEDIATE and self.bit_size == Width.W32):
                 self.input_value_is_const = True
-                self.input_value_bitVec_Constant = BitVecVal(self.input_value, reg_bit_size)
-            elif "64XC" in self.keyword or "XC" in self.keyword:
+                self.input_value_concrete = self.input_value & (2 ** reg_bit_size - 1)
+            elif self.source_kind == Source_Kind.IMMEDIATE:
                 self.input_value_is_const = True     
-                self.input_value_bitVec_Constant = extend_to_proper_bitvec(self.input_value, reg_bit_size)
+                self.input_value_concrete = extend_to_proper_int(self.input_value, reg_bit_size)
             else:
                 self.input_value_is_const = False
-                self.input_value_bitVec_Constant = False
             
-        # Store the name in the instruction, reference the actual bitVec object from an external dictionary
-        if "J" not in self.keyword or "EXIT" not in self.keyword:
-            self.target_reg_new_name = f'r{self.target_reg}_{self.instruction_number}'
-        else:
-            self.target_reg_new_name = ""
+        # Store the SSA id in the instruction, reference the actual bitVec object from an external table
+            # Numbered by set_up_basic_block_cfg (stays None for jumps and EXIT, since they don't change a register)
+        self.target_reg_new_name = None
+
+    @property
+    def input_value_bitVec_Constant(self):
+        """
+        Returns
+        -------
+        TYPE : z3 BitVecVal (False for a register source)
+            The input value as a z3 constant, made the first time it's asked for.  Making z3 objects is most of
+            the cost of parsing an instruction, and execute_concrete or a cached CFG setup never needs most of them.
+        """
+        if not self.input_value_is_const:
+            return False
+        if self.bitVec_constant is None:
+            if self.input_value_concrete is None:
+                # Poision Pill for input size being too large, forcing unsat
+                a = Int('a')
+                self.bitVec_constant = And(a == 2, a == 1)
+            elif self.source_kind == Source_Kind.WIDE_IMMEDIATE or self.bit_size == Width.W32:
+                self.bitVec_constant = BitVecVal(self.input_value, self.reg_bit_size)
+            else:
+                self.bitVec_constant = extend_to_proper_bitvec(self.input_value, self.reg_bit_size)
+        return self.bitVec_constant
 
     def __str__(self):
         print(f'Instruction {self.instruction_number}: {self.full_instruction}')
@@ -128,10 +404,31 @@ def extend_to_proper_bitvec(value, reg_size):
         return ZeroExt(reg_size//2, valueBV)
     else:
         return SignExt(reg_size//2, valueBV)
+
+# Same extension as extend_to_proper_bitvec, but on plain ints (unsigned reg_size bit result)
+def extend_to_proper_int(value, reg_size):
+    half_mask = 2 ** (reg_size//2) - 1
+    extended_value = value & half_mask
+    if value < 0 and extended_value >> (reg_size//2 - 1):
+        extended_value |= (2 ** reg_size - 1) ^ half_mask
+    return extended_value
+
+# Register files (see the top of the file)
+def uninitialized_register_file(num_regs):
+    return (UNINITIALIZED,) * num_regs
+
+def rename_register(register_names, register_number, ssa_id):
+    """
+    Returns
+    -------
+    TYPE : Tuple of Ints
+        A new register file with register_number renamed to ssa_id (register_names itself is left alone)
+    """
+    return register_names[:register_number] + (ssa_id,) + register_names[register_number + 1:]
     
 # Basic Block holds all Instruction_Info commands for reference in a specific chunk of straightline code
 class Basic_Block:
-    def __init__ (self, num_regs, instruction_chunk, instruction_list, instruction_graph):
+    def __init__ (self, num_regs, instruction_chunk, instruction_list, instruction_graph, block_id = 0):
         """
         Parameters
         ----------
@@ -144,14 +441,18 @@ class Basic_Block:
         instruction_list : TYPE : List of Instruction_Info objects
             The full instruction list of the program to pull from for the block
             
-        instruction_graph : TYPE : nx.DiGraph
+        instruction_graph : TYPE : nx.DiGraph or Array_Instruction_Graph
             The control flow graph of the individual instructions
+            
+        block_id : TYPE : Int, optional
+            Position of this block in the program's block list (the node index in an Array_Block_Graph)
 
         Returns
         -------
         None.
         """
         self.name = str(instruction_chunk).strip("[]")
+        self.block_id = block_id
         self.num_regs = num_regs
         self.block_instructions = []
         for instruction_number in instruction_chunk:
@@ -159,11 +460,11 @@ class Basic_Block:
         
         # Stores the most up to date names of registers from the last block
             # If a phi function is required for a variable in the block, 
-            # will put r{reg_number}_{block_ID}_phi instead of r{reg_number}_{instruction_number}
-        self.register_names_before_block_executes = ['0' for _ in range(self.num_regs)]
+            # will put the SSA id of r{reg_number}_{block_ID}_phi instead of r{reg_number}_{instruction_number}
+        self.register_names_before_block_executes = uninitialized_register_file(self.num_regs)
         
         # Stores all reg names after execution of the block to pass onto the next block in the CFG
-        self.register_names_after_block_executes = ['0' for _ in range(self.num_regs)]
+        self.register_names_after_block_executes = uninitialized_register_file(self.num_regs)
         
         # Optimization for not repeatedly doing sat checks on the whole path formula 
         self.in_block_formula = True
@@ -171,35 +472,39 @@ class Basic_Block:
         # Block edge creation helpers in the CFG representation
         self.initial_instruction = instruction_chunk[0]
         self.final_instruction = instruction_chunk[-1]
-        self.input_links = []
-        self.output_links = []
+        self.input_links = set()
+        self.output_links = set()
         
         # Find all instructions which link to the first instruction in the block from previous instructions/blocks
         for (start_of_edge, end_of_edge) in instruction_graph.in_edges([self.block_instructions[0].instruction_number]):
-            self.input_links.append(start_of_edge)
+            self.input_links.add(start_of_edge)
             
         # Find all the instructions that are linked to by the last instruction in this block
         for (start_of_edge, end_of_edge) in instruction_graph.edges([self.block_instructions[-1].instruction_number]):
-            self.output_links.append(end_of_edge)
-
-        # # **************************************
-        # # Phi function stuff
-        # # For use in naming any phi function registers
-        # self.block_ID = str(instruction_chunk[0])
-        # # Identifying what registers need new SSA names in a block
-        # self.variables_changed_in_block = set()
-        # for instruction in self.block_instructions:
-        #     if "jmp" not in instruction.keyword:
-        #         self.variables_changed_in_block.add(instruction.target_reg)      
-        # # Holds the numbers of any registers which would require a phi function at the beginning of the block
-        # self.phi_functions = []
-        # # Since Phi functions aren't known at block creation time, will be updated 
-        #     # with any names after phi_function_locations has been run on the CFG
-        # self.phi_function_named_registers = []
-        # # End of phi function stuff
-        # # **************************************
+            self.output_links.add(end_of_edge)
+
+        # **************************************
+        # Phi function stuff
+        # Identifying what registers need new SSA names in a block
+        self.variables_changed_in_block = set()
+        for instruction in self.block_instructions:
+            if instruction.instruction_class in register_setting_classes:
+                self.variables_changed_in_block.add(instruction.target_reg)      
+        # Holds the numbers of any registers which would require a phi function at the beginning of the block
+        self.phi_functions = []
+        # For use in naming any phi function registers
+        self.block_ID = str(instruction_chunk[0])
+        # Since Phi functions aren't known at block creation time, will be updated 
+            # with any names after phi_function_locations has been run on the CFG
+            # (register number -> SSA id of "r{register_number}_{block_ID}_phi")
+        self.phi_function_named_registers = {}
+        # Filled in by rename_registers_over_dominator_tree, the name each predecessor block 
+            # hands to each phi function (register number -> {predecessor block -> SSA id})
+        self.phi_function_operands = {}
+        # End of phi function stuff
+        # **************************************
             
-    def update_start_names(self, block, register_bitVec_dictionary):
+    def update_start_names(self, block, register_bitVec_table, solver = None):
         """
         Parameters
         ----------
@@ -207,10 +512,12 @@ class Basic_Block:
             Block will be the predecessor node in the control flow path to 
                 whatever Basic_Block object this function is called on
             
-        register_bitVec_dictionary : TYPE : Dictionary (Strings -> Register_BitVec objects)
-            The reference dictionary for the actual z3 bitVec variables that will be added to the solver.
-            Keys are SSA forms of register names "r{register_number}_{instruction}" where instruction 
-            refers to the specific program instruction where the register was changed to that value
+        register_bitVec_table : TYPE : Register_BitVec_Table object
+            The z3 bitVec variables that will be added to the solver, indexed by SSA id
+            
+        solver : TYPE : z3 Solver, optional
+            The persistent path solver from Program_Holder.  It already holds the predecessor's
+            constraints, so there is nothing to re-solve and only the register names are passed on.
 
         Returns
         -------
@@ -218,37 +525,26 @@ class Basic_Block:
         """
         # Getting the most recent values found by the Solver, and putting them into the
             # next block, to allow for smaller FOL sat checks and speed up runtime
-        tempz3 = Solver()
-        tempz3.add(block.in_block_formula)
-        if tempz3.check() == sat:
-            for reg_num, reg_name in enumerate(block.register_names_after_block_executes):
-                if reg_name != '0':
-                    reg_name = register_bitVec_dictionary[reg_name].name
-                    self.in_block_formula = And(self.in_block_formula, reg_name == tempz3.model()[reg_name])
+        if solver is None:
+            tempz3 = Solver()
+            tempz3.add(block.in_block_formula)
+            if tempz3.check() == sat:
+                for reg_num, ssa_id in enumerate(block.register_names_after_block_executes):
+                    if ssa_id != UNINITIALIZED:
+                        reg_name = register_bitVec_table[ssa_id]
+                        self.in_block_formula = And(self.in_block_formula, reg_name == tempz3.model()[reg_name])
         
         # print("Updating Names")
-        self.register_names_before_block_executes = \
-            copy.deepcopy(block.register_names_after_block_executes)     
+        # Register files are tuples, so the predecessor's can be shared instead of copied
+        self.register_names_before_block_executes = block.register_names_after_block_executes
         # print(f'New Starting Names are now: {self.register_names_before_block_executes}')
 
-    # # Phi Function Stuff
-    # def create_phi_function_register_names(self):
-    #     for register_number in self.phi_functions:
-    #         reg_name = f'r{register_number}_Block_{self.block_ID}_phi'
-    #         self.phi_function_named_registers.append(reg_name)  
-    # 
-    # def get_reg_names_for_beginning_of_block(self, block_graph):
-    #     if self.block_ID == '0':
-    #         self.register_names_before_block_executes = \
-    #             [f'r{i}_start' for i in range(self.num_regs)]
-    #     else:
-    #         previous_blocks =[block for block in block_graph.predecessors(self)]
-    #         self.register_names_before_block_executes = copy.deepcopy(previous_blocks[0].register_names_after_block_executes)
-    # 
-    #         # Block needs a phi function definition
-    #         for reg_number in self.phi_functions:
-    #             reg_name = [name for name in self.phi_function_named_registers if f'r{reg_number}' in name]
-    #             self.register_names_before_block_executes[reg_number] = reg_name[0]
+    # Phi Function Stuff
+    def create_phi_function_register_names(self, register_bitVec_table):
+        for register_number in self.phi_functions:
+            ssa_id = register_bitVec_table.new_version(register_number, f'{self.block_ID}_phi')
+            self.phi_function_named_registers[register_number] = ssa_id
+            self.phi_function_operands[register_number] = {}
     
     def __str__(self):
         print(f'\nInstructions in Block: {self.name}' + '\n' + '*'*20)
@@ -264,31 +560,61 @@ class Basic_Block:
             
 # Define what instructions can be reached from another instruction
      # This is a precursor function for basic block identification/linking
-def extract_all_edges_from_instruction_list(instruction_list):
+def extract_all_edges_from_instruction_list(instruction_list, cfg_backend = "networkx"):
     """
     Parameters
     ----------
     instruction_list : TYPE : List of Instruction_Info objects
         Holds all instructions individually, no assumed connections
+        
+    cfg_backend : TYPE : String, optional
+        "networkx" or "array"
 
     Returns
     -------
-    instruction_graph : TYPE : nx.DiGraph 
+    instruction_graph : TYPE : nx.DiGraph or Array_Instruction_Graph
         Holds the node/edge connections from the instruction_list in a directed graph
         
     Assumptions about instruction links:
-        1) Directly forward (all instructions except exits link to the next one)
+        1) Directly forward (all instructions except exits and JA link to the next one)
         2) Exit instructions do not make a forward link, but can be an end point for a link
-        3) Jump offset to a future instruction (found in the Instruction_Info.offset value)
+        3) Jump offset to any other instruction (found in the Instruction_Info.offset value),
+            a negative offset jumps backward and closes a loop, and JA 0 0 0 links to the next instruction
     """
-    instruction_graph = nx.DiGraph()
+    edge_starts, edge_ends = instruction_edge_arrays(instruction_list)
+    number_of_nodes = max([len(instruction_list)] + [end + 1 for end in edge_ends])
+    return instruction_graph_from_edges(number_of_nodes, edge_starts, edge_ends, cfg_backend)
+
+def instruction_edge_arrays(instruction_list):
+    """
+    Returns
+    -------
+    edge_starts, edge_ends : TYPE : arrays of ints
+        Edge i links instruction edge_starts[i] to instruction edge_ends[i]
+    """
+    edge_starts, edge_ends = array('l'), array('l')
     for instruction_number, instruction in enumerate(instruction_list):
         if instruction_number == len(instruction_list) - 1:
+            # A loop can close with the very last instruction
+            if instruction.instruction_class == Instruction_Class.JUMP and instruction.offset < 0:
+                edge_starts.append(instruction_number)
+                edge_ends.append(instruction_number+instruction.offset+1)
             break
-        if instruction.keyword != "EXIT":
-            instruction_graph.add_edge(instruction_number, instruction_number+1)
-        if instruction.offset != 0:
-            instruction_graph.add_edge(instruction_number, instruction_number+instruction.offset+1)
+        # JA never falls through, it only links to where it jumps (the next instruction too, for an offset of 0)
+        always_jumps = instruction.instruction_class == Instruction_Class.JUMP and instruction.opcode == Jump_Condition.JA
+        if instruction.instruction_class != Instruction_Class.EXIT and not always_jumps:
+            edge_starts.append(instruction_number)
+            edge_ends.append(instruction_number+1)
+        if instruction.instruction_class == Instruction_Class.JUMP and (instruction.offset != 0 or always_jumps):
+            edge_starts.append(instruction_number)
+            edge_ends.append(instruction_number+instruction.offset+1)
+    return edge_starts, edge_ends
+
+def instruction_graph_from_edges(number_of_nodes, edge_starts, edge_ends, cfg_backend = "networkx"):
+    if cfg_backend == "array":
+        return Array_Instruction_Graph(number_of_nodes, edge_starts, edge_ends)
+    instruction_graph = nx.DiGraph()
+    instruction_graph.add_edges_from(zip(edge_starts, edge_ends))
     return instruction_graph
 
 # Identifying Leaders in the linked instructions to form basic blocks
@@ -308,18 +634,26 @@ def identify_leaders(instruction_list):
     for instruction_number, instruction in enumerate(instruction_list):
         # IndexOutOfBound protection, last node can still be found as a possible leader below
         if instruction_number == len(instruction_list) - 1:
+            # (but a backward jump from it still makes its target a leader)
+            if instruction.instruction_class == Instruction_Class.JUMP and instruction.offset < 0:
+                leader_set.add(instruction_number + instruction.offset + 1)
             break
         
         # Rule 1 - First Instruction is a leader
-        elif instruction_number == 0:
+        if instruction_number == 0:
             leader_set.add(instruction_number)
-        else:
-            if "J" in instruction.keyword:
-                # Rule 2 - Instruction L is a leader if there is another instruction which jumps to it
-                leader_set.add(instruction_number + instruction.offset + 1)
-                
-                # Rule 3 - Instruction L is a leader if it immediately follows a jump instruction
-                leader_set.add(instruction_number + 1)
+            
+        # (The first instruction can be a jump too, so this isn't an else)
+        if instruction.instruction_class == Instruction_Class.JUMP:
+            # Rule 2 - Instruction L is a leader if there is another instruction which jumps to it
+            leader_set.add(instruction_number + instruction.offset + 1)
+            
+            # Rule 3 - Instruction L is a leader if it immediately follows a jump instruction
+            leader_set.add(instruction_number + 1)
+
+        # Rule 4 - Instruction L is a leader if it immediately follows an exit (nothing falls into it)
+        if instruction.instruction_class == Instruction_Class.EXIT:
+            leader_set.add(instruction_number + 1)
     return leader_set
 
 # A block consists of a leader, and all instructions until the next leader
@@ -337,6 +671,24 @@ def identify_the_instructions_in_basic_blocks(instruction_list):
         partitioned into their basic blocks
     """
     leader_list = sorted(list(identify_leaders(instruction_list)))
+    return blocks_from_leaders(leader_list, len(instruction_list))
+
+def blocks_from_leaders(leader_list, number_of_instructions):
+    """
+    Parameters
+    ----------
+    leader_list : TYPE : Sorted list of ints
+        Instruction numbers of every leader
+        
+    number_of_instructions : TYPE : Int
+        Length of the program, for the end of the last block
+
+    Returns
+    -------
+    block_list : TYPE : List of Lists of Ints
+        Contains a List holding all instruction numbers (not instruction_info objects)
+        partitioned into their basic blocks
+    """
     block_list = []
     while len(block_list) < len(leader_list):
         index_of_current_leader = len(block_list)
@@ -352,43 +704,86 @@ def identify_the_instructions_in_basic_blocks(instruction_list):
                                             leader_list[index_of_next_leader])]
         except IndexError:
             basic_block = [i for i in range(leader_list[index_of_current_leader],
-                                            len(instruction_list))]
+                                            number_of_instructions)]
         block_list.append(basic_block)
         
     return block_list
 
 # Finding out how to link Basic_Block objects together
-def set_edges_between_basic_blocks(block_list):
+def set_edges_between_basic_blocks(block_list, cfg_backend = "networkx"):
     """
     Parameters
     ----------
-    block_list : TYPE : List of Lists of Ints
-        Contains a List holding all instruction numbers (not instruction_info objects)
-        partitioned into their blocks
+    block_list : TYPE : List of Basic_Block objects
+        Every basic block in the program, in block_id order
+        
+    cfg_backend : TYPE : String, optional
+        "networkx" or "array"
 
     Returns
     -------
-    block_graph : TYPE : nx.DiGraph
+    block_graph : TYPE : nx.DiGraph or Array_Block_Graph
         Holds the node/edge connections in a directed graph created from the block_list,
         where nodes are Basic_Block objects holding all required Instruction_Info objects
     """
-    block_graph = nx.DiGraph()
-    if len(block_list) == 1:
-        block_graph.add_node(block_list[0])
-    else:
+    edge_starts, edge_ends = block_edge_arrays(block_list)
+    return block_graph_from_edges(block_list, edge_starts, edge_ends, cfg_backend)
+
+def block_edge_arrays(block_list):
+    """
+    Returns
+    -------
+    edge_starts, edge_ends : TYPE : arrays of ints
+        Edge i links the block with block_id edge_starts[i] to the block with block_id edge_ends[i]
+    """
+    # Every link out of a block ends on a leader, so each edge is a single lookup
+        # instead of checking every other block's input_links
+    block_with_leader = {block.initial_instruction: block for block in block_list}
+    edge_starts, edge_ends = array('l'), array('l')
+    if len(block_list) > 1:
         for starting_block in block_list:
-            next_blocks = [block for block in block_list 
-                               if starting_block.final_instruction in block.input_links]
-            for next_block in next_blocks:
-                if starting_block.block_instructions[-1].keyword != "EXIT":
-                    block_graph.add_edge(starting_block, next_block)
+            if starting_block.block_instructions[-1].instruction_class != Instruction_Class.EXIT:
+                for leader in starting_block.output_links:
+                    edge_starts.append(starting_block.block_id)
+                    edge_ends.append(block_with_leader[leader].block_id)
+    return edge_starts, edge_ends
+
+def branch_successors(block_graph, block):
+    """
+    Returns
+    -------
+    fall_through_block, jump_block : TYPE : Basic_Block objects (None if there isn't one)
+        Where control goes after block when its last jump falls through, and when it's taken.
+        A jump with an offset of 0 goes to the next instruction either way, so both are the same block.
+        None means control leaves the program (falling off the end, or jumping past it).
+    """
+    fall_through_block, jump_block = None, None
+    for next_block in block_graph.successors(block):
+        if next_block.initial_instruction == block.final_instruction + 1:
+            fall_through_block = next_block
+        else:
+            jump_block = next_block
+    last_instruction = block.block_instructions[-1]
+    if last_instruction.instruction_class == Instruction_Class.JUMP and last_instruction.offset == 0:
+        jump_block = fall_through_block
+    return fall_through_block, jump_block
+
+def block_graph_from_edges(block_list, edge_starts, edge_ends, cfg_backend = "networkx"):
+    if cfg_backend == "array":
+        return Array_Block_Graph(block_list, edge_starts, edge_ends)
+    block_graph = nx.DiGraph()
+    # The start block can have no edges at all (the whole program, or everything up to the first exit)
+    block_graph.add_node(block_list[0])
+    for start_id, end_id in zip(edge_starts, edge_ends):
+        block_graph.add_edge(block_list[start_id], block_list[end_id])
     return block_graph    
 
-def set_up_basic_block_cfg(instruction_list, reg_size, num_regs):
+def set_up_basic_block_cfg(instruction_list, reg_size, num_regs, cfg_backend = "networkx", 
+                           use_cfg_cache = False, cache_directory = CFG_CACHE_DIRECTORY):
     """
     Parameters
     ----------
-    instruction_list : TYPE : List of strings
+    instruction_list : TYPE : List of strings (or Decoded_Instruction records)
         Holds all instructions individually, no assumed connections, in special keyword forms
             
     reg_size : TYPE : Int
@@ -396,44 +791,84 @@ def set_up_basic_block_cfg(instruction_list, reg_size, num_regs):
     
     num_regs : TYPE : Int
         How many different registers the program will attempt to model
+        
+    cfg_backend : TYPE : String, optional
+        "networkx" or "array", for how the instruction and block graphs are stored
+        
+    use_cfg_cache : TYPE : Boolean, optional
+        Load the block partition, edges and SSA ids from the on disk cache if this program has been 
+        set up before (and save them there if not)
+        
+    cache_directory : TYPE : String, optional
+        Folder holding the cache files
 
     Returns
     -------
-    block_graph : TYPE : nx.DiGraph
+    block_graph : TYPE : nx.DiGraph or Array_Block_Graph
         Holds the node/edge connections in a directed graph created from the block_list,
         where nodes are Basic_Block objects holding all required Instruction_Info objects
         
-    register_bitVec_dictionary : TYPE : Dictionary (Strings -> Register_BitVec objects)
-        The reference dictionary for the actual z3 bitVec variables that will be added to the solver.
-        Keys are SSA forms of register names "r{register_number}_{instruction}" where instruction 
-        refers to the specific program instruction where the register was changed to that value
+    register_bitVec_table : TYPE : Register_BitVec_Table object
+        The z3 bitVec variables that will be added to the solver, indexed by SSA id
+        (register_bitVec_table.reg_name(ssa_id) gives the "r{register_number}_{instruction}" name the bitVec has in z3)
         
     block_list[0] : TYPE : Basic_Block object
         The starting block of the graph, so we don't have to find it again
     """
-    instruction_list = [Instruction_Info(instruction, number, reg_size) for number, instruction in enumerate(instruction_list)]
+    cfg_layout = None
+    if use_cfg_cache:
+        cfg_layout = load_cfg_layout(instruction_list, reg_size, num_regs, cache_directory)
+    program_list = instruction_list
+    instruction_list = [Instruction_Info(instruction, number, reg_size) for number, instruction in enumerate(program_list)]
 
-    # Create all the regular register bitVec instances that might be needed.  Does not create phi function registers yet
-    register_bitVec_dictionary = {}
-    for instruction in instruction_list:
-        reg_name = instruction.target_reg_new_name
-        register_bitVec_dictionary[reg_name] = Register_BitVec(reg_name, reg_size)
+    if cfg_layout is None:
+        # Only instructions that change a register get an SSA id (and a place in the table)
+        ssa_instructions = array('l', (instruction.instruction_number for instruction in instruction_list
+                                       if instruction.instruction_class in register_setting_classes))
+        leader_list = sorted(list(identify_leaders(instruction_list)))
+        instruction_edge_starts, instruction_edge_ends = instruction_edge_arrays(instruction_list)
+        number_of_nodes = max([len(instruction_list)] + [end + 1 for end in instruction_edge_ends])
+    else:
+        ssa_instructions = cfg_layout["ssa_instructions"]
+        leader_list = cfg_layout["leaders"]
+        instruction_edge_starts, instruction_edge_ends = cfg_layout["instruction_edges"]
+        number_of_nodes = cfg_layout["number_of_nodes"]
+
+    # Number every regular register version that might be needed.  Does not number phi function registers yet
+    register_bitVec_table = Register_BitVec_Table(reg_size, [instruction_list[number].target_reg for number in ssa_instructions],
+                                                  ssa_instructions)
+    for ssa_id, instruction_number in enumerate(ssa_instructions, 1):
+        instruction_list[instruction_number].target_reg_new_name = ssa_id
     
-    instruction_graph = extract_all_edges_from_instruction_list(instruction_list)
+    # A cache hit only reads the instruction graph for each block's links (the block edges come from the cache),
+        # so it's always built as arrays then, with no networkx graph to fill
+    instruction_graph = instruction_graph_from_edges(number_of_nodes, instruction_edge_starts, instruction_edge_ends, 
+                                                     cfg_backend if cfg_layout is None else "array")
     
     # Actual creation of the basic block CFG
-    block_list_chunks = identify_the_instructions_in_basic_blocks(instruction_list)
+    block_list_chunks = blocks_from_leaders(leader_list, len(instruction_list))
     block_list = []
-    for block_chunk in block_list_chunks:     
-        block_list.append(Basic_Block(num_regs, block_chunk, instruction_list, instruction_graph))
-    block_graph = set_edges_between_basic_blocks(block_list)
+    for block_id, block_chunk in enumerate(block_list_chunks):     
+        block_list.append(Basic_Block(num_regs, block_chunk, instruction_list, instruction_graph, block_id))
+    
+    if cfg_layout is None:
+        block_edge_starts, block_edge_ends = block_edge_arrays(block_list)
+        if use_cfg_cache:
+            save_cfg_layout(program_list, reg_size, num_regs, 
+                            {"leaders": array('l', leader_list), "number_of_nodes": number_of_nodes,
+                             "instruction_edges": (instruction_edge_starts, instruction_edge_ends),
+                             "block_edges": (block_edge_starts, block_edge_ends), "ssa_instructions": ssa_instructions},
+                            cache_directory)
+    else:
+        block_edge_starts, block_edge_ends = cfg_layout["block_edges"]
+    block_graph = block_graph_from_edges(block_list, block_edge_starts, block_edge_ends, cfg_backend)
 
     # Visualization options for the graphs (both instructions and blocks)  
-    # nx.draw_planar(instruction_graph,  with_labels = True)
+    # nx.draw_planar(as_networkx(instruction_graph),  with_labels = True)
     # block_labels = {node:node.name for node in block_graph}
-    # nx.draw_planar(block_graph, labels = block_labels, with_labels = True)
+    # nx.draw_planar(as_networkx(block_graph), labels = block_labels, with_labels = True)
     
-    return block_graph, register_bitVec_dictionary, block_list[0]
+    return block_graph, register_bitVec_table, block_list[0]
     
 # Identify and place phi function for required register changes
 def phi_function_locations(block_graph, start_block):
@@ -442,22 +877,24 @@ def phi_function_locations(block_graph, start_block):
     
     Parameters
     ----------
-    block_graph : TYPE : nx.DiGraph
+    block_graph : TYPE : nx.DiGraph or Array_Block_Graph
         Holds the node/edge connections from the block_list, where nodes are Basic_Block objects 
         holding all required Instruction_Info objects
+        
+    start_block : TYPE : Basic_Block object
+        The entry block of the graph
 
     Returns
     -------
-    block_graph : TYPE : nx.DiGraph
+    block_graph : TYPE : nx.DiGraph or Array_Block_Graph
         Holds the node/edge connections from the block_list, where nodes are Basic_Block objects
         holding all required Instruction_Info objects. Nodes have been updated with 
         Phi functions for specific registers
     """
-    dom_dict = nx.dominance_frontiers(block_graph, start_block)   
+    dom_dict = dominance_frontiers(block_graph, start_block)
 
-    for register_number in range(start_block[0].num_regs):
+    for register_number in range(start_block.num_regs):
         work_list = set()
-        ever_on_work_list = set()
         already_has_phi_func = set()
         
         # Get all nodes which assign a value to our target_reg
@@ -465,10 +902,12 @@ def phi_function_locations(block_graph, start_block):
             if register_number in block.variables_changed_in_block:
                 work_list.add(block)
         
-        ever_on_work_list = work_list
+        ever_on_work_list = set(work_list)
         while len(work_list) != 0:
             check_dom_front_of_block = work_list.pop()
-            for dom_front_node in dom_dict[check_dom_front_of_block]:
+            
+            # Blocks that can't be reached from start_block have no dominance frontier
+            for dom_front_node in dom_dict.get(check_dom_front_of_block, set()):
                 
                 # Insert at most 1 phi function per node
                 if dom_front_node not in already_has_phi_func:
@@ -482,7 +921,8 @@ def phi_function_locations(block_graph, start_block):
     return block_graph
 
 # Startup function to create the CFG, set up the register bitVecs, and initialize phi functions if needed
-def basic_block_CFG_and_phi_function_setup(instruction_list, reg_size, num_regs):
+def basic_block_CFG_and_phi_function_setup(instruction_list, reg_size, num_regs, cfg_backend = "networkx", 
+                                           use_cfg_cache = False, cache_directory = CFG_CACHE_DIRECTORY, build_ssa = False):
     """
     Parameters
     ----------
@@ -494,32 +934,101 @@ def basic_block_CFG_and_phi_function_setup(instruction_list, reg_size, num_regs)
     
     num_regs : TYPE : Int
         How many different registers the program will attempt to model
+        
+    cfg_backend : TYPE : String, optional
+        "networkx" or "array", for how the instruction and block graphs are stored
+        
+    use_cfg_cache, cache_directory : TYPE : Boolean, String, optional
+        On disk CFG cache options, see set_up_basic_block_cfg
+        
+    build_ssa : TYPE : Boolean, optional
+        Place and name the phi functions, and rename every block's registers over the dominator tree,
+        so each block knows its SSA names before anything runs (create_merged_program needs this).
+        create_program picks up names along its path as it goes, so it leaves this off.
 
     Returns
     -------
-    block_graph : TYPE : nx.DiGraph
+    block_graph : TYPE : nx.DiGraph or Array_Block_Graph
         Holds the node/edge connections from the block_list, where nodes are Basic_Block objects
         holding all required Instruction_Info objects. Nodes have been updated with 
         Phi functions for specific registers, and all registers which will be used in the program
         have been created and assigned to their specific blocks ready to be combined with their
         specific eBPF instructions
         
-    register_bitVec_dictionary : TYPE : Dictionary (Strings -> Register_BitVec objects)
-        The reference dictionary for the actual z3 bitVec variables that will be added to the solver.
-        Keys are SSA forms of register names "r{register_number}_{instruction}" where instruction 
-        refers to the specific program instruction where the register was changed to that value
+    register_bitVec_table : TYPE : Register_BitVec_Table object
+        The z3 bitVec variables that will be added to the solver, indexed by SSA id
+        (register_bitVec_table.reg_name(ssa_id) gives the "r{register_number}_{instruction}" name the bitVec has in z3)
         
     block_list[0] : TYPE : Basic_Block object
         The starting block of the graph, so we don't have to find it again
     """    
-    block_graph, register_bitVec_dictionary, start_block = set_up_basic_block_cfg(instruction_list, reg_size, num_regs)
-
-    # Commented out all of the things I had done involving phi functions
-    # Generate the locations of phi functions, name them, and create the register bit vec objects for reference.  
-    # block_graph = phi_function_locations(block_graph, start_block)
-    # for block in block_graph:
-    #     block.create_phi_function_register_names()
-    #     block.get_reg_names_for_beginning_of_block(block_graph)
-    #     for new_phi_reg in block.phi_function_named_registers:
-    #         register_bitVec_dictionary[new_phi_reg] = Register_BitVec(new_phi_reg, reg_size)
-    return block_graph, register_bitVec_dictionary, start_block
\ No newline at end of file
+    block_graph, register_bitVec_table, start_block = set_up_basic_block_cfg(instruction_list, reg_size, num_regs, cfg_backend, 
+                                                                             use_cfg_cache, cache_directory)
+
+    # Generate the locations of phi functions, and give them SSA ids in the register bitVec table.  
+    if build_ssa and start_block in block_graph:
+        block_graph = phi_function_locations(block_graph, start_block)
+        for block in block_graph:
+            block.create_phi_function_register_names(register_bitVec_table)
+        rename_registers_over_dominator_tree(block_graph, start_block)
+    return block_graph, register_bitVec_table, start_block
+
+def rename_registers_over_dominator_tree(block_graph, start_block):
+    """
+    Renaming step of SSA construction (Cytron 1991), after the phi functions have been named.
+    
+    Walks the dominator tree from start_block with a stack of names for every register.  
+        A block starts with whatever is on top of the stacks (its phi names pushed first), 
+        every instruction pushes its target's new name, and before going down to the children
+        each successor's phi functions get told which name arrives from this block.
+        Popping on the way back up means a block only ever sees the names from its dominators.
+    
+    Fills in register_names_before_block_executes, register_names_after_block_executes 
+        and phi_function_operands on every block reachable from start_block
+        (UNINITIALIZED still means the register was never set along the way)
+
+    Parameters
+    ----------
+    block_graph : TYPE : nx.DiGraph or Array_Block_Graph
+        Block CFG with phi functions already placed and named
+        
+    start_block : TYPE : Basic_Block object
+        The entry block of the graph
+
+    Returns
+    -------
+    None.
+    """
+    children = dominator_tree_children(immediate_dominators(block_graph, start_block), start_block)
+    
+    name_stacks = [[UNINITIALIZED] for _ in range(start_block.num_regs)]
+    
+    # Iterative walk (deep trees would hit the recursion limit): ("enter", block) then ("leave", pushed registers)
+    work_list = [("enter", start_block)]
+    while work_list:
+        step, item = work_list.pop()
+        if step == "leave":
+            for register_number in item:
+                name_stacks[register_number].pop()
+            continue
+        
+        block = item
+        pushed_registers = []
+        for register_number, ssa_id in block.phi_function_named_registers.items():
+            name_stacks[register_number].append(ssa_id)
+            pushed_registers.append(register_number)
+        block.register_names_before_block_executes = tuple(names[-1] for names in name_stacks)
+        
+        for instruction in block.block_instructions:
+            if instruction.instruction_class in register_setting_classes:
+                name_stacks[instruction.target_reg].append(instruction.target_reg_new_name)
+                pushed_registers.append(instruction.target_reg)
+        block.register_names_after_block_executes = tuple(names[-1] for names in name_stacks)
+        
+        for next_block in block_graph.successors(block):
+            for register_number, operands in next_block.phi_function_operands.items():
+                operands[block] = name_stacks[register_number][-1]
+        
+        work_list.append(("leave", pushed_registers))
+        for child in reversed(children[block]):
+            work_list.append(("enter", child))
\ No newline at end of file
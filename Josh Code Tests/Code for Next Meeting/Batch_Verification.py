@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:18:27 2026
+
+@author: joshc
+
+verify_many runs a whole list of programs through the verifier, spread across a process pool,
+    instead of calling create_program one at a time in a for loop.
+
+    Each worker is its own Python process, started with "spawn" (a fresh interpreter, not a fork) on every platform,
+        so each one builds its own z3 context and no z3 state is ever shared between workers (or with the
+        process calling verify_many).
+
+    Nothing is printed for the programs themselves.  verify_many hands back one Verification_Result per
+        program (with program_number set to its place in the list), in the same order as the programs were given.
+
+    A program that crashes the verifier doesn't stop the batch, its result comes back with
+        status "crash" and the exception in error_message.
+
+Spawning reruns the calling script in every worker, so scripts calling verify_many need their driver code
+    under if __name__ == "__main__":
+"""
+from FOL_from_BPF import *
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+
+def verify_one_program(batch_job):
+    """
+    Parameters
+    ----------
+    batch_job : TYPE : Tuple
+        (program_number, instructions, num_regs, reg_size, inputs, options),
+        where options holds any create_program keyword options
+
+    Returns
+    -------
+    result : TYPE : Verification_Result object
+        The create_program result for the program, with program_number set
+    """
+    program_number, instructions, num_regs, reg_size, inputs, options = batch_job
+    start_time = time.time()
+    try:
+        result = create_program(instructions, num_regs, reg_size, inputs, **options)
+    except Exception as crash:
+        result = Verification_Result(status = "crash", error_message = repr(crash), 
+                                     timings = {"total": time.time() - start_time},
+                                     number_of_instructions = len(inputs) + len(instructions))
+    result.program_number = program_number
+    return result
+
+def verify_many(programs, workers = None, num_regs = 4, reg_size = 8, inputs = [], chunksize = None, **options):
+    """
+    Parameters
+    ----------
+    programs : TYPE : List of Lists of strings
+        Every program to verify, each in keyword form
+
+    workers : TYPE : Int, optional
+        How many worker processes to use.  None uses every core, 1 runs everything in this process (no pool)
+
+    num_regs, reg_size, inputs : TYPE : optional
+        Same as create_program, used for every program
+
+    chunksize : TYPE : Int, optional
+        How many programs get sent to a worker at once.  Defaults to about 4 chunks per worker,
+        since most generated programs verify in milliseconds and the pickling would swamp them otherwise
+
+    options :
+        Any other create_program keyword options (incremental_solver, cfg_backend, use_cfg_cache), 
+        except reporter, since workers don't print
+
+    Returns
+    -------
+    batch_results : TYPE : List of Verification_Result objects
+        One result per program, in the same order as programs
+    """
+    batch_jobs = [(program_number, instructions, num_regs, reg_size, inputs, options)
+                  for program_number, instructions in enumerate(programs)]
+    if workers == 1:
+        return [verify_one_program(batch_job) for batch_job in batch_jobs]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(batch_jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers = workers, mp_context = multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(verify_one_program, batch_jobs, chunksize = chunksize))
+
+def print_batch_summary(batch_results):
+    status_counts = {}
+    for result in batch_results:
+        status_counts[result.status] = status_counts.get(result.status, 0) + 1
+    print(f'Programs Verified: {len(batch_results)}')
+    for status, count in sorted(status_counts.items()):
+        print(f'\t{status}: {count}')
+    print('\tTotal Verifier Time: %0.3f seconds' %(sum(result.timings["total"] for result in batch_results)))
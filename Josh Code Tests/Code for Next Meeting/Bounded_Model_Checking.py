@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:24:49 2026
+
+@author: joshc
+
+Bounded model checking for programs with loops
+
+    create_program follows one path, and gives up on a loop after loop_bound runs.  bounded_model_check
+        looks at every path at once instead, one step (one basic block) deeper at a time:
+
+        State at frame k
+            pc_k (which block runs next, or EXITED/ERROR), r{n}_{k} for every register, and
+            r{n}_initialized_{k} (reading a register before anything was put in it is an error, like in create_program)
+
+        Frame encoding (Frame_Encoding)
+            What every block does is worked out once, over a single set of template state variables, into one
+            transition formula: pc_{k+1} and every register at k+1, as If chains over which block pc_k is.
+            Each deeper frame is that same formula renamed onto the frame's variables with z3 substitute,
+            so nothing about the program is rebuilt as the depth goes up.
+
+        Incremental deepening
+            One Solver for the whole run.  Going one frame deeper only asserts the new frame's transition, and the
+            checks at each depth are switched on as assumption literals (same idea as check_jump), so nothing is
+            re-added or solved from scratch.  At every depth:
+                1) Can frame k be in ERROR, or EXITED with exit_property false?  Then the property is violated,
+                    and the model is the counterexample (its path, registers, and the instruction that broke).
+                2) Can frame k still be running?  If not, every path has ended, and the property holds.
+                3) Otherwise assert the transition to frame k+1 and go again, up to max_depth ("unknown" after that).
+
+    Registers start uninitialized (the same as create_program), except symbolic_registers, which start out
+        holding any value at all (inputs the property has to hold for).
+    Memory instructions aren't modeled here yet.
+"""
+from FOL_from_BPF import *
+
+class Frame_Encoding:
+    def __init__(self, block_graph, start_block, num_regs, reg_size):
+        """
+        Parameters
+        ----------
+        block_graph : TYPE : nx.DiGraph or Array_Block_Graph
+            The block CFG (from a Program_Holder)
+
+        start_block : TYPE : Basic_Block object
+
+        num_regs, reg_size : TYPE : Int
+
+        Returns
+        -------
+        None.
+        """
+        self.num_regs = num_regs
+        self.reg_size = reg_size
+        self.blocks = sorted(block_graph, key = lambda block: block.block_id)
+        self.start_block = start_block
+        self.block_number = {block: number for number, block in enumerate(self.blocks)}
+        self.EXITED = len(self.blocks)
+        self.ERROR = len(self.blocks) + 1
+        self.pc_size = max(2, (self.ERROR).bit_length() + 1)
+
+        # (instruction number, problem message, condition over the template state) for every block
+        self.problems = {}
+        self.template = self.state("template")
+        self.next_template = self.state("template_next")
+        self.transition_template = self.build_transition(block_graph)
+
+        # Frame variables, made once per frame (prefix, frame) -> state
+        self.frames = {}
+
+    def state(self, name):
+        """
+        Returns
+        -------
+        state : TYPE : (z3 BitVec, List of z3 BitVecs, List of z3 Bools)
+            pc, registers and initialized flags named for one frame
+        """
+        pc = BitVec(f'pc_{name}', self.pc_size)
+        registers = [BitVec(f'r{register_number}_{name}', self.reg_size) for register_number in range(self.num_regs)]
+        initialized = [Bool(f'r{register_number}_initialized_{name}') for register_number in range(self.num_regs)]
+        return pc, registers, initialized
+
+    def frame(self, frame_number, prefix = ""):
+        key = (prefix, frame_number)
+        if key not in self.frames:
+            self.frames[key] = self.state(f'{prefix}{frame_number}')
+        return self.frames[key]
+
+    def block_effect(self, block):
+        """
+        Runs a block on the template state
+
+        Returns
+        -------
+        registers, initialized : TYPE : Lists of z3 terms
+            Every register (and whether it holds anything) after the block
+
+        fall_through : TYPE : z3 Boolean or None
+            Condition for falling through the jump at the end of the block (None if it doesn't end in a jump)
+        """
+        pc, registers, initialized = self.template
+        registers, initialized = list(registers), list(initialized)
+        problems = []
+        fall_through = None
+
+        def read(register_number, instruction):
+            if register_number >= self.num_regs:
+                problems.append((instruction.instruction_number, "Attempting to execute instruction using non-initialized register", BoolVal(True)))
+                return FreshConst(BitVecSort(self.reg_size), 'out_of_range')
+            if initialized[register_number] is not True:
+                problems.append((instruction.instruction_number, "Attempting to execute instruction using non-initialized register",
+                                 Not(initialized[register_number])))
+            return registers[register_number]
+
+        for instruction in block.block_instructions:
+            # An EXIT is always the last instruction of its block (see identify_leaders), there is nothing to add for it
+            if instruction.instruction_class == Instruction_Class.EXIT:
+                continue
+            if instruction.instruction_class in (Instruction_Class.LOAD, Instruction_Class.STORE):
+                problems.append((instruction.instruction_number, "Memory instructions aren't supported in bounded model checking", BoolVal(True)))
+                break
+            if instruction.opcode == Jump_Condition.JA and instruction.instruction_class == Instruction_Class.JUMP:
+                fall_through = BoolVal(False)
+                continue
+            problem_count = len(problems)
+            source_val = instruction.input_value_bitVec_Constant if instruction.input_value_is_const else \
+                            read(instruction.input_value, instruction)
+            target_reg_old_val = None
+            if instruction.instruction_class == Instruction_Class.JUMP or instruction.opcode != ALU_Op.MOV:
+                target_reg_old_val = read(instruction.target_reg, instruction)
+            if len(problems) > problem_count:
+                # create_program stops at the first problem, so later instructions in the block never run on this path
+                problems[problem_count:] = [(problems[problem_count][0], problems[problem_count][1],
+                                             Or([condition for _, _, condition in problems[problem_count:]]))]
+            try:
+                if instruction.instruction_class == Instruction_Class.JUMP:
+                    fall_through = fall_through_condition(instruction, target_reg_old_val, source_val)
+                    new_value = fall_through
+                else:
+                    new_value = alu_operation(instruction, target_reg_old_val, source_val)
+                problem_message = "Keyword isn't a valid form for this program" if new_value is None else ""
+            except Z3Exception:
+                new_value, problem_message = None, "Attempting to execute instruction using an input value that doesn't fit in the register"
+            if problem_message:
+                problems.append((instruction.instruction_number, problem_message, BoolVal(True)))
+                break
+            if instruction.instruction_class != Instruction_Class.JUMP:
+                registers[instruction.target_reg] = new_value
+                initialized[instruction.target_reg] = True
+        self.problems[block] = problems
+        return registers, [BoolVal(True) if flag is True else flag for flag in initialized], fall_through
+
+    def next_pc(self, block_graph, block, fall_through):
+        # Block number control moves to (EXITED for an EXIT, the end of the program, or falling off it)
+        if len(block.output_links) == 0 or block.block_instructions[-1].instruction_class == Instruction_Class.EXIT:
+            return BitVecVal(self.EXITED, self.pc_size)
+        true_block, false_block = branch_successors(block_graph, block)
+        true_number = self.EXITED if true_block is None else self.block_number[true_block]
+        false_number = self.EXITED if false_block is None else self.block_number[false_block]
+        if fall_through is None:
+            return BitVecVal(true_number, self.pc_size)
+        return If(fall_through, BitVecVal(true_number, self.pc_size), BitVecVal(false_number, self.pc_size))
+
+    def build_transition(self, block_graph):
+        # The transition formula from the template state to the next template state (see the top of the file)
+        pc, registers, initialized = self.template
+        next_pc, next_registers, next_initialized = self.next_template
+
+        pc_value = If(pc == self.EXITED, BitVecVal(self.EXITED, self.pc_size), BitVecVal(self.ERROR, self.pc_size))
+        register_values, initialized_values = list(registers), list(initialized)
+        for block in reversed(self.blocks):
+            block_registers, block_initialized, fall_through = self.block_effect(block)
+            at_block = pc == self.block_number[block]
+            block_pc = self.next_pc(block_graph, block, fall_through)
+            if self.problems[block]:
+                block_pc = If(Or([condition for _, _, condition in self.problems[block]]), BitVecVal(self.ERROR, self.pc_size), block_pc)
+            pc_value = If(at_block, block_pc, pc_value)
+            for register_number in range(self.num_regs):
+                if not block_registers[register_number].eq(registers[register_number]):
+                    register_values[register_number] = If(at_block, block_registers[register_number], register_values[register_number])
+                if not block_initialized[register_number].eq(initialized[register_number]):
+                    initialized_values[register_number] = If(at_block, block_initialized[register_number], initialized_values[register_number])
+        return And([next_pc == pc_value] +
+                   [next_register == value for next_register, value in zip(next_registers, register_values)] +
+                   [next_flag == value for next_flag, value in zip(next_initialized, initialized_values)])
+
+    def renaming(self, template_state, state):
+        pc, registers, initialized = template_state
+        frame_pc, frame_registers, frame_initialized = state
+        return [(pc, frame_pc)] + list(zip(registers, frame_registers)) + list(zip(initialized, frame_initialized))
+
+    def transition(self, frame_number, prefix = ""):
+        # Frame frame_number to frame_number + 1, the template renamed onto both frames
+        return substitute(self.transition_template, *(self.renaming(self.template, self.frame(frame_number, prefix)) +
+                                                      self.renaming(self.next_template, self.frame(frame_number + 1, prefix))))
+
+    def initial_state(self, symbolic_registers = (), prefix = ""):
+        pc, registers, initialized = self.frame(0, prefix)
+        return And([pc == self.block_number[self.start_block]] +
+                   [flag == (register_number in symbolic_registers) for register_number, flag in enumerate(initialized)])
+
+    def bad(self, frame_number, exit_property = None, prefix = ""):
+        # Frame frame_number broke the program, or exited without exit_property holding
+        pc, registers, initialized = self.frame(frame_number, prefix)
+        if exit_property is None:
+            return pc == self.ERROR
+        return Or(pc == self.ERROR, And(pc == self.EXITED, Not(exit_property(registers))))
+
+    def running(self, frame_number, prefix = ""):
+        pc, registers, initialized = self.frame(frame_number, prefix)
+        return And(pc != self.EXITED, pc != self.ERROR)
+
+    def counterexample(self, model, depth, prefix = ""):
+        """
+        Returns
+        -------
+        final_values : TYPE : List of Ints (None for uninitialized registers)
+            The registers at frame depth
+
+        path : TYPE : List of Ints
+            Leaders of the blocks the model runs through
+
+        error_location, error_message : TYPE : Int (or None), String
+            The instruction that broke the program, if it broke
+        """
+        path, last_block = [], None
+        for frame_number in range(depth + 1):
+            pc, registers, initialized = self.frame(frame_number, prefix)
+            block_number = model.eval(pc, model_completion = True).as_long()
+            if block_number >= self.EXITED:
+                break
+            last_block = self.blocks[block_number]
+            path.append(last_block.initial_instruction)
+
+        pc, registers, initialized = self.frame(depth, prefix)
+        final_values = [model.eval(register, model_completion = True).as_long()
+                        if is_true(model.eval(flag, model_completion = True)) else None
+                        for register, flag in zip(registers, initialized)]
+
+        error_location, error_message = None, ""
+        if model.eval(pc, model_completion = True).as_long() == self.ERROR and last_block is not None:
+            block_state = self.frame(len(path) - 1, prefix)
+            for instruction_number, problem_message, condition in self.problems[last_block]:
+                if is_true(model.eval(substitute(condition, *self.renaming(self.template, block_state)), model_completion = True)):
+                    error_location, error_message = instruction_number, problem_message
+                    break
+        return final_values, path, error_location, error_message
+
+def bounded_model_check(instructions, num_regs = 4, reg_size = 8, inputs = [], exit_property = None, max_depth = 200,
+                        symbolic_registers = (), cfg_backend = "networkx", reporter = None):
+    """
+    Parameters
+    ----------
+    instructions, num_regs, reg_size, inputs, cfg_backend, reporter :
+        Same as create_program
+
+    exit_property : TYPE : Function, optional
+        Takes the list of register bitVecs when the program exits, and gives back the z3 Boolean that has to hold
+        there (lambda registers: ULT(registers[0], 100)).  None only checks the program never breaks.
+
+    max_depth : TYPE : Int, optional
+        Most frames (blocks run along any path) to look at before giving up
+
+    symbolic_registers : TYPE : Collection of Ints, optional
+        Registers that start out initialized to any value
+
+    Returns
+    -------
+    result : TYPE : Verification_Result object
+        status is "violated" (with the counterexample's final values, path and problem instruction),
+        "holds" (every path ended within depth frames, final values from one of them), or "unknown" (max_depth ran out).
+        result.depth is the frame it was decided at.
+    """
+    if reporter is None:
+        reporter = Silent_Reporter()
+    instruction_list = get_runtime_parameters(inputs)
+    instruction_list.extend(instructions)
+    reporter.program_listing(instruction_list)
+
+    start_time = time.time()
+    program = Program_Holder(instruction_list, reg_size, num_regs, cfg_backend = cfg_backend, reporter = reporter,
+                             abstract_interpretation = False)
+    encoding = Frame_Encoding(program.block_graph, program.start_block, num_regs, reg_size)
+    graph_made = time.time()
+
+    solver = Solver()
+    solver.add(encoding.initial_state(symbolic_registers))
+    final_values, path, error_location, error_message = None, [], None, ""
+    status = "unknown"
+    for depth in range(max_depth + 1):
+        violation = FreshBool('violation')
+        solver.add(Implies(violation, encoding.bad(depth, exit_property)))
+        if solver.check(violation) == sat:
+            status = "violated"
+            final_values, path, error_location, error_message = encoding.counterexample(solver.model(), depth)
+            if error_location is None:
+                error_message = "Exit property doesn't hold"
+            else:
+                # Like create_program, a broken program has no final values
+                final_values = None
+            break
+        still_running = FreshBool('running')
+        solver.add(Implies(still_running, encoding.running(depth)))
+        if solver.check(still_running) == unsat:
+            status = "holds"
+            if solver.check() == sat:
+                final_values, path, error_location, error_message = encoding.counterexample(solver.model(), depth)
+            break
+        if depth < max_depth:
+            solver.add(encoding.transition(depth))
+    end_time = time.time()
+
+    result = Verification_Result(final_values, status, path, error_location, error_message,
+                                 {"cfg": graph_made - start_time, "formula": 0, "solve": end_time - graph_made,
+                                  "total": end_time - start_time}, len(instruction_list))
+    result.depth = depth
+    reporter.results(result)
+    return result
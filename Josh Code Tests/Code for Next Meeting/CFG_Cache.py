@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:15:59 2026
+
+@author: joshc
+
+On disk cache for the CFG layout of a program, so verifying the same program again
+    (usually with different inputs to create_program) doesn't redo the leader search and edge building.
+
+Cache files are content addressed:
+    The file name is a hash of the instruction list, reg_size and num_regs, so the same program
+        always finds the same file, and any change to the program makes a new one.
+        
+    Only the parts of an instruction that decide the CFG go into the hash (keyword, target register, 
+        and jump offset).  Inputs to create_program become MOV64XC instructions at the front of the 
+        program, so rerunning with different inputs only changes immediates, and still finds the same file.
+
+    Each file holds (as a pickled dictionary of plain ints/strings/arrays, no z3 objects):
+        "leaders"               Sorted leader instruction numbers (the block partition)
+        "number_of_nodes"       How many nodes the instruction graph needs
+        "instruction_edges"     (edge_starts, edge_ends) between instruction numbers
+        "block_edges"           (edge_starts, edge_ends) between block ids
+        "ssa_instructions"      Instruction number of every instruction that sets a register, in SSA id order
+
+    z3 objects can't be pickled, so the Register_BitVec_Table is still made fresh each run, only from the cached
+        layout instead of being searched for.  The Instruction_Info objects are still made too (the immediates
+        aren't in the cache), but their z3 constants wait until a formula needs them.
+
+Invalidation:
+    PARSER_VERSION is a hash of the source of the files that parse programs and build the CFG.
+    It is stored in every cache file, and a file made by a different version is ignored and rewritten,
+        so editing the parser can never hand back a stale CFG.
+"""
+import hashlib, os, pickle
+
+CFG_CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CFG Cache")
+
+# Any change to these files changes how a program is parsed or split up
+parser_source_files = ["Basic_Block_CFG_Creator.py", "Array_CFG.py", "CFG_Cache.py"]
+
+def get_parser_version():
+    version_hash = hashlib.sha256()
+    for file_name in parser_source_files:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name), "rb") as source_file:
+            version_hash.update(source_file.read())
+    return version_hash.hexdigest()[:16]
+
+PARSER_VERSION = get_parser_version()
+
+def program_hash(instruction_list, reg_size, num_regs):
+    """
+    Parameters
+    ----------
+    instruction_list : TYPE : List of strings (or Decoded_Instruction records)
+        The program in keyword form
+
+    reg_size : TYPE : Int
+
+    num_regs : TYPE : Int
+
+    Returns
+    -------
+    TYPE : String
+        Hex digest naming the cache file for this program
+    """
+    program_key = hashlib.sha256()
+    program_key.update(f'{reg_size} {num_regs}\n'.encode())
+    for instruction in instruction_list:
+        program_key.update(cfg_form_of_instruction(str(instruction)).encode() + b'\n')
+    return program_key.hexdigest()
+
+# Drops the immediate value from an instruction, since it never changes the block partition, edges or SSA ids
+    # "ADD64XC 1 5" -> "ADD64XC 1", "JNEXY 2 1 3" -> "JNEXY 2 3"
+def cfg_form_of_instruction(instruction):
+    split_ins = instruction.split(" ")
+    return " ".join(split_ins[:2] + split_ins[3:])
+
+def cache_file_path(instruction_list, reg_size, num_regs, cache_directory = CFG_CACHE_DIRECTORY):
+    return os.path.join(cache_directory, program_hash(instruction_list, reg_size, num_regs) + ".cfg")
+
+def load_cfg_layout(instruction_list, reg_size, num_regs, cache_directory = CFG_CACHE_DIRECTORY):
+    """
+    Returns
+    -------
+    cfg_layout : TYPE : Dictionary or None
+        The cached layout (see the top of the file), or None if there is no usable cache file
+        (never made, unreadable, or made by a different PARSER_VERSION)
+    """
+    try:
+        with open(cache_file_path(instruction_list, reg_size, num_regs, cache_directory), "rb") as cache_file:
+            cfg_layout = pickle.load(cache_file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(cfg_layout, dict) or cfg_layout.get("parser_version") != PARSER_VERSION:
+        return None
+    return cfg_layout
+
+def save_cfg_layout(instruction_list, reg_size, num_regs, cfg_layout, cache_directory = CFG_CACHE_DIRECTORY):
+    """
+    Writes cfg_layout (stamped with PARSER_VERSION) to the program's cache file.
+    The file is written under a temp name and then renamed, so a half written file is never read back.
+    """
+    os.makedirs(cache_directory, exist_ok = True)
+    cfg_layout = dict(cfg_layout, parser_version = PARSER_VERSION)
+    file_path = cache_file_path(instruction_list, reg_size, num_regs, cache_directory)
+    temp_path = f'{file_path}.{os.getpid()}.tmp'
+    with open(temp_path, "wb") as cache_file:
+        pickle.dump(cfg_layout, cache_file, protocol = pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, file_path)
@@ -0,0 +1,953 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:06:28 2026
+
+@author: joshc
+
+Runs the same programs through two different evaluators and checks that the final registers match.
+
+    execute_concrete vs create_program
+        The SmartNic tests (and random keyword programs) should come out exactly the same,
+        since execute_concrete only replaces the z3 formulas with plain ints.
+        The path of blocks taken has to match too, and every evaluator (on both CFG backends) has to stop at an EXIT
+        in the middle of the program.
+        
+    Every ALU opcode, execute_concrete vs create_program
+        Each operation (32 and 64 bit, immediate and register source) on edge case values, plus a handful of
+        results worked out by hand from the kernel's rules (division by 0 is 0, modulo by 0 leaves the register alone,
+        byte swaps).  execute_concrete isn't allowed to hand any of them over to create_program.
+        
+    Every jump condition, execute_concrete vs create_program vs create_merged_program
+        The same thing for jumps (JA and the 32 bit JMP32 forms too), checked on whether r2 gets set after the jump.
+        Jumps with an offset of 0 go to the next instruction either way (bounded model checking has to agree too).
+        
+    Stack and context memory, execute_concrete vs create_program
+        Spills and fills of every size (little endian, partly overwritten, read back at other sizes) worked out by hand,
+        and random programs storing and loading around the stack.  Context reads, addresses that aren't known,
+        and reads outside the stack/context or of stack nothing wrote only run in create_program, and are checked
+        against the result they should give (jumps on context values only taking paths the earlier jumps allow).
+        
+    cfg_backend = "array" vs cfg_backend = "networkx"
+        Same program, same solver, only the storage of the CFG changes.
+        
+    verify_many vs create_program
+        The process pool should hand back exactly what a serial loop over create_program does, in order.
+        
+    create_merged_program vs create_program
+        Merging every path into one formula has to pick out the same path, final values and problem 
+        instruction as walking the single path.
+        
+    Dominators.py vs networkx
+        Random CFGs (up to 100k nodes, forward jumps only like eBPF, and with back edges for loops) 
+        need the same immediate dominators and dominance frontiers as nx.immediate_dominators 
+        and nx.dominance_frontiers, on both CFG backends.
+        
+    Loops (backward jumps)
+        Loops.py's strongly connected components have to be the same as networkx's on the random CFGs with back edges.
+        Counted loops (nested, closing on the last instruction, going past loop_bound) worked out by hand,
+        and random loop programs, have to come out the same from execute_concrete and create_program
+        (both solver modes, and through bytecode).
+        
+    Bounded model checking vs create_program
+        Every path at once has to find the same path, final values and problem instruction as walking the one path,
+        on random programs and random loop programs.  Exit properties on the counted loops have to hold when they
+        are right and be violated when they are off by one, the loop past loop_bound has to finish, a loop that never
+        ends has to stay unknown, and loops running off a symbolic register are checked for every value of it.
+        
+    k-induction vs create_program
+        Exit properties built from create_program's r0 on random loop programs have to hold, and be violated
+        (with the same counterexample) when they are off by one, and broken programs have to break on the same instruction.
+        Loops too long for bounded_model_check (hundreds of trips, symbolic trip counts) have to be proved
+        at the k worked out by hand.
+        
+    Deciding jumps without z3, create_program with and without the tnum/bounds pass
+        Abstract_Interpretation.py only decides a jump when every path through it goes the same way, and create_program keeps
+        the way each earlier jump went in the path, so random programs, random loop programs and random memory programs
+        have to walk exactly the same path either way.  Those are all concrete, so random programs loading from the context
+        (masks, JMP32 and signed jumps on what they load) have to come out with the same path, problem and r0 too.
+        Jumps on context bytes, masked registers, byte swaps, a register against itself, and right after a counted loop
+        have to be decided without the solver (worked out by hand), and a jump that really depends on the context can't be.
+
+    tnum.py on Python ints vs z3 terms
+        Every tnum operation (all of kernel tnum.c) on random 64 bit tnums has to give the same tnum on plain ints as on
+        BitVecVals, plus a handful of results worked out by hand from tnum.c.  Soundness itself is proved with z3
+        at the bottom of tnum.py.
+
+    eBPF bytecode vs keyword strings
+        Encoding a keyword program as struct bpf_insn bytecode and loading it back (BPF_Bytecode_Loader.py)
+        has to verify the same as the keyword program, including LDDW constants a MOV64XC couldn't hold,
+        jumps over them, and programs pulled out of an ELF object file.
+        
+    Multi-line SmartNic files vs the one line test strings
+        Every SmartNic test rewritten the way inst_test.cc has it (one instruction per line, // and multi-line /* */
+        comments, all of the programs in one file) has to stream out of iter_smartnic_programs as the same programs.
+
+    C instruction macros vs keyword strings
+        Every program written out with translate_to_bpf_in_c as struct bpf_insn arrays and kernel selftest .insns
+        (with #defines standing in for some of the instructions) has to come back out of BPF_C_Macro_Extractor.py
+        as the same instructions, and verify the same.
+"""
+from FOL_from_BPF import *
+from Random_Keyword_Programs import *
+from Batch_Verification import *
+from Path_Merging_FOL import *
+from Dominators import *
+from BPF_Bytecode_Loader import *
+from BPF_C_Macro_Extractor import *
+from Loops import *
+from Bounded_Model_Checking import *
+from K_Induction import *
+import random, struct, re, io, itertools
+
+def compare_evaluators(name, first_function, second_function, program_list, num_regs, reg_size, inputs = []):
+    first_result = first_function(program_list, num_regs, reg_size, inputs)
+    second_result = second_function(program_list, num_regs, reg_size, inputs)
+    if (first_result.final_values, first_result.path, first_result.error_location) != \
+            (second_result.final_values, second_result.path, second_result.error_location):
+        print(f'*** {name} MISMATCH ***')
+        print(f'\t{first_function.__name__}: {first_result}, path {first_result.path}')
+        print(f'\t{second_function.__name__}: {second_result}, path {second_result.path}')
+        print(f'\tProgram: {program_list}')
+        return False
+    return True
+
+smartnic_tests = {
+    1 : "{inst(MOV64XC, 0, 0xffffffff), inst(ADD64XY, 0, 0), inst(EXIT),};",
+    2 : "{inst(MOV64XC, 0, 0xffffffff), inst(ADD32XY, 0, 0), inst(EXIT),};",
+    3 : "{inst(MOV32XC, 0, -1), inst(ADD64XC, 0, 0x1), inst(MOV64XC, 1, 0x0), inst(JEQXC, 0, 0, 4), inst(MOV64XC, 0, -1), inst(JEQXC, 0, 0xffffffff, 1), inst(EXIT), inst(MOV64XC, 0, 0), inst(EXIT),};",
+    4 : "{inst(MOV32XC, 0, 0xffffffff), inst(ADD64XC, 0, 0x1), inst(MOV64XC, 1, 0x0), inst(JEQXY, 0, 1, 4), inst(MOV64XY, 1, 0), inst(JEQXY, 0, 1, 1), inst(EXIT), inst(ADD64XC, 0, 0x1), inst(EXIT),};",
+    11 : "{inst(MOV64XC, 0, -1), inst(RSH64XC, 0, 63), inst(JEQXC, 0, 1, 1), inst(EXIT), inst(MOV64XC, 0, -1), inst(RSH32XC, 0, 1), inst(EXIT),};",
+    12 : "{inst(MOV64XC, 0, -1), inst(ARSH64XC, 0, 63), inst(MOV64XC, 1, -1), inst(JEQXY, 0, 1, 1), inst(EXIT), inst(MOV64XC, 0, -1), inst(ARSH32XC, 0, 1), inst(EXIT),};",
+    13 : "{inst(MOV32XC, 0, -1), inst(JGTXC, 0, 0, 1), inst(EXIT), inst(MOV64XC, 1, -1), inst(JGTXY, 1, 0, 1), inst(EXIT), inst(MOV64XC, 0, 0), inst(EXIT),};",
+    14 : "{inst(MOV64XC, 0, -1), inst(JSGTXC, 0, 0, 4), inst(JSGTXC, 0, 0xffffffff, 3), inst(MOV64XC, 1, 0), inst(JSGTXY, 0, 1, 1), inst(MOV64XC, 0, 0), inst(EXIT),};",
+    15 : "{inst(MOV32XC, 0, -1), inst(JGTXC, 0, -2, 1), inst(MOV64XC, 0, 0), inst(EXIT),};",
+    }
+
+# (program, r0) where an EXIT in the middle of the program has to stop it, even with nothing jumping past it
+early_exit_results = [(["MOV64XC 0 1", "EXIT", "MOV64XC 0 2", "EXIT"], 1),
+                      (["MOV64XC 0 1", "JEQXC 0 1 2", "EXIT", "MOV64XC 0 2", "EXIT", "MOV64XC 0 3", "EXIT"], 1),
+                      (["MOV64XC 0 1", "JEQXC 0 2 2", "ADD64XC 0 4", "EXIT", "MOV64XC 0 2", "EXIT"], 5),
+                      (["MOV64XC 0 7", "MOV64XC 1 3", "EXIT", "MOV64XC 0 1", "EXIT"], 7)]
+
+def differential_concrete_vs_z3(random_programs = 200, program_size = 40, num_regs = 4):
+    print("\nexecute_concrete vs create_program")
+    passed, attempted = 0, 0
+    for program_list, expected in early_exit_results:
+        # (the start block has no edges here, so both CFG backends have to keep it in the graph anyway)
+        for evaluator in [execute_concrete_only, create_program, create_merged_program, bounded_model_check_only,
+                          create_program_array_backend, create_merged_program_array_backend, bounded_model_check_array_backend]:
+            result = evaluator(program_list, 2, 64)
+            attempted += 1
+            if (result.final_values or [None])[0] != expected:
+                print(f'*** {program_list} ({evaluator.__name__}) gave {result}, expected r0 = {expected} ***')
+                continue
+            passed += 1
+    for test_number, smartnic_test in smartnic_tests.items():
+        program_list = translate_smartnic_to_python_stars_comments(smartnic_test)
+        passed += compare_evaluators(f'SmartNic Test {test_number}', execute_concrete, create_program, program_list, 2, 64)
+        attempted += 1
+    for seed in range(random_programs):
+        program_list = random_keyword_program(program_size, num_regs, seed)
+        passed += compare_evaluators(f'Random Program {seed}', execute_concrete, create_program, program_list, num_regs, 64)
+        attempted += 1
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+class Fallback_Reporter(Silent_Reporter):
+    def __init__(self):
+        self.fell_back = False
+
+    def concrete_fallback(self):
+        self.fell_back = True
+
+def execute_concrete_only(program_list, num_regs, reg_size, inputs = []):
+    # execute_concrete, but a program it hands over to create_program comes back with no values (so it can't match)
+    reporter = Fallback_Reporter()
+    result = execute_concrete(program_list, num_regs, reg_size, inputs, reporter = reporter)
+    if reporter.fell_back:
+        return Verification_Result(status = "handed over to create_program")
+    return result
+
+# Kernel results worked out by hand, r0 starts as 0x1122334455667788 and r1 as 0
+kernel_alu_results = {"DIV64XY 0 1": 0, "DIV32XY 0 1": 0, "MOD64XY 0 1": 0x1122334455667788, "MOD32XY 0 1": 0x55667788,
+                      "DIV64XC 0 16": 0x0112233445566778, "MOD32XC 0 -1": 0x55667788, "SUB32XC 0 0x55667789": 0xffffffff,
+                      "MUL64XC 0 16": 0x1223344556677880, "NEG64XC 0 0": 0xeeddccbbaa998878, "NEG32XC 0 0": 0xaa998878,
+                      "AND64XC 0 -256": 0x1122334455667700, "OR32XC 0 0xff": 0x556677ff, "XOR64XC 0 -1": 0xeeddccbbaa998877,
+                      "END32XC 0 16": 0x7788, "END32XY 0 16": 0x8877, "END32XC 0 64": 0x1122334455667788,
+                      "END32XY 0 32": 0x88776655, "END64XC 0 64": 0x8877665544332211}
+
+# Same idea, r0 starts as 0x1122334480000010 (the low 32 bits are negative, so 32 bit shifts have to look at bit 31)
+kernel_subregister_results = {"ARSH32XC 0 4": 0xf8000001, "RSH32XC 0 4": 0x08000001, "LSH32XC 0 4": 0x00000100,
+                              "ARSH64XC 0 4": 0x0112233448000001, "MOV32XY 0 0": 0x80000010, "ADD32XC 0 -16": 0x80000000,
+                              "DIV32XC 0 16": 0x08000001, "MUL32XC 0 2": 0x20, "NEG32XC 0 0": 0x7ffffff0}
+
+# Register shifts only use the low 6 (5 for 32 bit) bits of the source register: (r0, r1, instruction, kernel result)
+    # (LDDW takes r0 as a signed value)
+kernel_register_shift_results = [
+    (1, 3, "LSH64XY 0 1", 8), (1, 67, "LSH64XY 0 1", 8), (0x8000000000000010, 4, "RSH64XY 0 1", 0x0800000000000001),
+    (0x8000000000000010, 68, "ARSH64XY 0 1", 0xf800000000000001), (0x8000000000000010, 64, "RSH64XY 0 1", 0x8000000000000010),
+    (1, 0x100000003, "LSH32XY 0 1", 8), (0x1122334480000010, 33, "LSH32XY 0 1", 0x20),
+    (0x1122334480000010, 36, "RSH32XY 0 1", 0x08000001), (0x1122334480000010, 4, "ARSH32XY 0 1", 0xf8000001),
+    ]
+
+alu_test_values = [0, 1, 7, 0x7fffffff, 0x80000000, 0xffffffff, 0x100000003, 2 ** 63, 2 ** 64 - 1, 0x1122334455667788]
+
+def differential_alu_operations():
+    print("\nEvery ALU opcode, execute_concrete vs create_program")
+    passed, attempted = 0, 0
+    hand_worked_programs = [(["LDDW 0 1234605616436508552", "MOV64XC 1 0", instruction, "EXIT"], expected_value)
+                            for instruction, expected_value in kernel_alu_results.items()]
+    hand_worked_programs += [(["LDDW 0 1234605617151213584", "MOV64XC 1 0", instruction, "EXIT"], expected_value)
+                             for instruction, expected_value in kernel_subregister_results.items()]
+    hand_worked_programs += [([f'LDDW 0 {signed_int(start_value, 64)}', f'LDDW 1 {shift_value}', instruction, "EXIT"], expected_value)
+                             for start_value, shift_value, instruction, expected_value in kernel_register_shift_results]
+    for program_list, expected_value in hand_worked_programs:
+        instruction = program_list[2]
+        for evaluator in [execute_concrete_only, create_program]:
+            result = evaluator(program_list, 2, 64)
+            attempted += 1
+            if result.final_values is None or result.final_values[0] != expected_value:
+                print(f'*** {instruction} ({evaluator.__name__}) gave {result}, the kernel gives {expected_value:#x} ***')
+                continue
+            passed += 1
+    for keyword in alu_op_keywords:
+        for bit_size in ["32", "64"]:
+            for source_kind in ["XC", "XY"]:
+                for first_value, second_value in zip(alu_test_values, alu_test_values[3:] + alu_test_values[:3]):
+                    if keyword == "END":
+                        second_value = [16, 32, 64][first_value % 3]
+                    elif keyword in shift_keywords:
+                        second_value %= int(bit_size)
+                    # END always takes the width as an immediate, XC/XY is the byte order
+                    if source_kind == "XC" or keyword == "END":
+                        operation = f'{keyword}{bit_size}{source_kind} 0 {signed_32(second_value)}'
+                    else:
+                        operation = f'{keyword}{bit_size}XY 0 1'
+                    program_list = [f'LDDW 0 {signed_int(first_value, 64)}', f'LDDW 1 {signed_int(second_value, 64)}', operation, "EXIT"]
+                    passed += compare_evaluators(operation, execute_concrete_only, create_program, program_list, 2, 64)
+                    attempted += 1
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+# (jump, r0, r1, taken) worked out by hand, JMP32 only looks at the low 32 bits
+kernel_jump_results = [("JSET", 6, 2, True), ("JSET", 4, 2, False), ("JLT", 1, 2, True), ("JLT", 2, 2, False), ("JLE", 2, 2, True),
+                       ("JGE", 2, 2, True), ("JGE", 1, 2, False), ("JSLT", -1, 0, True), ("JSLE", -1, -1, True), ("JSGE", -1, 0, False),
+                       ("JEQ32", 2 ** 32 + 5, 5, True), ("JEQ", 2 ** 32 + 5, 5, False), ("JSLT32", 0x80000000, 0, True),
+                       ("JSLT", 0x80000000, 0, False), ("JGT32", 2 ** 32, 1, False), ("JSET32", 2 ** 32, 2 ** 32, False)]
+
+# (program, r0) for jumps with an offset of 0, which land on the next instruction whether they're taken or not
+offset_zero_results = [(["MOV64XC 0 1", "JA 0 0 0", "MOV64XC 0 2", "EXIT"], 2),
+                       (["MOV64XC 0 1", "JEQXC 0 1 0", "MOV64XC 0 2", "EXIT"], 2),
+                       (["MOV64XC 0 1", "JEQXC 0 3 0", "ADD64XC 0 2", "EXIT"], 3),
+                       (["MOV64XC 0 1", "JA 0 0 1", "JA 0 0 0", "JEQ32XC 0 1 0", "ADD64XC 0 2", "EXIT"], 3)]
+
+def differential_jump_conditions():
+    print("\nEvery jump condition, execute_concrete vs create_program vs create_merged_program")
+    passed, attempted = 0, 0
+    for jump, first_value, second_value, taken in kernel_jump_results:
+        # r2 is only set if the jump falls through
+        program_list = [f'LDDW 0 {first_value}', f'LDDW 1 {second_value}', f'{jump}XY 0 1 1', "MOV64XC 2 1", "EXIT"]
+        for evaluator in [execute_concrete_only, create_program, create_merged_program]:
+            result = evaluator(program_list, 3, 64)
+            attempted += 1
+            if result.final_values is None or (result.final_values[2] is None) != taken:
+                print(f'*** {program_list[2]} ({evaluator.__name__}) gave {result}, the kernel {"jumps" if taken else "falls through"} ***')
+                continue
+            passed += 1
+    for program_list, expected in offset_zero_results:
+        for evaluator in [execute_concrete_only, create_program, create_program_without_abstract_interpretation, 
+                          create_merged_program, bounded_model_check_only]:
+            result = evaluator(program_list, 3, 64)
+            attempted += 1
+            if (result.final_values or [None])[0] != expected:
+                print(f'*** {program_list} ({evaluator.__name__}) gave {result}, expected r0 = {expected} ***')
+                continue
+            passed += 1
+    for keyword in jump_condition_keywords:
+        for bit_size in (["", "32"] if keyword != "JA" else [""]):
+            for source_kind in ["XC", "XY"]:
+                for first_value, second_value in zip(alu_test_values, alu_test_values[3:] + alu_test_values[:3]):
+                    source = signed_32(second_value) if source_kind == "XC" else 1
+                    jump = f'{keyword}{bit_size}{source_kind} 0 {source} 1' if keyword != "JA" else "JA 0 0 1"
+                    program_list = [f'LDDW 0 {signed_int(first_value, 64)}', f'LDDW 1 {signed_int(second_value, 64)}', jump, "MOV64XC 2 1", "EXIT"]
+                    passed += compare_evaluators(jump, execute_concrete_only, create_program, program_list, 3, 64)
+                    passed += compare_evaluators(jump, create_merged_program, create_program, program_list, 3, 64)
+                    attempted += 2
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+# (program, r0 or the problem it has to break on) worked out by hand, r10 is the frame pointer and r1 the context
+kernel_memory_results = [
+    (["MOV64XC 2 0x12345678", "STXDW 10 2 -8", "LDXW 0 10 -8", "EXIT"], 0x12345678),
+    (["MOV64XC 2 0x12345678", "STXDW 10 2 -8", "LDXH 0 10 -7", "EXIT"], 0x3456),
+    (["MOV64XC 2 0x12345678", "STXW 10 2 -8", "STB 10 -1 -6", "LDXW 0 10 -8", "EXIT"], 0x12ff5678),
+    (["STDW 10 -2 -16", "LDXDW 0 10 -16", "EXIT"], 0xfffffffffffffffe),
+    (["STW 10 -2 -16", "STW 10 0 -12", "LDXDW 0 10 -16", "EXIT"], 0xfffffffe),
+    (["LDDW 2 1234605616436508552", "STXDW 10 2 -512", "LDXB 0 10 -505", "EXIT"], 0x11),
+    (["MOV64XY 2 10", "ADD64XC 2 -24", "MOV64XC 3 77", "STXDW 2 3 0", "LDXDW 0 10 -24", "EXIT"], 77),
+    (["MOV64XC 2 8", "STXDW 10 2 -8", "LDXDW 3 10 -8", "MOV64XY 4 10", "SUB64XY 4 3", "STH 4 7 0", "LDXH 0 10 -8", "EXIT"], 7),
+    (["LDXW 0 10 -8", "EXIT"], "Reading stack memory that was never written"),
+    (["STW 10 1 -8", "LDXDW 0 10 -8", "EXIT"], "Reading stack memory that was never written"),
+    (["STXDW 10 1 0", "EXIT"], "Memory access outside of the stack and the context"),
+    (["LDXB 0 10 -513", "EXIT"], "Memory access outside of the stack and the context"),
+    (["LDXW 0 1 256", "EXIT"], "Memory access outside of the stack and the context"),
+    (["LDXW 0 1 0", "STXW 10 0 -4", "LDXW 2 10 -4", "JEQ64XY 0 2 1", "MOV64XC 0 -1", "RSH64XC 0 32", "EXIT"], 0),
+    (["LDXB 2 1 0", "AND64XC 2 7", "MOV64XY 3 10", "ADD64XC 3 -8", "ADD64XY 3 2", "STXB 3 2 0", "LDXB 0 3 0", 
+      "SUB64XY 0 2", "EXIT"], 0),
+    (["LDXB 2 1 0", "AND64XC 2 7", "MOV64XY 3 10", "ADD64XY 3 2", "STXB 3 2 0", "EXIT"], 
+     "Memory access might be outside of the stack and the context"),
+    (["LDXW 0 10 -8", "EXIT"], "Memory instructions need 64 bit registers"),
+    (["STW 10 7 -8", "LDXW 0 10 -8", "EXIT", "MOV64XC 0 1", "EXIT"], 7),
+    # r3 <= 1 (or r3 <= r5) on the fall through, so the second jump is always taken
+    (["MOV64XC 0 0", "LDXW 3 1 8", "JGTXC 3 1 4", "JLEXC 3 255 3", "MOV64XC 0 1", "MOV64XY 4 3", "EXIT", "MOV64XC 0 2", "EXIT"], 2),
+    (["MOV64XC 0 0", "LDXW 3 1 8", "LDXW 5 1 12", "JGTXY 3 5 4", "JLEXY 3 5 3", "MOV64XC 0 1", "MOV64XY 4 3", "EXIT",
+      "MOV64XC 0 2", "EXIT"], 2),
+    ]
+
+memory_sizes = ["B", "H", "W", "DW"]
+
+def random_memory_program(program_size, seed):
+    # Fills the top 64 bytes of the stack first, so every load after that reads something written
+    generator = random.Random(seed)
+    program_list = [f'LDDW {register} {generator.randrange(-2 ** 63, 2 ** 63)}' for register in range(10)]
+    program_list += [f'STXDW 10 {generator.randrange(10)} {offset}' for offset in range(-64, 0, 8)]
+    for _ in range(program_size):
+        size = generator.choice(memory_sizes)
+        offset = generator.randrange(-64, 1 - memory_access_sizes[size])
+        choice = generator.randrange(4)
+        if choice == 0:
+            program_list.append(f'LDX{size} {generator.randrange(10)} 10 {offset}')
+        elif choice == 1:
+            program_list.append(f'STX{size} 10 {generator.randrange(10)} {offset}')
+        elif choice == 2:
+            program_list.append(f'ST{size} 10 {generator.randrange(-2 ** 31, 2 ** 31)} {offset}')
+        else:
+            # Moving a pointer off r10 and back by constants still gives a known address
+            program_list += ["MOV64XY 9 10", f'ADD64XC 9 {offset}', f'LDX{size} {generator.randrange(9)} 9 0']
+    program_list.append("EXIT")
+    return program_list
+
+def create_program_temp_solvers(program_list, num_regs, reg_size, inputs = []):
+    return create_program(program_list, num_regs, reg_size, inputs, incremental_solver = False)
+
+def differential_memory(random_programs = 100, program_size = 40):
+    print("\nStack and context memory, execute_concrete vs create_program")
+    passed, attempted = 0, 0
+    for program_list, expected in kernel_memory_results:
+        reg_size = 32 if expected == "Memory instructions need 64 bit registers" else 64
+        for evaluator in [create_program, create_program_temp_solvers, create_program_without_abstract_interpretation,
+                          create_program_array_backend]:
+            result = evaluator(program_list, 11, reg_size)
+            attempted += 1
+            found = result.error_message if isinstance(expected, str) else (result.final_values or [None])[0]
+            if found != expected:
+                print(f'*** {program_list} ({evaluator.__name__}) gave {result}, expected {expected} ***')
+                continue
+            passed += 1
+        # Programs loading from the context (r1) need z3 for the bytes, the rest have to stay concrete
+        if isinstance(expected, int) and not any(instruction.startswith("LDX") and instruction.split(" ")[2] == "1"
+                                                 for instruction in program_list):
+            passed += compare_evaluators(str(program_list), execute_concrete_only, create_program, program_list, 11, 64)
+            attempted += 1
+    for seed in range(random_programs):
+        program_list = random_memory_program(program_size, seed)
+        passed += compare_evaluators(f'Random Memory Program {seed}', execute_concrete_only, create_program, program_list, 11, 64)
+        attempted += 1
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+def create_program_array_backend(program_list, num_regs, reg_size, inputs = []):
+    return create_program(program_list, num_regs, reg_size, inputs, cfg_backend = "array")
+
+def create_merged_program_array_backend(program_list, num_regs, reg_size, inputs = []):
+    return create_merged_program(program_list, num_regs, reg_size, inputs, cfg_backend = "array")
+
+def bounded_model_check_array_backend(program_list, num_regs, reg_size, inputs = []):
+    return bounded_model_check(program_list, num_regs, reg_size, inputs, cfg_backend = "array")
+
+def differential_cfg_backends(random_programs = 100, program_size = 40, num_regs = 4):
+    print("\ncfg_backend array vs networkx")
+    passed, attempted = 0, 0
+    for test_number, smartnic_test in smartnic_tests.items():
+        program_list = translate_smartnic_to_python_stars_comments(smartnic_test)
+        passed += compare_evaluators(f'SmartNic Test {test_number}', create_program_array_backend, create_program, program_list, 2, 64)
+        attempted += 1
+    for seed in range(random_programs):
+        program_list = random_keyword_program(program_size, num_regs, seed)
+        passed += compare_evaluators(f'Random Program {seed}', create_program_array_backend, create_program, program_list, num_regs, 64)
+        attempted += 1
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+def differential_batch_vs_serial(random_programs = 200, program_size = 40, num_regs = 4, workers = 2):
+    print(f'\nverify_many ({workers} workers) vs create_program')
+    program_lists = [random_keyword_program(program_size, num_regs, seed) for seed in range(random_programs)]
+    batch_results = verify_many(program_lists, workers, num_regs, 64)
+    passed = 0
+    for seed, (program_list, batch_result) in enumerate(zip(program_lists, batch_results)):
+        serial_result = create_program(program_list, num_regs, 64)
+        if batch_result.program_number != seed or \
+                (batch_result.final_values, batch_result.path) != (serial_result.final_values, serial_result.path):
+            print(f'*** Random Program {seed} MISMATCH ***')
+            print(f'\tverify_many: {batch_result}')
+            print(f'\tcreate_program: {serial_result}')
+        else:
+            passed += 1
+    print(f'Passed: {passed}\nAttempted: {len(program_lists)}')
+
+# Programs that break in different ways (uninitialized registers, bad keywords, immediates too big for the register)
+problem_programs = [["ADD64XC 0 1", "EXIT"],
+                    ["MOV64XC 0 1", "FOO64XC 0 1", "EXIT"],
+                    ["MOV64XC 0 1", "JEQXY 0 1 1", "MOV64XC 1 2", "EXIT"],
+                    ["MOV64XC 0 5", "JEQXC 0 5 1", "MOV64XC 1 2", "ADD64XY 0 1", "EXIT"],
+                    ["MOV64XC 0 5", "JEQXC 0 4 1", "MOV64XC 1 2", "ADD64XY 0 1", "EXIT"],
+                    ["MOV64XC 0 0x7fffffff", "ADD64XC 0 4294967296", "EXIT"]]
+
+def differential_merged_vs_single_path(random_programs = 200, program_size = 40, num_regs = 4):
+    print("\ncreate_merged_program vs create_program")
+    passed, attempted = 0, 0
+    for test_number, smartnic_test in smartnic_tests.items():
+        program_list = translate_smartnic_to_python_stars_comments(smartnic_test)
+        passed += compare_evaluators(f'SmartNic Test {test_number}', create_merged_program, create_program, program_list, 2, 64)
+        attempted += 1
+    for problem_number, program_list in enumerate(problem_programs):
+        passed += compare_evaluators(f'Problem Program {problem_number}', create_merged_program, create_program, program_list, 2, 64)
+        attempted += 1
+    for seed in range(random_programs):
+        program_list = random_keyword_program(program_size, num_regs, seed)
+        passed += compare_evaluators(f'Random Program {seed}', create_merged_program, create_program, program_list, num_regs, 64)
+        attempted += 1
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+def random_cfg_edges(number_of_nodes, seed, back_edge_chance = 0):
+    """
+    Instruction style CFG: every node falls through to the next one, about 1 in 4 also jumps 
+        forward up to 50 nodes, and back_edge_chance of them jump backward instead.
+    About 1 in 500 nodes end in an EXIT (no fall through), so some nodes can't be reached.
+
+    Returns
+    -------
+    edge_starts, edge_ends : TYPE : arrays of ints
+    """
+    rng = random.Random(seed)
+    edge_starts, edge_ends = array('l'), array('l')
+    for node in range(number_of_nodes - 1):
+        if rng.random() >= 0.002:
+            edge_starts.append(node)
+            edge_ends.append(node + 1)
+        if rng.random() < 0.25:
+            if rng.random() < back_edge_chance:
+                target = rng.randint(max(0, node - 50), node)
+            else:
+                target = rng.randint(node + 1, min(number_of_nodes - 1, node + 50))
+            edge_starts.append(node)
+            edge_ends.append(target)
+    return edge_starts, edge_ends
+
+def differential_dominators(cfg_sizes = [1000, 100000], back_edge_chances = [0, 0.2], seed = 0):
+    print("\nDominators.py vs networkx dominators")
+    passed, attempted = 0, 0
+    for number_of_nodes in cfg_sizes:
+        for back_edge_chance in back_edge_chances:
+            edge_starts, edge_ends = random_cfg_edges(number_of_nodes, seed, back_edge_chance)
+            nx_graph = instruction_graph_from_edges(number_of_nodes, edge_starts, edge_ends, "networkx")
+            nx_graph.add_node(0)
+            
+            start_time = time.time()
+            nx_frontiers = nx.dominance_frontiers(nx_graph, 0)
+            nx_idom = nx.immediate_dominators(nx_graph, 0)
+            nx_time = time.time() - start_time
+            # Newer networkx leaves the start node out of immediate_dominators
+            nx_idom[0] = 0
+            
+            for cfg_backend in ["networkx", "array"]:
+                graph = instruction_graph_from_edges(number_of_nodes, edge_starts, edge_ends, cfg_backend)
+                if cfg_backend == "networkx":
+                    graph.add_node(0)
+                start_time = time.time()
+                frontiers = dominance_frontiers(graph, 0)
+                idom = immediate_dominators(graph, 0)
+                chk_time = time.time() - start_time
+                
+                attempted += 1
+                if frontiers == nx_frontiers and idom == nx_idom:
+                    passed += 1
+                else:
+                    print(f'*** {number_of_nodes} node CFG ({cfg_backend}, back edges {back_edge_chance}) MISMATCH ***')
+                print(f'	{number_of_nodes} nodes, back edges {back_edge_chance}, {cfg_backend}: '
+                      'Dominators.py %0.3f seconds, networkx %0.3f seconds' %(chk_time, nx_time))
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+# (program, r0 or the problem it has to break on) worked out by hand
+kernel_loop_results = [
+    (["MOV64XC 0 0", "MOV64XC 1 5", "ADD64XY 0 1", "SUB64XC 1 1", "JNEXC 1 0 -3", "EXIT"], 15),
+    (["MOV64XC 0 0", "MOV64XC 1 3", "ADD64XC 0 2", "SUB64XC 1 1", "JNEXC 1 0 -3"], 6),
+    (["MOV64XC 0 0", "MOV64XC 1 3", "MOV64XC 2 4", "ADD64XC 0 1", "SUB64XC 2 1", "JNEXC 2 0 -3", "SUB64XC 1 1",
+      "JNEXC 1 0 -6", "EXIT"], 12),
+    (["MOV64XC 0 1", "MOV64XC 1 10", "LSH64XC 0 1", "SUB64XC 1 1", "JSGTXC 1 0 -3", "EXIT"], 1024),
+    (["MOV64XC 0 0", "MOV64XC 1 64", "ADD64XC 0 3", "SUB64XC 1 1", "JNE32XC 1 0 -3", "EXIT"], 192),
+    (["MOV64XC 0 0", "MOV64XC 1 4", "ADD64XC 0 1", "JEQXC 1 2 0", "SUB64XC 1 1", "JNEXC 1 0 -4", "EXIT"], 4),
+    (["MOV64XC 0 0", "ADD64XC 0 1", "JA 0 0 -2", "EXIT"], "Loop ran more than 64 times"),
+    (["MOV64XC 0 0", "MOV64XC 1 65", "ADD64XC 0 3", "SUB64XC 1 1", "JNEXC 1 0 -3", "EXIT"], "Loop ran more than 64 times"),
+    ]
+
+def differential_loops(cfg_sizes = [1000, 100000], random_programs = 100, body_size = 20, num_regs = 4):
+    print("\nLoops, Loops.py vs networkx, execute_concrete vs create_program")
+    passed, attempted = 0, 0
+    for number_of_nodes in cfg_sizes:
+        edge_starts, edge_ends = random_cfg_edges(number_of_nodes, 0, 0.2)
+        nx_graph = instruction_graph_from_edges(number_of_nodes, edge_starts, edge_ends, "networkx")
+        reachable = nx.descendants(nx_graph, 0) | {0}
+        nx_components = {frozenset(component) for component in nx.strongly_connected_components(nx_graph.subgraph(reachable))
+                         if len(component) > 1 or nx_graph.has_edge(*(2 * list(component)))}
+        for cfg_backend in ["networkx", "array"]:
+            graph = instruction_graph_from_edges(number_of_nodes, edge_starts, edge_ends, cfg_backend)
+            outer_loops = {frozenset(loop.body) for loop in find_loops(graph, 0) if loop.parent is None}
+            attempted += 1
+            if outer_loops == nx_components:
+                passed += 1
+            else:
+                print(f'*** {number_of_nodes} node CFG ({cfg_backend}) loops MISMATCH ***')
+    for program_list, expected in kernel_loop_results:
+        for evaluator in [create_program, create_program_temp_solvers]:
+            result = evaluator(program_list, 3, 64)
+            attempted += 1
+            found = result.error_message if isinstance(expected, str) else (result.final_values or [None])[0]
+            if found != expected:
+                print(f'*** {program_list} ({evaluator.__name__}) gave {result}, expected {expected} ***')
+                continue
+            passed += 1
+        if isinstance(expected, int):
+            passed += compare_evaluators(str(program_list), execute_concrete_only, create_program, program_list, 3, 64)
+            attempted += 1
+    for seed in range(random_programs):
+        program_list = random_loop_program(body_size, num_regs, seed)
+        passed += compare_evaluators(f'Random Loop Program {seed}', execute_concrete_only, create_program, program_list, num_regs, 64)
+        passed += compare_evaluators(f'Random Loop Program {seed}', create_program_from_bytecode, create_program_temp_solvers, 
+                                     program_list, num_regs, 64)
+        attempted += 2
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+def bounded_model_check_only(program_list, num_regs, reg_size, inputs = []):
+    return bounded_model_check(program_list, num_regs, reg_size, inputs)
+
+# (program, symbolic registers, exit property, status it has to come out with) worked out by hand
+symbolic_loop_results = [
+    (["MOV64XC 0 0", "AND64XC 1 7", "JEQXC 1 0 3", "ADD64XC 0 3", "SUB64XC 1 1", "JNEXC 1 0 -3", "EXIT"], (1,),
+     lambda registers: ULE(registers[0], 21), "holds"),
+    (["MOV64XC 0 0", "AND64XC 1 7", "JEQXC 1 0 3", "ADD64XC 0 3", "SUB64XC 1 1", "JNEXC 1 0 -3", "EXIT"], (1,),
+     lambda registers: ULE(registers[0], 20), "violated"),
+    (["MOV64XC 0 0", "JEQXY 1 2 1", "MOV64XC 3 1", "ADD64XY 0 3", "EXIT"], (1, 2), None, "violated"),
+    ]
+
+def differential_bounded_model_checking(random_programs = 100, program_size = 40, body_size = 20, num_regs = 4):
+    print("\nBounded model checking vs create_program")
+    passed, attempted = 0, 0
+    for seed in range(random_programs):
+        passed += compare_evaluators(f'Random Program {seed}', create_program, bounded_model_check_only, 
+                                     random_keyword_program(program_size, num_regs, seed), num_regs, 64)
+        passed += compare_evaluators(f'Random Loop Program {seed}', create_program, bounded_model_check_only, 
+                                     random_loop_program(body_size, num_regs, seed), num_regs, 64)
+        attempted += 2
+    for program_list, expected in kernel_loop_results:
+        if isinstance(expected, str):
+            continue
+        for exit_property, expected_status in [(lambda registers: registers[0] == expected, "holds"),
+                                               (lambda registers: registers[0] == expected + 1, "violated")]:
+            result = bounded_model_check(program_list, 3, 64, exit_property = exit_property)
+            attempted += 1
+            if result.status == expected_status and result.final_values[0] == expected:
+                passed += 1
+            else:
+                print(f'*** {program_list} gave {result}, expected {expected_status} with r0 = {expected} ***')
+    for program_list, expected_status, expected_value in [(kernel_loop_results[-1][0], "holds", 195),
+                                                          (kernel_loop_results[-2][0], "unknown", None)]:
+        result = bounded_model_check(program_list, 3, 64)
+        attempted += 1
+        if result.status == expected_status and (result.final_values or [None])[0] == expected_value:
+            passed += 1
+        else:
+            print(f'*** {program_list} gave {result}, expected {expected_status} with r0 = {expected_value} ***')
+    for program_list, symbolic_registers, exit_property, expected_status in symbolic_loop_results:
+        result = bounded_model_check(program_list, num_regs, 8, exit_property = exit_property, symbolic_registers = symbolic_registers)
+        attempted += 1
+        if result.status == expected_status:
+            passed += 1
+        else:
+            print(f'*** {program_list} gave {result}, expected {expected_status} ***')
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+# (program, symbolic registers, exit property, smallest k proving it) worked out by hand, all far too many trips for max_depth
+k_induction_results = [
+    (["MOV64XC 0 0", "MOV64XC 1 0", "ADD64XC 1 1", "JNEXC 1 200 -2", "MOV64XY 0 1", "EXIT"], (),
+     lambda registers: registers[0] == 200, 2),
+    (["MOV64XC 1 0", "MOV64XC 3 0", "ADD64XC 1 8", "ADD64XC 3 1", "JLTXC 1 4000 -3", "MOV64XY 0 1", "EXIT"], (),
+     lambda registers: UGE(registers[0], 4000), 2),
+    (["MOV64XC 0 0", "ADD64XY 0 1", "SUB64XC 1 1", "JNEXC 1 0 -3", "EXIT"], (1,), None, 1),
+    (["MOV64XC 0 0", "ADD64XC 0 1", "JA 0 0 -2", "EXIT"], (), None, 1),
+    ]
+
+def differential_k_induction(random_programs = 10, body_size = 20, num_regs = 4, max_depth = 100, step_timeout = 100):
+    print("\nk-induction vs create_program")
+    passed, attempted = 0, 0
+    for seed in range(random_programs):
+        program_list = random_loop_program(body_size, num_regs, seed)
+        expected = create_program(program_list, num_regs, 64)
+        if expected.status != "sat":
+            checks = [(None, "violated")]
+        else:
+            checks = [(lambda registers: registers[0] == expected.final_values[0], "holds"),
+                      (lambda registers: registers[0] == expected.final_values[0] + 1, "violated")]
+        for exit_property, expected_status in checks:
+            result = k_induction(program_list, num_regs, 64, exit_property = exit_property, step_timeout = step_timeout)
+            attempted += 1
+            if result.status == expected_status and (result.error_location == expected.error_location) and \
+                    (expected_status == "holds" or (result.final_values, result.path) == (expected.final_values, expected.path)):
+                passed += 1
+            else:
+                print(f'*** Random Loop Program {seed} gave {result}, expected {expected_status} from {expected} ***')
+    for program_list, symbolic_registers, exit_property, expected_k in k_induction_results:
+        bounded_result = bounded_model_check(program_list, num_regs, 64, exit_property = exit_property,
+                                             symbolic_registers = symbolic_registers, max_depth = max_depth)
+        result = k_induction(program_list, num_regs, 64, exit_property = exit_property,
+                             symbolic_registers = symbolic_registers, max_k = max_depth)
+        attempted += 1
+        if (bounded_result.status, result.status, result.proof, result.depth) == ("unknown", "holds", "k-induction", expected_k):
+            passed += 1
+        else:
+            print(f'*** {program_list} gave {result} at k = {result.depth} ({bounded_result.status} bounded), expected k = {expected_k} ***')
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+def create_program_without_abstract_interpretation(program_list, num_regs, reg_size, inputs = []):
+    return create_program(program_list, num_regs, reg_size, inputs, abstract_interpretation = False)
+
+context_constants = [0, 1, 7, 8, 255, 256, 65535, 0x7fffffff, -1, -256, -0x80000000]
+
+def random_context_program(program_size, seed):
+    # r2-r5 come from the context, so nothing is known about them past what the loads, masks and jumps say.
+    # r0 only ever gets set to the instruction number, so it tells which way the jumps went.
+    generator = random.Random(seed)
+    program_list = ["MOV64XC 0 0"]
+    for register in range(2, 6):
+        size = generator.choice(memory_sizes)
+        program_list.append(f'LDX{size} {register} 1 {generator.randrange(0, CONTEXT_SIZE, memory_access_sizes[size])}')
+    register = 2
+    for instruction_number in range(program_size):
+        instructions_left = program_size - instruction_number - 1
+        # Mostly keep working on the same register, the way a bounds check masks a value and then compares it
+        if generator.randrange(3) == 0:
+            register = generator.randrange(2, 6)
+        bit_size = generator.choice(["", "32"])
+        constant = generator.choice(context_constants + [generator.randrange(-2 ** 31, 2 ** 31), generator.randrange(512)])
+        choice = generator.randrange(12)
+        if choice < 6:
+            source = f'XY {register} {generator.randrange(2, 6)}' if choice == 0 else f'XC {register} {constant}'
+            # Half of them bail out to the EXIT, so the narrowing lasts until something reads it
+            offset = instructions_left if generator.randrange(2) == 0 else generator.randint(0, instructions_left)
+            program_list.append(f'{generator.choice(jump_keywords[:-1])}{bit_size}{source} {offset}')
+        elif choice == 6:
+            program_list.append(f'MOV64XC 0 {len(program_list)}')
+        elif choice in (7, 8):
+            # (masks clearing the low bits leave tnums that small bounds can miss completely)
+            mask = generator.randrange(-2 ** 31, 2 ** 31) & -2 ** generator.randrange(33)
+            program_list.append(f'AND{bit_size or "64"}XC {register} {mask}')
+        elif choice == 9:
+            program_list.append(f'{generator.choice(["ADD", "SUB", "OR", "XOR", "MOV"])}{bit_size or "64"}XC {register} {constant}')
+        elif choice == 10:
+            program_list.append(f'{generator.choice(shift_keywords)}{bit_size or "64"}XC {register} {generator.randrange(32)}')
+        else:
+            program_list.append(f'{generator.choice(["ADD", "SUB", "MOV"])}{bit_size or "64"}XY {register} {generator.randrange(2, 6)}')
+    return program_list + ["EXIT"]
+
+def compare_context_programs(name, program_list):
+    # The context bytes are free, so the models (and r2-r5) can differ.  The path, the problem and r0 can't.
+    without_pass = create_program_without_abstract_interpretation(program_list, 6, 64)
+    with_pass = create_program(program_list, 6, 64)
+    found = [(result.path, result.error_location, (result.final_values or [None])[0]) for result in [without_pass, with_pass]]
+    if found[0] != found[1]:
+        print(f'*** {name} MISMATCH ***')
+        print(f'\twithout the pass: {without_pass}, path {without_pass.path}')
+        print(f'\twith the pass: {with_pass}, path {with_pass.path}')
+        print(f'\tProgram: {program_list}')
+        return False
+    return True
+
+# (program, r0, jumps decided without z3, jumps left for the solver) worked out by hand, r1 is the context
+abstract_interpretation_results = [
+    (["LDXB 2 1 0", "JGTXC 2 255 2", "MOV64XC 0 1", "EXIT", "MOV64XC 0 2", "EXIT"], 1, 1, 0),
+    (["MOV64XC 0 0", "LDXB 2 1 0", "AND64XC 2 7", "JLTXC 2 8 1", "MOV64XC 0 1", "EXIT"], 0, 1, 0),
+    (["MOV64XC 0 0", "LDXDW 2 1 0", "JSGEXY 2 2 1", "MOV64XC 0 1", "EXIT"], 0, 1, 0),
+    (["MOV64XC 0 0", "LDXW 2 1 0", "END32XY 2 16", "JGTXC 2 0xffff 1", "MOV64XC 0 1", "EXIT"], 1, 1, 0),
+    (["MOV64XC 0 0", "MOV64XC 1 5", "ADD64XY 0 1", "SUB64XC 1 1", "JNEXC 1 0 -3", "JEQXC 1 0 1", "MOV64XC 0 1", "EXIT"], 15, 1, 5),
+    (["MOV64XC 0 0", "LDXB 2 1 0", "JEQXC 2 7 1", "MOV64XC 0 1", "EXIT"], None, 0, 1),
+    # A multiple of 256 that isn't below 7 can't be at most 254, so nothing gets to the JMP32 on the fall through
+    (["MOV64XC 0 0", "LDXW 2 1 0", "AND32XC 2 -256", "JLTXC 2 7 3", "JGTXC 2 254 2", "JSLE32XC 2 0 1", "MOV64XC 0 1", "EXIT"], 0, 0, 2),
+    (["MOV64XC 2 0", "LDXW 0 1 0", "AND32XC 0 -1490047232", "JLTXC 0 7 3", "JSGEXC 0 255 2", "JSLE32XY 2 0 1", "MOV64XC 2 1", 
+      "EXIT"], None, 0, 2),
+    # Register shifts by what the register holds (67 is a shift of 3), or anything at all if that isn't known
+    (["MOV64XC 0 1", "MOV64XC 2 67", "LSH64XY 0 2", "JEQXC 0 8 1", "MOV64XC 0 0", "EXIT"], 8, 1, 0),
+    (["MOV64XC 0 1", "LDXB 2 1 0", "LSH64XY 0 2", "JEQXC 0 2 1", "MOV64XC 0 0", "EXIT"], None, 0, 1),
+    ]
+
+def differential_abstract_interpretation(random_programs = 100, program_size = 40, body_size = 20, context_programs = 150):
+    print("\nDeciding jumps without z3, create_program with and without the tnum/bounds pass")
+    passed, attempted = 0, 0
+    for seed in range(random_programs):
+        for name, program_list, num_regs in [('Random Program', random_keyword_program(program_size, 4, seed), 4),
+                                             ('Random Loop Program', random_loop_program(body_size, 4, seed), 4),
+                                             ('Random Memory Program', random_memory_program(program_size, seed), 11)]:
+            passed += compare_evaluators(f'{name} {seed}', create_program_without_abstract_interpretation, create_program,
+                                         program_list, num_regs, 64)
+            attempted += 1
+    for seed in range(context_programs):
+        passed += compare_context_programs(f'Random Context Program {seed}', random_context_program(program_size, seed))
+        attempted += 1
+    for program_list, expected, decided, checked in abstract_interpretation_results:
+        result = create_program(program_list, 11, 64)
+        attempted += 1
+        found = (result.jumps_decided_statically, result.jumps_checked_by_solver)
+        if found == (decided, checked) and (expected is None or result.final_values[0] == expected):
+            passed += 1
+        else:
+            print(f'*** {program_list} gave {result} with {found} jumps decided/checked, expected r0 = {expected} with {(decided, checked)} ***')
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+# tnum.py operation -> (tnum, tnum) -> tnum (or a bool), with the shift/size arguments the kernel gets
+tnum_operations = {
+    "add":       lambda first, second: first.add(second),
+    "sub":       lambda first, second: first.sub(second),
+    "mult":      lambda first, second: first.mult(second),
+    "and":       lambda first, second: first.tnum_and(second),
+    "or":        lambda first, second: first.tnum_or(second),
+    "xor":       lambda first, second: first.tnum_xor(second),
+    "lshift":    lambda first, second: first.lshift(9),
+    "rshift":    lambda first, second: first.rshift(9),
+    "arshift":   lambda first, second: first.arshift(13),
+    "arshift32": lambda first, second: first.arshift(7, 32),
+    "cast":      lambda first, second: first.cast(2),
+    "subreg":    lambda first, second: first.with_subreg(second),
+    "intersect": lambda first, second: first.intersect(second),
+    "union":     lambda first, second: first.union(second),
+    "range":     lambda first, second: tnum_range(first.min, first.min | first.range),
+    "in":        lambda first, second: first.tnum_in(second.tnum_and(first)),
+    }
+
+# (tnum.py call, result) worked out by hand from kernel/bpf/tnum.c, tnums as (value, mask)
+kernel_tnum_results = [
+    (lambda: tnum_range(4, 7), (4, 3)),
+    (lambda: tnum_range(0, 255), (0, 255)),
+    (lambda: tnum_range(0, 2**64 - 1), (0, 2**64 - 1)),
+    (lambda: tnum_const(3).mult(tnum(0, 3)), (0, 15)),
+    (lambda: tnum_const(2**63).arshift(63), (2**64 - 1, 0)),
+    (lambda: tnum_const(0x80000000).arshift(31, 32), (0xffffffff, 0)),
+    (lambda: tnum(0x123456789abcde00, 0xff).cast(2), (0xde00, 0xff)),
+    (lambda: tnum_const(0xffffffff00000000).const_subreg(7), (0xffffffff00000007, 0)),
+    (lambda: tnum_const(0x1ff).lshift(56), (0xff00000000000000, 0)),
+    (lambda: tnum(0b1000, 0b0011).tnum_in(tnum_const(0b1010)), True),
+    (lambda: tnum(0b1000, 0b0011).tnum_in(tnum_const(0b0100)), False),
+    (lambda: tnum(0b1000, 0b0100).is_aligned(4), True),
+    (lambda: tnum(0b0100, 0b0001).is_aligned(2), False),
+    ]
+
+def tnum_result(result):
+    # (value, mask) for either backend, or the bool for tnum_in
+    if isinstance(result, tnum):
+        return (simplify(result.min).as_long(), simplify(result.range).as_long()) if result.is_symbolic() else (result.min, result.range)
+    return is_true(simplify(result)) if isinstance(result, BoolRef) else result
+
+def differential_tnum_backends(random_tnums = 200):
+    print("\ntnum.py on Python ints vs z3 terms")
+    passed, attempted = 0, 0
+    generator = random.Random(0)
+    for number in range(random_tnums):
+        first_mask, second_mask = [generator.getrandbits(64) & generator.getrandbits(64) for _ in range(2)]
+        first = tnum(generator.getrandbits(64) & ~first_mask, first_mask)
+        second = tnum(generator.getrandbits(64) & ~second_mask, second_mask)
+        for name, operation in tnum_operations.items():
+            int_result = tnum_result(operation(first, second))
+            z3_result = tnum_result(operation(tnum(BitVecVal(first.min, 64), BitVecVal(first.range, 64)),
+                                              tnum(BitVecVal(second.min, 64), BitVecVal(second.range, 64))))
+            attempted += 1
+            if int_result == z3_result:
+                passed += 1
+            else:
+                print(f'*** {name} on {first} and {second}: ints gave {int_result}, z3 gave {z3_result} ***')
+    for call, expected in kernel_tnum_results:
+        attempted += 1
+        found = tnum_result(call())
+        if found == expected:
+            passed += 1
+        else:
+            print(f'*** tnum result {found}, expected {expected} ***')
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+def create_program_from_bytecode(program_list, num_regs, reg_size, inputs = []):
+    return create_program(load_bpf_bytecode(encode_bpf_instructions(program_list)), num_regs, reg_size, inputs)
+
+def create_program_from_elf(program_list, num_regs, reg_size, inputs = []):
+    elf_bytes = bpf_elf_object({".text": b"", "xdp": encode_bpf_instructions(program_list), "license": b"GPL\x00"})
+    return create_program(load_bpf_elf(elf_bytes)["xdp"], num_regs, reg_size, inputs)
+
+def bpf_elf_object(sections):
+    """
+    Just enough of a little endian ELF64 BPF relocatable (what clang -target bpf -c makes) to hold some sections
+
+    Parameters
+    ----------
+    sections : TYPE : Dictionary (section name -> bytes)
+        Names starting with "." or holding bytecode are made executable, except "license"
+    """
+    names = b"\x00.shstrtab\x00"
+    section_data = b""
+    headers = [struct.pack("<IIQQQQIIQQ", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)]
+    data_start = 64
+    for name, data in sections.items():
+        flags = 0x2 if name == "license" else 0x6
+        headers.append(struct.pack("<IIQQQQIIQQ", len(names), 1, flags, 0, data_start + len(section_data), len(data), 0, 0, 8, 0))
+        names += name.encode() + b"\x00"
+        section_data += data
+    headers.append(struct.pack("<IIQQQQIIQQ", 1, 3, 0, 0, data_start + len(section_data), len(names), 0, 0, 1, 0))
+    section_header_offset = data_start + len(section_data) + len(names)
+    elf_header = b"\x7fELF" + bytes([2, 1, 1]) + bytes(9) + \
+        struct.pack("<HHIQQQIHHHHHH", 1, 247, 1, 0, 0, section_header_offset, 0, 64, 0, 0, 64, len(headers), len(headers) - 1)
+    return elf_header + section_data + names + b"".join(headers)
+
+# LDDW constants a MOV64XC can't hold, and jumps over them (the offsets have to be remapped to count instructions)
+lddw_programs = [["LDDW 0 -81985529216486896", "LDDW 1 1311768467463790320", "ADD64XY 0 1", "EXIT"],
+                 ["MOV64XC 0 0", "JEQXC 0 0 1", "LDDW 1 -81985529216486896", "LDDW 2 4294967296", "JNEXC 0 0 1", "LDDW 0 7", "EXIT"],
+                 ["LDDW 0 9223372036854775807", "JGTXC 0 0 2", "LDDW 0 1", "EXIT", "LDDW 1 -1", "ADD64XY 0 1", "EXIT"]]
+
+def differential_bytecode_loader(random_programs = 100, program_size = 40, num_regs = 4):
+    print("\neBPF bytecode vs keyword strings")
+    passed, attempted = 0, 0
+    for test_number, smartnic_test in smartnic_tests.items():
+        program_list = translate_smartnic_to_python_stars_comments(smartnic_test)
+        passed += compare_evaluators(f'SmartNic Test {test_number}', create_program_from_bytecode, create_program, program_list, 2, 64)
+        attempted += 1
+    for lddw_number, program_list in enumerate(lddw_programs):
+        passed += compare_evaluators(f'LDDW Program {lddw_number}', create_program_from_bytecode, create_program, program_list, 3, 64)
+        passed += compare_evaluators(f'LDDW Program {lddw_number} (ELF)', create_program_from_elf, create_program, program_list, 3, 64)
+        passed += compare_evaluators(f'LDDW Program {lddw_number} (concrete)', execute_concrete, create_program_from_bytecode, program_list, 3, 64)
+        attempted += 3
+    for seed in range(random_programs):
+        program_list = random_keyword_program(program_size, num_regs, seed)
+        passed += compare_evaluators(f'Random Program {seed}', create_program_from_bytecode, create_program, program_list, num_regs, 64)
+        attempted += 1
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+def smartnic_test_file(tests):
+    """
+    All of the SmartNic test strings as one C file, like inst_test.cc: one inst(...) per line, each followed by a // comment
+        (holding the instruction again, and a /*), and a /* */ comment running over several lines before each program
+    """
+    c_file = ""
+    for test_number, smartnic_test in tests.items():
+        c_file += f'/* Test {test_number}\n * from superopt, with a * and a // inside the comment\n */\n'
+        c_file += f'inst instructions{test_number}[] = ' + \
+            re.sub(r'(inst\([^)]*\),?)', r'\n    \1  // was \1 /* with comments', re.sub(r'/\*(.*?)\*/', r'// \1\n', smartnic_test)).replace("};", "\n};") + "\n"
+        c_file += 'cout << "not an inst(MOV64XC, 0, 1), /* or a comment" << endl;\n'
+    return c_file
+
+def differential_smartnic_parser():
+    print("\nMulti-line SmartNic file vs one line test strings")
+    passed, attempted = 0, 0
+    streamed_programs = iter_smartnic_programs(io.StringIO(smartnic_test_file(smartnic_tests)))
+    for (test_number, smartnic_test), program_list in itertools.zip_longest(smartnic_tests.items(), streamed_programs, fillvalue = (None, None)):
+        attempted += 1
+        if test_number is None or program_list is None:
+            print("*** Different number of programs in the file ***")
+            continue
+        # Same instructions, field for field, and the same results
+        one_line_program = translate_smartnic_to_python_stars_comments(smartnic_test)
+        if program_list != [split_keyword_instruction(instruction) for instruction in one_line_program]:
+            print(f'*** SmartNic Test {test_number} MISMATCH ***')
+            print(f'\tStreamed: {[str(instruction) for instruction in program_list]}')
+            print(f'\tOne line: {one_line_program}')
+            continue
+        passed += compare_evaluators(f'SmartNic Test {test_number}', create_program, create_program_from_keywords, program_list, 2, 64)
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+def create_program_from_keywords(program_list, num_regs, reg_size, inputs = []):
+    return create_program([str(instruction) for instruction in program_list], num_regs, reg_size, inputs)
+
+def create_program_from_c(program_list, num_regs, reg_size, inputs = []):
+    c_program = extract_programs_from_source("struct bpf_insn prog[] = {\n" + translate_to_bpf_in_c(program_list) + "};\n")[0]
+    return create_program(c_program.instructions, num_regs, reg_size, inputs)
+
+def c_macro_test_file(program_lists):
+    """
+    All of the programs as one C file: even numbered programs as struct bpf_insn arrays, odd ones as
+        kernel selftest entries, and the first two instructions of each one behind a function like #define
+    """
+    c_file = "#include <linux/bpf.h>\n#define TWO_INSNS(first, second) first, /* comment */ \\\n    second\n"
+    c_file += "static struct bpf_test tests[] = {\n"
+    for program_number, program_list in enumerate(program_lists):
+        macros = translate_to_bpf_in_c(program_list).splitlines()
+        if len(macros) > 1:
+            c_file += f'#define PROGRAM_{program_number}_START TWO_INSNS({macros[0][:-1]}, {macros[1][:-1]})\n'
+            macros[:2] = [f'PROGRAM_{program_number}_START,']
+        body = "".join(f'\t{macro} // line {line}\n' for line, macro in enumerate(macros))
+        if program_number % 2:
+            c_file += f'{{\n\t"program {program_number}",\n\t.insns = {{\n{body}\t}},\n\t.result = ACCEPT,\n}},\n'
+        else:
+            c_file += f'}};\nstruct bpf_insn prog{program_number}[] = {{\n{body}}};\nstatic struct bpf_test tests{program_number}[] = {{\n'
+    return c_file + "};\n"
+
+# Hand worked operands (C's / and % truncate toward zero), and programs that should come out with a problem (None)
+    # instead of stopping the scan of the rest of the file
+c_expression_results = [
+    ("BPF_MOV64_IMM(BPF_REG_0, -7/2), BPF_EXIT_INSN()", ["MOV64XC 0 -3", "EXIT"]),
+    ("BPF_MOV64_IMM(BPF_REG_0, -7%2), BPF_EXIT_INSN()", ["MOV64XC 0 -1", "EXIT"]),
+    ("BPF_MOV64_IMM(BPF_REG_0, 7/-2), BPF_EXIT_INSN()", ["MOV64XC 0 -3", "EXIT"]),
+    ("BPF_MOV64_IMM(BPF_REG_0, 7%-2), BPF_EXIT_INSN()", ["MOV64XC 0 1", "EXIT"]),
+    ("BPF_MOV64_IMM(BPF_REG_0, -(7/2)*2 + -7%-2), BPF_EXIT_INSN()", ["MOV64XC 0 -7", "EXIT"]),
+    ("BPF_MOV64_IMM(BPF_REG_0), BPF_EXIT_INSN()", None),
+    ("BPF_MOV64_IMM(BPF_REG_0, 1, 2), BPF_EXIT_INSN()", None),
+    ("BPF_MOV64_IMM(BPF_REG_0, 1/0), BPF_EXIT_INSN()", None),
+    ("BPF_MOV64_IMM(BPF_REG_0, 1%(2-2)), BPF_EXIT_INSN()", None),
+    ("BPF_MOV64_IMM(BPF_REG_0, 3), BPF_EXIT_INSN()", ["MOV64XC 0 3", "EXIT"]),
+    ]
+
+def differential_c_macro_extractor(random_programs = 100, program_size = 40, num_regs = 4):
+    print("\nC instruction macros vs keyword strings")
+    passed, attempted = 0, 0
+    program_lists = [translate_smartnic_to_python_stars_comments(smartnic_test) for smartnic_test in smartnic_tests.values()]
+    program_lists += lddw_programs + [random_keyword_program(program_size, num_regs, seed) for seed in range(random_programs)]
+    extracted_programs = extract_programs_from_source(c_macro_test_file(program_lists), "c_macro_test_file.c")
+    for program_number, (program_list, extracted) in enumerate(itertools.zip_longest(program_lists, extracted_programs)):
+        attempted += 1
+        if program_list is None or extracted is None:
+            print("*** Different number of programs in the file ***")
+            continue
+        if extracted.instructions != [split_keyword_instruction(instruction) for instruction in program_list]:
+            print(f'*** Program {program_number} MISMATCH ***\n\t{extracted}')
+            continue
+        passed += compare_evaluators(f'Program {program_number}', create_program_from_c, create_program, program_list, num_regs, 64)
+
+    c_file = "".join(f'struct bpf_insn c{number}[] = {{ {body} }};\n' for number, (body, program_list) in enumerate(c_expression_results))
+    extracted_programs = extract_programs_from_source(c_file, "c_expression_test_file.c")
+    for (body, program_list), extracted in itertools.zip_longest(c_expression_results, extracted_programs, fillvalue = (None, None)):
+        attempted += 1
+        if extracted == (None, None):
+            print(f'*** {body} never came out of the file ***')
+        elif program_list is None and extracted.problem:
+            passed += 1
+        elif program_list is not None and extracted.instructions == [split_keyword_instruction(instruction) for instruction in program_list]:
+            passed += 1
+        else:
+            print(f'*** {body} MISMATCH ***\n\t{extracted}')
+    print(f'Passed: {passed}\nAttempted: {attempted}')
+
+# Worker processes rerun this file on Windows, so the drivers have to stay under the main check
+if __name__ == "__main__":
+    differential_concrete_vs_z3()
+    differential_alu_operations()
+    differential_jump_conditions()
+    differential_memory()
+    differential_cfg_backends()
+    differential_batch_vs_serial()
+    differential_merged_vs_single_path()
+    differential_dominators()
+    differential_loops()
+    differential_bounded_model_checking()
+    differential_k_induction()
+    differential_abstract_interpretation()
+    differential_tnum_backends()
+    differential_bytecode_loader()
+    differential_smartnic_parser()
+    differential_c_macro_extractor()
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:43:17 2026
+
+@author: joshc
+
+Dominators, immediate dominators and dominance frontiers for any CFG, shared by
+    Basic_Block_CFG_Creator.py (phi function placement and SSA renaming) and
+    SSA_from_BPF.py (the original instruction level phi function tests in Non Meeting Stuff).
+
+    SSA_from_BPF.establish_dominators used to list every path from node 0 to every node and intersect them,
+        which blows up past about 64 instructions.  This uses the iterative algorithm from
+        Cooper, Harvey and Kennedy, "A Simple, Fast Dominance Algorithm" (2001) instead:
+
+        1) Number every node reachable from start in reverse postorder (start is 0, and every node
+            comes before the nodes it reaches, except along back edges)
+        2) idom[start] = start, then keep sweeping the nodes in reverse postorder, setting idom[node] to the
+            intersection (nearest common dominator) of every processed predecessor, until nothing changes.
+            Forward only CFGs (all eBPF jumps so far) settle on the first sweep, loops take a couple more.
+        3) Dominance frontiers: for every join node (2+ preds), walk up the dominator tree from
+            each pred until hitting idom[join], adding the join to the frontier of every node passed.
+
+    Everything inside works on the reverse postorder numbers (plain lists of ints), and only maps back to
+        the graph's own nodes at the end.  Nodes that can't be reached from start are left out of every result.
+
+    The graph only needs successors(node) and predecessors(node), so nx.DiGraph, Array_Block_Graph,
+        Array_Instruction_Graph and SSA_from_BPF's Graph all work without converting to networkx.
+"""
+
+def reverse_postorder(graph, start):
+    """
+    Iterative depth first search (deep CFGs would hit the recursion limit)
+
+    Returns
+    -------
+    order : TYPE : List of nodes
+        Every node reachable from start, in reverse postorder (start first)
+    """
+    order = []
+    visited = {start}
+    stack = [(start, iter(graph.successors(start)))]
+    while stack:
+        node, successors = stack[-1]
+        for next_node in successors:
+            if next_node not in visited:
+                visited.add(next_node)
+                stack.append((next_node, iter(graph.successors(next_node))))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+    order.reverse()
+    return order
+
+def immediate_dominator_numbers(graph, order):
+    """
+    Parameters
+    ----------
+    graph : TYPE : Any graph with successors/predecessors
+
+    order : TYPE : List of nodes
+        reverse_postorder of the graph
+
+    Returns
+    -------
+    rpo_number : TYPE : Dictionary (node -> Int)
+        Place of each node in order
+
+    predecessor_numbers : TYPE : List of Lists of Ints
+        Reachable predecessors of each node, by number
+
+    idom : TYPE : List of Ints
+        Number of the immediate dominator of each node (idom[0] == 0)
+    """
+    rpo_number = {node: number for number, node in enumerate(order)}
+    predecessor_numbers = [[rpo_number[pred] for pred in graph.predecessors(node) if pred in rpo_number]
+                           for node in order]
+
+    undefined = -1
+    idom = [undefined] * len(order)
+    idom[0] = 0
+    changed = True
+    while changed:
+        changed = False
+        for number in range(1, len(order)):
+            new_idom = undefined
+            for pred in predecessor_numbers[number]:
+                if idom[pred] == undefined:
+                    continue
+                if new_idom == undefined:
+                    new_idom = pred
+                    continue
+
+                # intersect: walk both fingers up the dominator tree until they meet
+                finger1, finger2 = pred, new_idom
+                while finger1 != finger2:
+                    while finger1 > finger2:
+                        finger1 = idom[finger1]
+                    while finger2 > finger1:
+                        finger2 = idom[finger2]
+                new_idom = finger1
+            if idom[number] != new_idom:
+                idom[number] = new_idom
+                changed = True
+    return rpo_number, predecessor_numbers, idom
+
+def immediate_dominators(graph, start):
+    """
+    Returns
+    -------
+    TYPE : Dictionary (node -> node)
+        Immediate dominator of every node reachable from start (start maps to itself)
+    """
+    order = reverse_postorder(graph, start)
+    rpo_number, predecessor_numbers, idom = immediate_dominator_numbers(graph, order)
+    return {node: order[idom[number]] for number, node in enumerate(order)}
+
+def dominators(graph, start):
+    """
+    Returns
+    -------
+    TYPE : Dictionary (node -> Set of nodes)
+        Every dominator of each node reachable from start, including the node itself
+    """
+    order = reverse_postorder(graph, start)
+    rpo_number, predecessor_numbers, idom = immediate_dominator_numbers(graph, order)
+
+    # A node's dominators are its idom's dominators plus itself, and idoms always come first in order
+    dominator_sets = [{start}]
+    for number in range(1, len(order)):
+        dominator_sets.append(dominator_sets[idom[number]] | {order[number]})
+    return {node: dominator_sets[number] for number, node in enumerate(order)}
+
+def dominance_frontiers(graph, start):
+    """
+    Returns
+    -------
+    TYPE : Dictionary (node -> Set of nodes)
+        Dominance frontier of every node reachable from start, same as nx.dominance_frontiers
+    """
+    order = reverse_postorder(graph, start)
+    rpo_number, predecessor_numbers, idom = immediate_dominator_numbers(graph, order)
+
+    frontiers = [set() for _ in order]
+    for number, preds in enumerate(predecessor_numbers):
+        if len(preds) < 2:
+            continue
+        for runner in preds:
+            # Once a runner hits a node that already has this join, an earlier pred already walked the rest of the way up
+            while runner != idom[number] and number not in frontiers[runner]:
+                frontiers[runner].add(number)
+                runner = idom[runner]
+    return {node: {order[frontier_number] for frontier_number in frontiers[number]}
+            for number, node in enumerate(order)}
+
+def dominator_tree_children(idom_dict, start):
+    """
+    Parameters
+    ----------
+    idom_dict : TYPE : Dictionary (node -> node)
+        From immediate_dominators
+
+    Returns
+    -------
+    children : TYPE : Dictionary (node -> List of nodes)
+        The nodes each node immediately dominates
+    """
+    children = {node: [] for node in idom_dict}
+    for node, dominator in idom_dict.items():
+        if node != start:
+            children[dominator].append(node)
+    return children
@@ -17,12 +17,54 @@ How to get around full sat checking the constantly elongating formula
 
     Maintain two formulas in the program holder object, one that is a constantly increasing full map of the path through the program
     the other is a block formula, which should be as short as possible, allowing sat checks to happen stupid quickly    
+
+Incremental solving (the default now):
+    Rebuilding a temp solver for every jump and every block transition was most of the runtime on large programs.
+    Program_Holder now keeps one Solver for the whole path.  Each block's constraints get added to it once,
+    and jump conditions are only switched on for their own check (as an assumption literal), so nothing is 
+    re-added or re-solved along the way.  A push/pop scope per jump was tried first, but every pop made z3 redo
+    work over the whole path, and it fell behind the temp solvers past ~5000 instructions.
+    Passing incremental_solver = False to create_program goes back to the temp solver version above.
+    Once a jump is decided, the condition for the way it went (branch_condition) is added to the path for good,
+    so later jumps only look at values that could really get there (a register loaded from the context that
+    fell through r3 > 1 can't then be more than 255).
+    
+Results and printing:
+    create_program returns a Verification_Result (final registers, path, error location, timings) and prints
+    nothing on its own.  Pass reporter = Console_Reporter() for the old running commentary (see Verification_Reporting.py).
+
+Loops:
+    Backward jumps make loops in the CFG (Loops.py finds them, and their back edges).  create_program keeps
+    walking the path through them, up to loop_bound runs of each loop body every time the loop is entered,
+    and breaks the program if a loop would run more than that.
+    Every visit to a block after the first needs new SSA names for the registers it sets.  The constraints from
+    the first visit are kept (Program_Holder.block_terms) and renamed with z3 substitute onto the new names,
+    instead of running every instruction again.  Blocks touching memory do run again, since the memory along
+    the path changes each time.
+
+Memory (LDX/STX/ST):
+    Programs with memory instructions get r10 = frame pointer and r1 = context pointer at the start 
+    (as "entry" versions of those registers), and a Stack_And_Context_Memory carried along the path.
+    Known constant addresses are byte blasted, anything else goes to a z3 Array (see Memory_Model.py).
+    Memory needs 64 bit registers, and room for r10 (num_regs = 11).
+
+Deciding jumps without z3:
+    Before walking the path, Program_Holder runs decide_jumps (Abstract_Interpretation.py) over the block CFG,
+    tracking tnums and signed/unsigned bounds for every register.  Jumps it finds always (or never) go one way
+    skip check_jump entirely, and only the rest are checked against the solver.  jumps_decided_statically and
+    jumps_checked_by_solver count how many of each the path ran into.  abstract_interpretation = False turns it off.
 """
 from Basic_Block_CFG_Creator import *
-import time, copy, re
+from Verification_Reporting import *
+from SmartNic_Parser import *
+from Memory_Model import *
+from Loops import *
+from Abstract_Interpretation import *
+import time
 
 class Program_Holder:
-    def __init__(self, instruction_list, reg_size, num_regs):
+    def __init__(self, instruction_list, reg_size, num_regs, incremental_solver = True, cfg_backend = "networkx",
+                 use_cfg_cache = False, reporter = None, loop_bound = 64, abstract_interpretation = True):
         """
         Parameters
         instruction_list : TYPE :List of strings
@@ -33,16 +75,81 @@ class Program_Holder:
         
         num_regs : TYPE : Int
             How many different registers the program will attempt to model
+            
+        incremental_solver : TYPE : Boolean, optional
+            Keep one z3 Solver for the whole control flow path, and only check the jump conditions
+            against it as assumptions.  False goes back to making a fresh Solver for every jump and block transition.
+            
+        cfg_backend : TYPE : String, optional
+            "networkx" or "array" (see Basic_Block_CFG_Creator), both work the same here
+            
+        use_cfg_cache : TYPE : Boolean, optional
+            Reuse the CFG layout saved on disk from an earlier run of the same program (see CFG_Cache.py)
+            
+        reporter : TYPE : Silent_Reporter object, optional
+            Gets told about every block, instruction and problem along the path.  None is a Silent_Reporter
+            
+        loop_bound : TYPE : Int, optional
+            Most times a loop body can run each time the loop is entered, before the program counts as broken
+            
+        abstract_interpretation : TYPE : Boolean, optional
+            Decide what jumps can be decided from tnums and bounds before walking the path (see the top of the file)
 
         Returns
         -------
         None.
         """
-        self.block_graph, self.register_bitVec_dictionary, self.start_block = \
-            basic_block_CFG_and_phi_function_setup(instruction_list, reg_size, num_regs)   
+        self.block_graph, self.register_bitVec_table, self.start_block = \
+            basic_block_CFG_and_phi_function_setup(instruction_list, reg_size, num_regs, cfg_backend, use_cfg_cache)   
         self.formula = True
         self.end_block = 0
         self.program_error = False
+        self.reporter = reporter if reporter is not None else Silent_Reporter()
+        
+        # Leaders of the blocks visited, and where/why the program broke (if it did)
+        self.path = []
+        self.error_location = None
+        self.problem_log = []
+        
+        # Every block along the path is asserted into this solver once, so it always holds the full path formula
+        self.solver = Solver() if incremental_solver else None
+        
+        # Only programs that touch memory get the entry pointers and a memory model
+        self.memory = None
+        if uses_memory(self.block_graph):
+            self.memory = Stack_And_Context_Memory()
+            self.set_entry_pointers(num_regs, reg_size)
+            
+        # Loops (only a backward jump can make one), see the top of the file
+        self.loop_bound = loop_bound
+        self.loops = find_loops(self.block_graph, self.start_block) if has_backward_jumps(self.block_graph) else []
+        self.back_edges = back_edge_set(self.loops)
+        self.loop_blocks = {block for loop in self.loops for block in loop.body}
+        self.loop_headers = {loop.header for loop in self.loops}
+        # Times each block has been visited, runs of each loop body since the loop was entered,
+            # and the constraints from the first visit to each loop block (SSA ids before the block, constraints)
+        self.visits = {}
+        self.loop_iterations = {}
+        self.block_terms = {}
+        
+        # Jumps that always go one way: block -> what check_jump would say (see the top of the file)
+        self.jump_decisions = {}
+        if abstract_interpretation:
+            self.jump_decisions = decide_jumps(self.block_graph, self.start_block, num_regs, reg_size,
+                                               entry_pointer_values(num_regs) if self.memory is not None else {})
+        self.jumps_decided_statically = 0
+        self.jumps_checked_by_solver = 0
+            
+    def set_entry_pointers(self, num_regs, reg_size):
+        # r10 and r1 start out holding the frame and context pointers (see Memory_Model.py)
+        entry_names = self.start_block.register_names_before_block_executes
+        for register_number, value in entry_pointer_values(num_regs).items():
+            ssa_id = self.register_bitVec_table.new_version(register_number, "entry")
+            entry_names = rename_register(entry_names, register_number, ssa_id)
+            self.memory.known_values[ssa_id] = value
+            self.start_block.in_block_formula = And(self.start_block.in_block_formula,
+                                                    self.register_bitVec_table[ssa_id] == BitVecVal(value, reg_size))
+        self.start_block.register_names_before_block_executes = entry_names
         
     def add_instructions_from_block(self, block, formula):
         """
@@ -66,67 +173,183 @@ class Program_Holder:
         a = Int('a')
         poison_the_formula = And(a == 2, a == 1)
         
-        print(f'\nAdding instructions in block: {block.name}')
-        reg_names = copy.deepcopy(block.register_names_before_block_executes)
-        reg_bv_dic = self.register_bitVec_dictionary
+        self.reporter.block_start(block)
+        self.path.append(block.initial_instruction)
+        reg_names = block.register_names_before_block_executes
+        reg_bv_table = self.register_bitVec_table
         in_block_formula = block.in_block_formula
         decide_what_branch = True
         bad_formula, bad_jump_check = False, False
+        block_constraints_asserted = False
+        
+        # Going around a loop again (see the top of the file)
+        visit = self.visits.get(block, 0)
+        self.visits[block] = visit + 1
+        reuse_block_term = visit > 0 and block in self.block_terms
+        first_ssa_ids = None
+        if reuse_block_term:
+            block_term, reg_names = self.renamed_block_term(block, reg_names, visit)
+            formula = And(formula, block_term)
+            in_block_formula = And(in_block_formula, block_term)
+        elif visit > 0:
+            first_ssa_ids = self.rename_block_targets(block, visit)
+        record_block_term = visit == 0 and block in self.loop_blocks
+        names_before_block, block_constraints = reg_names, []
+        
         for instruction in block.block_instructions:
-            print(f'\tChecking Instruction: {instruction.instruction_number}: {instruction.full_instruction}')
-            if "EXIT" in instruction.keyword:
+            self.reporter.instruction(instruction)
+            if instruction.instruction_class == Instruction_Class.EXIT:
                 formula = And(formula,  BitVec('exit',1) == 0)
-            elif "J" not in instruction.keyword:
+            elif reuse_block_term and instruction.instruction_class != Instruction_Class.JUMP:
+                continue
+            elif instruction.instruction_class == Instruction_Class.ALU:
+                if self.memory is not None:
+                    track_known_value(instruction, reg_names, self.memory.known_values, reg_bv_table.reg_bit_size)
                 formula, in_block_formula, reg_names =\
-                    execute_instruction(formula, in_block_formula, instruction, reg_names, reg_bv_dic, poison_the_formula)
+                    execute_instruction(formula, in_block_formula, instruction, reg_names, reg_bv_table, poison_the_formula, self.problem_log)
+                if record_block_term and in_block_formula is not False:
+                    # execute_instruction adds its constraint as the last argument of the And
+                    block_constraints.append(in_block_formula.arg(1))
+            elif instruction.instruction_class != Instruction_Class.JUMP:
+                # The memory changes every time around, so blocks touching it are never reused
+                record_block_term = False
+                formula, in_block_formula, reg_names =\
+                    execute_memory_instruction(formula, in_block_formula, instruction, reg_names, reg_bv_table, self.memory,
+                                               poison_the_formula, self.problem_log, self.solver)
             else:
-                decide_what_branch, bad_jump_check = check_jump(in_block_formula, instruction, reg_names, reg_bv_dic)
+                if self.solver is not None:
+                    self.solver.add(in_block_formula)
+                    block_constraints_asserted = True
+                if block in self.jump_decisions:
+                    decide_what_branch = self.jump_decisions[block]
+                    self.jumps_decided_statically += 1
+                else:
+                    decide_what_branch, bad_jump_check = \
+                        check_jump(in_block_formula, instruction, reg_names, reg_bv_table, self.solver, self.problem_log)
+                    self.jumps_checked_by_solver += 1
+                if not bad_jump_check:
+                    # The rest of the path only happens if the jump went the way it was decided
+                    condition = branch_condition(instruction, reg_names, reg_bv_table, decide_what_branch)
+                    if condition is not None:
+                        formula = And(formula, condition)
+                        in_block_formula = And(in_block_formula, condition)
+                        if self.solver is not None:
+                            self.solver.add(condition)
 
             if formula == poison_the_formula or bad_jump_check:
-                print(f'-->  Instruction {instruction.instruction_number} caused a problem, and broke the program  <--')
+                self.error_location = instruction.instruction_number
+                self.reporter.instruction_problem(instruction, self.problem_log[-1] if self.problem_log else "")
                 self.formula = formula
                 bad_formula = True
                 break
+        
+        if first_ssa_ids is not None:
+            for instruction, ssa_id in first_ssa_ids:
+                instruction.target_reg_new_name = ssa_id
+        if record_block_term and not bad_formula:
+            self.block_terms[block] = (names_before_block, And(block_constraints) if block_constraints else BoolVal(True))
                 
         if bad_formula:
             self.program_error = True
-            print(f'-->  Stopping program run early in block {block.name}  <--')
+            self.reporter.stopping_early(block)
             return 0,0
         else:
-            block.register_names_after_block_executes = copy.deepcopy(reg_names)
+            block.register_names_after_block_executes = reg_names
             block.in_block_formula = in_block_formula
             end_instruction = block.final_instruction
+            if self.solver is not None and not block_constraints_asserted:
+                self.solver.add(in_block_formula)
             
             # Reached a block with no outgoing links (ie program end point)
-            if len(block.output_links) == 0 or block.block_instructions[-1].keyword == "EXIT":
+            if len(block.output_links) == 0 or block.block_instructions[-1].instruction_class == Instruction_Class.EXIT:
                 self.formula = formula
                 self.end_block = block
                 return block, formula
             
             # Define control flow for what block to evaluate next
             else:
-                successor_blocks = self.block_graph.successors(block)
-                for next_block in successor_blocks:
-                    if next_block.initial_instruction == end_instruction + 1:
-                        true_block = next_block
-                    else:
-                        false_block = next_block
-                if decide_what_branch:
-                    print(f'Control moves to block: {true_block.name}')
-                    true_block.update_start_names(block, reg_bv_dic)
-                    return true_block, formula
-                else:
-                    print(f'Control moves to block: {false_block.name}')
-                    false_block.update_start_names(block, reg_bv_dic)
-                    return false_block, formula 
+                true_block, false_block = branch_successors(self.block_graph, block)
+                next_block = true_block if decide_what_branch else false_block
+                if next_block is None:
+                    # Falling off the end of the program (or jumping past it) counts as an exit
+                    self.formula = formula
+                    self.end_block = block
+                    return block, formula
+                if self.loops and not self.count_loop_iteration(block, next_block):
+                    return 0,0
+                self.reporter.control_moves(next_block)
+                next_block.update_start_names(block, reg_bv_table, self.solver)
+                return next_block, formula
+                
+    def renamed_block_term(self, block, reg_names, visit):
+        """
+        Returns
+        -------
+        block_term : TYPE : z3 Boolean
+            The constraints from the first visit to block, renamed onto the register names going into
+            this visit, and new SSA ids ("r{register_number}_{instruction}_{visit}") for every register the block sets
+            
+        reg_names : TYPE : Tuple of Ints
+            The register names after this visit
+        """
+        names_before_block, block_term = self.block_terms[block]
+        reg_bv_table = self.register_bitVec_table
+        renaming = [(reg_bv_table[first_id], reg_bv_table[ssa_id]) for first_id, ssa_id in zip(names_before_block, reg_names)
+                    if first_id != UNINITIALIZED and first_id != ssa_id]
+        for instruction in block.block_instructions:
+            if instruction.instruction_class in register_setting_classes:
+                ssa_id = reg_bv_table.new_version(instruction.target_reg, f'{instruction.instruction_number}_{visit}')
+                renaming.append((reg_bv_table[instruction.target_reg_new_name], reg_bv_table[ssa_id]))
+                reg_names = rename_register(reg_names, instruction.target_reg, ssa_id)
+        if renaming:
+            block_term = substitute(block_term, *renaming)
+        return block_term, reg_names
+    
+    def rename_block_targets(self, block, visit):
+        # New SSA ids for running a block's instructions again, handing back the first ids to put back afterwards
+        first_ssa_ids = []
+        for instruction in block.block_instructions:
+            if instruction.instruction_class in register_setting_classes:
+                first_ssa_ids.append((instruction, instruction.target_reg_new_name))
+                instruction.target_reg_new_name = \
+                    self.register_bitVec_table.new_version(instruction.target_reg, f'{instruction.instruction_number}_{visit}')
+        return first_ssa_ids
+    
+    def count_loop_iteration(self, block, next_block):
+        """
+        Counts another run of a loop body when next_block is a loop header reached along a back edge
+            (entering the loop from outside starts the count again)
+
+        Returns
+        -------
+        TYPE : Boolean
+            False if the loop went past loop_bound, which breaks the program
+        """
+        if (block, next_block) not in self.back_edges:
+            if next_block in self.loop_headers:
+                self.loop_iterations[next_block] = 1
+            return True
+        # (a loop starting at the first instruction was entered without an edge)
+        self.loop_iterations[next_block] = self.loop_iterations.get(next_block, 1) + 1
+        if self.loop_iterations[next_block] <= self.loop_bound:
+            return True
+        log_problem(self.problem_log, f'Loop ran more than {self.loop_bound} times')
+        self.error_location = block.final_instruction
+        self.reporter.instruction_problem(block.block_instructions[-1], self.problem_log[-1])
+        self.program_error = True
+        self.reporter.stopping_early(block)
+        return False
 
-def check_jump(formula, instruction, reg_names, reg_bv_dic):
+def check_jump(formula, instruction, reg_names, reg_bv_table, solver = None, problem_log = None):
     """
     Currently supports:
         JNE(jump if not equal)
         JEQ (jump if equal)
-        JGT (jump if greater than or equal)
-        JSGT (jump if greater than or equal (signed))
+        JGT/JGE/JLT/JLE (unsigned comparisons)
+        JSGT/JSGE/JSLT/JSLE (signed comparisons)
+        JSET (jump if target & source isn't 0)
+        JA (always jump, nothing is checked)
+        and the JMP32 forms of all of them (JEQ32XC...), which only compare the low 32 bits
     
     Parameters
     ----------
@@ -136,13 +359,20 @@ def check_jump(formula, instruction, reg_names, reg_bv_dic):
     instruction : TYPE : Instruction_Info object
         Contains all the information about a single instruction in the program
     
-    reg_names : TYPE : List of Strings
-        Holds the names of the most recent versions of all registers
+    reg_names : TYPE : Tuple of Ints
+        Holds the SSA ids of the most recent versions of all registers
     
-    reg_bv_dic : TYPE : Dictionary (Strings -> Register_BitVec objects)
-        The reference dictionary for the actual z3 bitVec variables that will be added to the solver.
-        Keys are SSA forms of register names "r{register_number}_{instruction}" where instruction 
-        refers to the specific program instruction where the register was changed to that value
+    reg_bv_table : TYPE : Register_BitVec_Table object
+        The z3 bitVec variables that will be added to the solver, indexed by SSA id
+        
+    solver : TYPE : z3 Solver, optional
+        The persistent path solver from Program_Holder, which already holds formula.
+        The jump condition is guarded by a fresh Bool and only assumed for this one check,
+        so it never constrains the rest of the path.
+        If None, a temporary solver is built from formula instead.
+        
+    problem_log : TYPE : List of Strings, optional
+        Gets a description of anything that makes the jump invalid
 
     Returns
     -------
@@ -154,44 +384,62 @@ def check_jump(formula, instruction, reg_names, reg_bv_dic):
         Error check on the inputs to the jump condition
     """
     formula_is_sat = True
+    if instruction.opcode == Jump_Condition.JA:
+        return False, False
     try:
         if instruction.input_value_is_const:
             source_val = instruction.input_value_bitVec_Constant
         else:
-            source_val = reg_bv_dic[reg_names[instruction.input_value]].name
-        target_reg_val = reg_bv_dic[reg_names[instruction.target_reg]].name
-        
-        if "NE" in instruction.keyword:
-            jump_condition = source_val == target_reg_val
-        elif "EQ" in instruction.keyword:
-            jump_condition = Not(source_val == target_reg_val)
-        elif "SGT" in instruction.keyword:
-            jump_condition = Not(target_reg_val > source_val)
-        elif "GT" in instruction.keyword:
-            jump_condition = Not(UGT(target_reg_val, source_val))
-        else:
+            source_val = reg_bv_table[reg_names[instruction.input_value]]
+        target_reg_val = reg_bv_table[reg_names[instruction.target_reg]]
+        jump_condition = fall_through_condition(instruction, target_reg_val, source_val)
+        if jump_condition is None:
             return False, True
             
-        tempz3 = Solver()
-        tempz3.add(formula)      
-        tempz3.add(jump_condition)
-        if tempz3.check() != sat:
-            formula_is_sat = False 
+        if solver is None:
+            tempz3 = Solver()
+            tempz3.add(formula)      
+            tempz3.add(jump_condition)
+            if tempz3.check() != sat:
+                formula_is_sat = False 
+        else:
+            guard = FreshBool('jump')
+            solver.add(Implies(guard, jump_condition))
+            if solver.check(guard) != sat:
+                formula_is_sat = False
     
         return formula_is_sat, False
     
     except KeyError:
-        print("\n***  Attempting to execute instruction using non-initialized register  ***")
+        log_problem(problem_log, "Attempting to execute instruction using non-initialized register")
         return False, True
     except Z3Exception:
-        print("\n***  Attempting to execute instruction using an input value that doesn't fit in the register  ***")
+        log_problem(problem_log, "Attempting to execute instruction using an input value that doesn't fit in the register")
         return False, True
 
-def execute_instruction(formula, in_block_formula, instruction, reg_names, reg_bv_dic, poison_the_formula):
+def branch_condition(instruction, reg_names, reg_bv_table, falls_through):
+    """
+    Returns
+    -------
+    TYPE : z3 Boolean (None for JA, or an offset of 0, which don't depend on anything)
+        The condition for the jump going the way falls_through says, on the registers it reads
+    """
+    if instruction.opcode == Jump_Condition.JA or instruction.offset == 0:
+        return None
+    if instruction.input_value_is_const:
+        source_val = instruction.input_value_bitVec_Constant
+    else:
+        source_val = reg_bv_table[reg_names[instruction.input_value]]
+    condition = fall_through_condition(instruction, reg_bv_table[reg_names[instruction.target_reg]], source_val)
+    if condition is None:
+        return None
+    return condition if falls_through else Not(condition)
+
+def execute_instruction(formula, in_block_formula, instruction, reg_names, reg_bv_table, poison_the_formula, problem_log = None):
     """
     Current Functions Supported:
-        mov, add, lsh, rsh, arsh 
-        *** ARsh currently doesn't work in the 32 bit form, but does work in 64 bit ***
+        mov, add, sub, mul, div, mod, and, or, xor, neg, lsh, rsh, arsh, end (byte order conversion)
+        in both 64 bit and 32 bit (subregister) forms
     
     Parameters
     ----------
@@ -204,16 +452,17 @@ def execute_instruction(formula, in_block_formula, instruction, reg_names, reg_b
     instruction : TYPE : Instruction_Info object
         Contains all the information about a single instruction in the program
     
-    reg_names : TYPE : List of Strings
-        Holds the names of the most recent versions of all registers
+    reg_names : TYPE : Tuple of Ints
+        Holds the SSA ids of the most recent versions of all registers
     
-    reg_bv_dic : TYPE : Dictionary (Strings -> Register_BitVec objects)
-        The reference dictionary for the actual z3 bitVec variables that will be added to the solver.
-        Keys are SSA forms of register names "r{register_number}_{instruction}" where instruction 
-        refers to the specific program instruction where the register was changed to that value
+    reg_bv_table : TYPE : Register_BitVec_Table object
+        The z3 bitVec variables that will be added to the solver, indexed by SSA id
         
     poison_the_formula : TYPE : z3 Boolean conjunction
         Error catching to force an unsat in the z3Solver
+        
+    problem_log : TYPE : List of Strings, optional
+        Gets a description of anything that makes the instruction poison the formula
 
     Returns
     -------
@@ -223,80 +472,255 @@ def execute_instruction(formula, in_block_formula, instruction, reg_names, reg_b
     in_block_formula : TYPE : z3 Boolean conjunction
         The FOL translation for this specific block, updated for this instruction, and including the values set in the previous block
         
-    reg_names : TYPE : List of Strings
-        Holds the names of the most recent versions of all registers after the execution of this instruction
+    reg_names : TYPE : Tuple of Ints
+        Holds the SSA ids of the most recent versions of all registers after the execution of this instruction
     """
     try:
         if instruction.input_value_is_const:
             source_val = instruction.input_value_bitVec_Constant
         else:
-            source_val = reg_bv_dic[reg_names[instruction.input_value]].name
+            source_val = reg_bv_table[reg_names[instruction.input_value]]
         
         # Key error if register isn't live yet, but that's ok for an inital mov into a reg
         try:    
-            target_reg_old_val = reg_bv_dic[reg_names[instruction.target_reg]].name
-            if instruction.bit_size == 32:
-                target_reg_old_val = BitVecVal(0xffffffff, 64) & target_reg_old_val
+            target_reg_old_val = reg_bv_table[reg_names[instruction.target_reg]]
         except KeyError:
-            if "MOV" in instruction.keyword:
-                pass
+            if instruction.opcode == ALU_Op.MOV:
+                target_reg_old_val = None
             else:
-                print("\n***  Attempting to execute instruction using non-initialized register  ***")
+                log_problem(problem_log, "Attempting to execute instruction using non-initialized register")
                 return poison_the_formula, False, reg_names
         
-        target_reg_new_val = reg_bv_dic[instruction.target_reg_new_name].name
-        if instruction.bit_size == 32:
-            source_val = BitVecVal(0xffffffff, 64) & source_val
-            
-        if "ADD" in instruction.keyword:
-            constraints = target_reg_old_val + source_val
-        elif "MOV" in instruction.keyword:
-            constraints = source_val
-        elif "LSH" in instruction.keyword:
-            constraints = target_reg_old_val << instruction.input_value
-        elif "ARSH" in instruction.keyword:
-            constraints = target_reg_old_val >> instruction.input_value
-        elif "RSH" in instruction.keyword:
-            constraints = LShR(target_reg_old_val, instruction.input_value)
+        target_reg_new_val = reg_bv_table[instruction.target_reg_new_name]
+        constraints = alu_operation(instruction, target_reg_old_val, source_val)
         
         # The keyword isn't recognized, add a poision pill to force an unsat
-        else:
-            print("\n***  Keyword isn't a valid form for this program  ***")
-            return poison_the_formula, reg_names
-        
-        if instruction.bit_size == 32:
-            constraints = BitVecVal(0xffffffff, 64) & constraints
+        if constraints is None:
+            log_problem(problem_log, "Keyword isn't a valid form for this program")
+            return poison_the_formula, False, reg_names
         constraints = target_reg_new_val == constraints
         
-        reg_names[instruction.target_reg] = instruction.target_reg_new_name
+        reg_names = rename_register(reg_names, instruction.target_reg, instruction.target_reg_new_name)
+        formula = And(formula, constraints)
+        in_block_formula = And(in_block_formula, constraints)
+        return formula, in_block_formula, reg_names
+    
+    except KeyError:
+        log_problem(problem_log, "Attempting to execute instruction using non-initialized register")
+        return poison_the_formula, False, reg_names
+    except Z3Exception:
+        log_problem(problem_log, "Attempting to execute instruction using an input value that doesn't fit in the register")
+        return poison_the_formula, False, reg_names
+
+def shift_amount(instruction, source_val, reg_size):
+    # Immediate shifts come straight from input_value, register shifts only use the low bits of the source register
+        # (the kernel's dst <<= src & 63), works on z3 bitVecs and plain ints alike
+    if instruction.source_kind == Source_Kind.REGISTER:
+        return source_val & (reg_size - 1)
+    return instruction.input_value
+
+# z3 term for each ALU opcode: (instruction, target_reg_old_val, source_val) -> new value of the target register
+alu_operations = {
+    ALU_Op.ADD:  lambda instruction, target_reg_old_val, source_val: target_reg_old_val + source_val,
+    ALU_Op.MOV:  lambda instruction, target_reg_old_val, source_val: source_val,
+    ALU_Op.LSH:  lambda instruction, target_reg_old_val, source_val: 
+                    target_reg_old_val << shift_amount(instruction, source_val, target_reg_old_val.size()),
+    ALU_Op.RSH:  lambda instruction, target_reg_old_val, source_val: 
+                    LShR(target_reg_old_val, shift_amount(instruction, source_val, target_reg_old_val.size())),
+    ALU_Op.ARSH: lambda instruction, target_reg_old_val, source_val: 
+                    target_reg_old_val >> shift_amount(instruction, source_val, target_reg_old_val.size()),
+    ALU_Op.SUB:  lambda instruction, target_reg_old_val, source_val: target_reg_old_val - source_val,
+    ALU_Op.MUL:  lambda instruction, target_reg_old_val, source_val: target_reg_old_val * source_val,
+    # The kernel defines division by 0 as 0, and modulo by 0 as leaving the target register alone
+    ALU_Op.DIV:  lambda instruction, target_reg_old_val, source_val: 
+                    If(source_val == 0, BitVecVal(0, target_reg_old_val.size()), UDiv(target_reg_old_val, source_val)),
+    ALU_Op.MOD:  lambda instruction, target_reg_old_val, source_val: 
+                    If(source_val == 0, target_reg_old_val, URem(target_reg_old_val, source_val)),
+    ALU_Op.AND:  lambda instruction, target_reg_old_val, source_val: target_reg_old_val & source_val,
+    ALU_Op.OR:   lambda instruction, target_reg_old_val, source_val: target_reg_old_val | source_val,
+    ALU_Op.XOR:  lambda instruction, target_reg_old_val, source_val: target_reg_old_val ^ source_val,
+    ALU_Op.NEG:  lambda instruction, target_reg_old_val, source_val: -target_reg_old_val,
+    ALU_Op.END_LE: lambda instruction, target_reg_old_val, source_val: 
+                    byte_order_conversion(target_reg_old_val, instruction.input_value, swap_bytes = False),
+    ALU_Op.END_BE: lambda instruction, target_reg_old_val, source_val: 
+                    byte_order_conversion(target_reg_old_val, instruction.input_value, swap_bytes = True),
+}
+
+def byte_order_conversion(target_reg_old_val, width, swap_bytes):
+    """
+    Returns
+    -------
+    TYPE : z3 bitVec (None if width isn't 16, 32 or 64 bits, or is bigger than the register)
+        The low width bits of target_reg_old_val (bytes reversed if swap_bytes), zero extended back to register size
+    """
+    reg_size = target_reg_old_val.size()
+    if width not in (16, 32, 64) or width > reg_size:
+        return None
+    low_bits = Extract(width - 1, 0, target_reg_old_val)
+    if swap_bytes:
+        # Concat puts its first argument on top, so the lowest byte ends up highest
+        low_bits = Concat(*[Extract(bit + 7, bit, low_bits) for bit in range(0, width, 8)])
+    return ZeroExt(reg_size - width, low_bits)
+
+# Condition for falling through to the next instruction for each jump opcode: (target_reg_val, source_val) -> z3 Boolean
+fall_through_conditions = {
+    Jump_Condition.JNE:  lambda target_reg_val, source_val: source_val == target_reg_val,
+    Jump_Condition.JEQ:  lambda target_reg_val, source_val: Not(source_val == target_reg_val),
+    Jump_Condition.JGT:  lambda target_reg_val, source_val: Not(UGT(target_reg_val, source_val)),
+    Jump_Condition.JSGT: lambda target_reg_val, source_val: Not(target_reg_val > source_val),
+    Jump_Condition.JGE:  lambda target_reg_val, source_val: Not(UGE(target_reg_val, source_val)),
+    Jump_Condition.JSGE: lambda target_reg_val, source_val: Not(target_reg_val >= source_val),
+    Jump_Condition.JLT:  lambda target_reg_val, source_val: Not(ULT(target_reg_val, source_val)),
+    Jump_Condition.JLE:  lambda target_reg_val, source_val: Not(ULE(target_reg_val, source_val)),
+    Jump_Condition.JSLT: lambda target_reg_val, source_val: Not(target_reg_val < source_val),
+    Jump_Condition.JSLE: lambda target_reg_val, source_val: Not(target_reg_val <= source_val),
+    Jump_Condition.JSET: lambda target_reg_val, source_val: target_reg_val & source_val == 0,
+    Jump_Condition.JA:   lambda target_reg_val, source_val: BoolVal(False),
+}
+
+# The z3 term for the new value of the target register (None if the keyword isn't supported)
+    # Shared by execute_instruction and the path merging version in Path_Merging_FOL.py
+    # 32 bit operations work on the low 32 bits as a real 32 bit bitVec (so ARSH32 sees bit 31 as the sign),
+    # and the result is zero extended back into the whole register, the same as the kernel's subregisters
+def alu_operation(instruction, target_reg_old_val, source_val):
+    operation = alu_operations.get(instruction.opcode)
+    if operation is None:
+        return None
+    if not is_bv(source_val):
+        # The poison pill from an input value too big for the register
+        raise Z3Exception("Input value doesn't fit in the register")
+    reg_size = source_val.size()
+    if instruction.bit_size != 32 or reg_size <= 32:
+        return operation(instruction, target_reg_old_val, source_val)
+    
+    source_val = Extract(31, 0, source_val)
+    if target_reg_old_val is not None:
+        target_reg_old_val = Extract(31, 0, target_reg_old_val)
+    new_value = operation(instruction, target_reg_old_val, source_val)
+    if new_value is None:
+        return None
+    return ZeroExt(reg_size - 32, new_value)
+
+# The condition for falling through to the next instruction instead of taking the jump (None if the keyword isn't supported)
+    # JMP32 jumps (bit_size 32) only compare the low 32 bits of both sides
+def fall_through_condition(instruction, target_reg_val, source_val):
+    condition = fall_through_conditions.get(instruction.opcode)
+    if condition is None:
+        return None
+    if instruction.bit_size == 32 and instruction.opcode != Jump_Condition.JA and target_reg_val.size() > 32:
+        target_reg_val, source_val = Extract(31, 0, target_reg_val), Extract(31, 0, source_val)
+    return condition(target_reg_val, source_val)
+
+def has_backward_jumps(block_graph):
+    return any(instruction.instruction_class == Instruction_Class.JUMP and instruction.offset < 0
+               for block in block_graph for instruction in block.block_instructions)
+
+def uses_memory(block_graph):
+    return any(instruction.instruction_class in (Instruction_Class.LOAD, Instruction_Class.STORE)
+               for block in block_graph for instruction in block.block_instructions)
+
+def track_known_value(instruction, reg_names, known_values, reg_size):
+    # Runs an ALU instruction on the known values of its registers (see Memory_Model.py), 
+        # so pointers moved by constants (r2 = r10, r2 += -16) still give known addresses
+    registers = [known_values.get(ssa_id) for ssa_id in reg_names]
+    if instruction.input_value_is_const and instruction.input_value_concrete is None:
+        return
+    if execute_concrete_instruction(instruction, registers, reg_size):
+        known_values[instruction.target_reg_new_name] = registers[instruction.target_reg]
+
+def execute_memory_instruction(formula, in_block_formula, instruction, reg_names, reg_bv_table, memory, 
+                               poison_the_formula, problem_log = None, solver = None):
+    """
+    LDX{size} dst src offset    dst = the size bytes at src + offset, zero extended
+    STX{size} dst src offset    the low size bytes of src go to dst + offset
+    ST{size} dst imm offset     the low size bytes of imm (sign extended first) go to dst + offset
+    
+    Parameters are the same as execute_instruction, along with
+    
+    memory : TYPE : Stack_And_Context_Memory object
+        Memory along the path so far, updated in place
+        
+    solver : TYPE : z3 Solver, optional
+        The persistent path solver from Program_Holder, to rule out an access outside of the stack and context
+        when the address isn't known.  If None, a temporary solver is built from in_block_formula instead.
+
+    Returns
+    -------
+    Same as execute_instruction
+    """
+    try:
+        reg_size = reg_bv_table.reg_bit_size
+        if reg_size != MEMORY_ADDRESS_SIZE:
+            log_problem(problem_log, "Memory instructions need 64 bit registers")
+            return poison_the_formula, False, reg_names
+        
+        access_size = instruction.opcode
+        is_load = instruction.instruction_class == Instruction_Class.LOAD
+        base_ssa_id = reg_names[instruction.input_value if is_load else instruction.target_reg]
+        address = memory.address_of(base_ssa_id, instruction.offset)
+        if address is None:
+            address = reg_bv_table[base_ssa_id] + instruction.offset
+        
+        if is_load:
+            value, in_bounds, problem = memory.load(address, access_size)
+        else:
+            if instruction.input_value_is_const:
+                value = instruction.input_value_bitVec_Constant
+                if not is_bv(value):
+                    raise Z3Exception("Input value doesn't fit in the register")
+            elif reg_names[instruction.input_value] in memory.known_values:
+                value = BitVecVal(memory.known_values[reg_names[instruction.input_value]], reg_size)
+            else:
+                value = reg_bv_table[reg_names[instruction.input_value]]
+            in_bounds, problem = memory.store(address, access_size, value)
+        if problem:
+            log_problem(problem_log, problem)
+            return poison_the_formula, False, reg_names
+        if in_bounds is not None and memory_access_may_be_outside(in_block_formula, in_bounds, solver):
+            log_problem(problem_log, "Memory access might be outside of the stack and the context")
+            return poison_the_formula, False, reg_names
+        if not is_load:
+            return formula, in_block_formula, reg_names
+        
+        if is_bv_value(value):
+            memory.known_values[instruction.target_reg_new_name] = value.as_long()
+        constraints = reg_bv_table[instruction.target_reg_new_name] == ZeroExt(reg_size - 8 * access_size, value)
+        reg_names = rename_register(reg_names, instruction.target_reg, instruction.target_reg_new_name)
         formula = And(formula, constraints)
         in_block_formula = And(in_block_formula, constraints)
         return formula, in_block_formula, reg_names
     
     except KeyError:
-        print("\n***  Attempting to execute instruction using non-initialized register  ***")
+        log_problem(problem_log, "Attempting to execute instruction using non-initialized register")
         return poison_the_formula, False, reg_names
     except Z3Exception:
-        print("\n***  Attempting to execute instruction using an input value that doesn't fit in the register  ***")
+        log_problem(problem_log, "Attempting to execute instruction using an input value that doesn't fit in the register")
         return poison_the_formula, False, reg_names
 
-def translate_smartnic_to_python_stars_comments(instruction_input):
-    output = []
-    reg_ex_ins = re.sub("/\*[^\*]+\*/", "", instruction_input.strip("{").strip("};").replace(" ", ""))
-    reg_ex_ins= reg_ex_ins.split(", inst(")
-    for instruction in reg_ex_ins:
-        split_ins = [instr.strip("inst(").replace(",", " ") for instr in instruction.split("),")]
-        return split_ins[:-1]         
-   
+def memory_access_may_be_outside(in_block_formula, in_bounds, solver = None):
+    # Same guard idea as check_jump: the check is only switched on for this one solver call
+    if solver is None:
+        tempz3 = Solver()
+        tempz3.add(in_block_formula, Not(in_bounds))
+        return tempz3.check() != unsat
+    guard = FreshBool('memory')
+    solver.add(Implies(guard, And(in_block_formula, Not(in_bounds))))
+    return solver.check(guard) != unsat
+
+def log_problem(problem_log, problem_message):
+    if problem_log is not None:
+        problem_log.append(problem_message)
+
 def get_runtime_parameters(inputs):
     runtime_parameters = []
     for reg_num, input_param in enumerate(inputs,1):
-        new_instruction = f'MOV64XC {input_param} {reg_num}'
+        new_instruction = f'MOV64XC {reg_num} {input_param}'
         runtime_parameters.append(new_instruction)
     return runtime_parameters
 
 # Driver code for running full program and outputing solutions for registers
-def create_program(instructions, num_regs = 4, reg_size = 8, inputs = []):
+def create_program(instructions, num_regs = 4, reg_size = 8, inputs = [], incremental_solver = True, cfg_backend = "networkx",
+                   use_cfg_cache = False, reporter = None, loop_bound = 64, abstract_interpretation = True):
     """
     Parameters
     ----------
@@ -311,50 +735,79 @@ def create_program(instructions, num_regs = 4, reg_size = 8, inputs = []):
         
     inputs : TYPE, optional List of ints
         Any values passes into the program at runtime
+        
+    incremental_solver : TYPE, optional Boolean
+        Use a single solver along the whole control flow path (see Program_Holder).  The default is True.
+        
+    cfg_backend : TYPE, optional String
+        "networkx" or "array" storage for the CFG (see Basic_Block_CFG_Creator).  The default is "networkx".
+        
+    use_cfg_cache : TYPE, optional Boolean
+        Load/save the CFG layout of the program in the on disk cache (see CFG_Cache.py), so running 
+        the same program again with new inputs skips the CFG search.  The default is False.
+        
+    reporter : TYPE, optional Silent_Reporter object
+        Console_Reporter() prints the program, every block/instruction checked, and the results.
+        The default None prints nothing.
+        
+    loop_bound : TYPE, optional Int
+        Most times a loop body can run each time the loop is entered (see Program_Holder).  The default is 64.
+        
+    abstract_interpretation : TYPE, optional Boolean
+        Decide jumps from tnums and bounds first, and only ask the solver about the rest (see Program_Holder).
+        The default is True.
 
     Returns
     -------
-    None.
+    result : TYPE : Verification_Result object
+        Final register values found by the model (final_values is None if the program broke or was unsat),
+        the sat/unsat/error status, the path of blocks taken, where the program broke, and the phase timings.
+        result.jumps_decided_statically and result.jumps_checked_by_solver count how each jump along the path was decided.
     """
+    if reporter is None:
+        reporter = Silent_Reporter()
 
     # Program initialization, Basic Block CFG creation
     instruction_list = get_runtime_parameters(inputs)
     instruction_list.extend(instructions)
-    print(f'Number of Instructions: {len(instruction_list)}')
-    print("The full program in Python keyword format is:\n")
-    for number, ins in enumerate(instruction_list):
-        print ("\t"+ str(number) + ":\t" + ins)
+    reporter.program_listing(instruction_list)
 
     start_time = time.time()
-    program = Program_Holder(instruction_list, reg_size, num_regs)
+    program = Program_Holder(instruction_list, reg_size, num_regs, incremental_solver, cfg_backend, use_cfg_cache, reporter, loop_bound,
+                             abstract_interpretation)
     graph_made = time.time()
     
     # Program Execution (Iteratively adds instructions from blocks along the control flow)
     block = program.start_block
     formula = True
-    while not program.program_error and block.output_links:
+    while not program.program_error and program.end_block == 0:
         block, formula = program.add_instructions_from_block(block, formula)
     if not program.program_error:
-        block, formula = program.add_instructions_from_block(block, formula)
         program.formula = formula
     formula_made = time.time()
     
     # Checking the FOL formula found along the control flow path
+    final_values = None
+    status = "error"
     if not program.program_error:
-        tempz3 = Solver()
-        tempz3.add(program.end_block.in_block_formula)
-        print("\n--> Program Results <--")
+        if program.solver is not None:
+            tempz3 = program.solver
+        else:
+            tempz3 = Solver()
+            tempz3.add(program.end_block.in_block_formula)
         if tempz3.check() == sat:
-            print("\tModel found the following results:")
             # print(tempz3.model())
-            for reg_num, reg_name in enumerate(program.end_block.register_names_after_block_executes):
-                if reg_name != '0':
-                    reg_name = program.register_bitVec_dictionary[reg_name].name
-                    print(f'\t\tFinal Value for Register {reg_num}: {tempz3.model()[reg_name]}')
+            model = tempz3.model()
+            final_values = []
+            for ssa_id in program.end_block.register_names_after_block_executes:
+                if ssa_id != UNINITIALIZED:
+                    reg_name = program.register_bitVec_table[ssa_id]
+                    final_values.append(model.eval(reg_name, model_completion = True).as_long())
                 else:
-                    print(f'\t\tFinal Value for Register {reg_num}: Not Initialized')
+                    final_values.append(None)
+            status = "sat"
         else:
-            print ("Model couldn't find a solution for the program: \n\tUNSATISFIABLE")      
+            status = "unsat"
     end_time = time.time()
     
     # # Debug help to check the Basic Blocks inside the CFG
@@ -362,7 +815,253 @@ def create_program(instructions, num_regs = 4, reg_size = 8, inputs = []):
     #     print("-"*20)
     #     print(node)
     # print("-"*20)
-    print('--> Total Run Time: \t\t%0.3f seconds <--' %(end_time-start_time))
-    print('--> Time to make CFG: \t\t%0.3f seconds <--' %(graph_made-start_time))
-    print('--> Time to create FOL: \t%0.3f seconds <--' %(formula_made-graph_made))
-    print('--> Time to Evaluate: \t\t%0.3f seconds <--' %(end_time-formula_made))
\ No newline at end of file
+    result = Verification_Result(final_values, status, program.path, program.error_location,
+                                 program.problem_log[-1] if program.problem_log else "",
+                                 {"cfg": graph_made - start_time, "formula": formula_made - graph_made,
+                                  "solve": end_time - formula_made, "total": end_time - start_time},
+                                 len(instruction_list))
+    result.jumps_decided_statically = program.jumps_decided_statically
+    result.jumps_checked_by_solver = program.jumps_checked_by_solver
+    reporter.results(result)
+    return result
+
+def signed_int(value, reg_size):
+    return value - (value >> (reg_size - 1) << reg_size)
+
+# Plain int versions of alu_operations: (target_reg_old_val, source_val, shift, reg_size) -> new value (masked by the caller)
+    # shift is the shift amount (input_value for everything but register shifts), which is the width for the byte order
+    # conversions.  None is an invalid instruction
+concrete_alu_operations = {
+    ALU_Op.ADD:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val + source_val,
+    ALU_Op.MOV:  lambda target_reg_old_val, source_val, shift, reg_size: source_val,
+    ALU_Op.LSH:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val << shift if shift < reg_size else 0,
+    ALU_Op.RSH:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val >> shift if shift < reg_size else 0,
+    ALU_Op.ARSH: lambda target_reg_old_val, source_val, shift, reg_size: signed_int(target_reg_old_val, reg_size) >> min(shift, reg_size - 1),
+    ALU_Op.SUB:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val - source_val,
+    ALU_Op.MUL:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val * source_val,
+    ALU_Op.DIV:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val // source_val if source_val else 0,
+    ALU_Op.MOD:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val % source_val if source_val else target_reg_old_val,
+    ALU_Op.AND:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val & source_val,
+    ALU_Op.OR:   lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val | source_val,
+    ALU_Op.XOR:  lambda target_reg_old_val, source_val, shift, reg_size: target_reg_old_val ^ source_val,
+    ALU_Op.NEG:  lambda target_reg_old_val, source_val, shift, reg_size: -target_reg_old_val,
+    ALU_Op.END_LE: lambda target_reg_old_val, source_val, shift, reg_size: 
+                    concrete_byte_order_conversion(target_reg_old_val, shift, reg_size, swap_bytes = False),
+    ALU_Op.END_BE: lambda target_reg_old_val, source_val, shift, reg_size: 
+                    concrete_byte_order_conversion(target_reg_old_val, shift, reg_size, swap_bytes = True),
+}
+
+def concrete_byte_order_conversion(target_reg_old_val, width, reg_size, swap_bytes):
+    # Plain int version of byte_order_conversion
+    if width not in (16, 32, 64) or width > reg_size:
+        return None
+    low_bits = target_reg_old_val & (2 ** width - 1)
+    if swap_bytes:
+        return int.from_bytes(low_bits.to_bytes(width // 8, "little"), "big")
+    return low_bits
+
+# Plain int versions of fall_through_conditions: (target_reg_val, source_val, reg_size) -> True to fall through
+concrete_fall_through_conditions = {
+    Jump_Condition.JNE:  lambda target_reg_val, source_val, reg_size: source_val == target_reg_val,
+    Jump_Condition.JEQ:  lambda target_reg_val, source_val, reg_size: source_val != target_reg_val,
+    Jump_Condition.JGT:  lambda target_reg_val, source_val, reg_size: not target_reg_val > source_val,
+    Jump_Condition.JSGT: lambda target_reg_val, source_val, reg_size: not signed_int(target_reg_val, reg_size) > signed_int(source_val, reg_size),
+    Jump_Condition.JGE:  lambda target_reg_val, source_val, reg_size: not target_reg_val >= source_val,
+    Jump_Condition.JSGE: lambda target_reg_val, source_val, reg_size: not signed_int(target_reg_val, reg_size) >= signed_int(source_val, reg_size),
+    Jump_Condition.JLT:  lambda target_reg_val, source_val, reg_size: not target_reg_val < source_val,
+    Jump_Condition.JLE:  lambda target_reg_val, source_val, reg_size: not target_reg_val <= source_val,
+    Jump_Condition.JSLT: lambda target_reg_val, source_val, reg_size: not signed_int(target_reg_val, reg_size) < signed_int(source_val, reg_size),
+    Jump_Condition.JSLE: lambda target_reg_val, source_val, reg_size: not signed_int(target_reg_val, reg_size) <= signed_int(source_val, reg_size),
+    Jump_Condition.JSET: lambda target_reg_val, source_val, reg_size: target_reg_val & source_val == 0,
+    Jump_Condition.JA:   lambda target_reg_val, source_val, reg_size: False,
+}
+
+def execute_concrete_instruction(instruction, registers, reg_size):
+    """
+    Plain int version of execute_instruction, matching it bit for bit (including the 32 bit subregisters)
+    
+    Parameters
+    ----------
+    instruction : TYPE : Instruction_Info object
+        Contains all the information about a single instruction in the program
+        
+    registers : TYPE : List of ints (None for uninitialized registers)
+        Current register values, updated in place
+        
+    reg_size : TYPE : Int
+        The bitwidth of the modeled registers
+
+    Returns
+    -------
+    executed : TYPE : Boolean
+        False if the instruction needs a value that isn't concrete, or something only z3 can report on
+    """
+    reg_mask = 2 ** reg_size - 1
+    if instruction.input_value_is_const:
+        source_val = instruction.input_value_concrete
+    else:
+        source_val = registers[instruction.input_value]
+    target_reg_old_val = registers[instruction.target_reg]
+    if source_val is None or (target_reg_old_val is None and instruction.opcode != ALU_Op.MOV):
+        return False
+    
+    # 32 bit operations run as if the register was only 32 bits wide (signs at bit 31), then zero extend
+    operation_size = reg_size
+    if instruction.bit_size == 32 and reg_size > 32:
+        operation_size, reg_mask = 32, 0xffffffff
+        source_val &= reg_mask
+        if target_reg_old_val is not None:
+            target_reg_old_val &= reg_mask
+    
+    operation = concrete_alu_operations.get(instruction.opcode)
+    if operation is None:
+        return False
+    # Register shifts use shift_amount like the z3 shifts do, everything else gets input_value
+    if instruction.source_kind == Source_Kind.REGISTER:
+        shift = shift_amount(instruction, source_val, operation_size)
+    else:
+        shift = instruction.input_value & (2 ** reg_size - 1)
+    new_val = operation(target_reg_old_val, source_val, shift, operation_size)
+    if new_val is None:
+        return False
+    registers[instruction.target_reg] = new_val & reg_mask
+    return True
+
+def check_concrete_jump(instruction, registers, reg_size):
+    """
+    Plain int version of check_jump
+
+    Returns
+    -------
+    next_instruction : TYPE : Bool or None
+        True to fall through to the next instruction, False to take the jump offset,
+        None if the jump needs something only z3 can report on
+    """
+    if instruction.opcode == Jump_Condition.JA:
+        return False
+    if instruction.input_value_is_const:
+        source_val = instruction.input_value_concrete
+    else:
+        source_val = registers[instruction.input_value]
+    target_reg_val = registers[instruction.target_reg]
+    if source_val is None or target_reg_val is None:
+        return None
+    
+    condition = concrete_fall_through_conditions.get(instruction.opcode)
+    if condition is None:
+        return None
+    if instruction.bit_size == 32 and reg_size > 32:
+        target_reg_val, source_val, reg_size = target_reg_val & 0xffffffff, source_val & 0xffffffff, 32
+    return condition(target_reg_val, source_val, reg_size)
+
+def execute_concrete_memory_instruction(instruction, registers, memory):
+    """
+    Plain int version of execute_memory_instruction, on a Concrete_Memory
+
+    Returns
+    -------
+    executed : TYPE : Boolean
+        False if the access needs something only z3 can report on (unknown context bytes, 
+        unwritten stack, out of bounds...)
+    """
+    access_size = instruction.opcode
+    if instruction.instruction_class == Instruction_Class.LOAD:
+        base = registers[instruction.input_value]
+    else:
+        base = registers[instruction.target_reg]
+    if base is None:
+        return False
+    address = (base + instruction.offset) & (2 ** MEMORY_ADDRESS_SIZE - 1)
+    if instruction.instruction_class == Instruction_Class.LOAD:
+        value = memory.load(address, access_size)
+        if value is None:
+            return False
+        registers[instruction.target_reg] = value
+        return True
+    if instruction.input_value_is_const:
+        value = instruction.input_value_concrete
+    else:
+        value = registers[instruction.input_value]
+    if value is None:
+        return False
+    return memory.store(address, access_size, value)
+
+# Concrete fast path for programs where every register value is known
+def execute_concrete(instructions, num_regs = 4, reg_size = 8, inputs = [], reporter = None, loop_bound = 64):
+    """
+    Runs the program with plain Python ints and masked arithmetic, instead of building
+        z3 formulas just to read constants back out of the solver.  
+        
+    If a value can't be known concretely (a register is read before anything was moved into it),
+        or an instruction is something only the z3 version can report on (bad keyword, input too large
+        for the register...), the whole program is handed over to create_program instead.
+    
+    Parameters are the same as create_program
+
+    Returns
+    -------
+    result : TYPE : Verification_Result object
+        Same as create_program (path is the same list of block leaders), with only the "total" timing
+    """
+    if reporter is None:
+        reporter = Silent_Reporter()
+    instruction_list = get_runtime_parameters(inputs)
+    instruction_list.extend(instructions)
+    
+    start_time = time.time()
+    decoded_list = [Instruction_Info(instruction, number, reg_size) for number, instruction in enumerate(instruction_list)]
+    leader_set = identify_leaders(decoded_list)
+    path = []
+    registers = [None for _ in range(num_regs)]
+    memory = None
+    if any(instruction.instruction_class in (Instruction_Class.LOAD, Instruction_Class.STORE) for instruction in decoded_list):
+        memory = Concrete_Memory()
+        for register_number, value in entry_pointer_values(num_regs).items():
+            registers[register_number] = value
+    # Runs of each loop (by the instruction a backward jump goes to) since it was last entered from above
+    loop_runs = {}
+    came_back_around = False
+    instruction_number = 0
+    is_concrete = True
+    while is_concrete and instruction_number < len(decoded_list):
+        instruction = decoded_list[instruction_number]
+        if instruction_number in leader_set or instruction_number == 0:
+            path.append(instruction_number)
+            if not came_back_around:
+                loop_runs.pop(instruction_number, None)
+        came_back_around = False
+        if max(instruction.target_reg, 0 if instruction.input_value_is_const else instruction.input_value) >= num_regs:
+            is_concrete = False
+        elif instruction.instruction_class == Instruction_Class.EXIT:
+            break
+        elif instruction.instruction_class == Instruction_Class.ALU:
+            is_concrete = execute_concrete_instruction(instruction, registers, reg_size)
+            instruction_number += 1
+        elif instruction.instruction_class != Instruction_Class.JUMP:
+            is_concrete = reg_size == MEMORY_ADDRESS_SIZE and execute_concrete_memory_instruction(instruction, registers, memory)
+            instruction_number += 1
+        else:
+            next_instruction = check_concrete_jump(instruction, registers, reg_size)
+            if next_instruction is None:
+                is_concrete = False
+            elif next_instruction:
+                instruction_number += 1
+            else:
+                if instruction.offset < 0:
+                    # create_program reports the loop going past loop_bound
+                    came_back_around = True
+                    loop_start = instruction_number + instruction.offset + 1
+                    loop_runs[loop_start] = loop_runs.get(loop_start, 1) + 1
+                    is_concrete = loop_runs[loop_start] <= loop_bound
+                instruction_number += instruction.offset + 1
+    end_time = time.time()
+    
+    if not is_concrete:
+        reporter.concrete_fallback()
+        return create_program(instructions, num_regs, reg_size, inputs, reporter = reporter, loop_bound = loop_bound)
+    
+    reporter.program_listing(instruction_list)
+    result = Verification_Result(registers, "sat", path, timings = {"total": end_time - start_time},
+                                 number_of_instructions = len(instruction_list))
+    reporter.results(result)
+    return result
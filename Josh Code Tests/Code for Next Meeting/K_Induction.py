@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:29:16 2026
+
+@author: joshc
+
+k-induction: proving a loop safe for every number of trips, not just the first max_depth
+
+    bounded_model_check can only say "holds" once every path has exited, so a loop running a few thousand times
+        (walking packet headers, a counter off a symbolic register) takes that many frames, or never finishes.
+        k-induction adds a second question on top of the same Frame_Encoding, in the same Solver:
+
+        Base case (frames named 0, 1, ... from the start of the program)
+            Exactly bounded_model_check: no path of k blocks from the start breaks the property.
+            A model here is a real counterexample.
+
+        Inductive step (frames named step_0, step_1, ..., starting from any state at all)
+            No k + 1 frames in a row, where the first k don't break the property, can break it in the last one.
+            If that's unsat (and the base case up to k holds), the property holds at every depth.
+
+        The base frames grow by one each round, asserting only the new frame's transition (exactly like
+            bounded_model_check).  The step frames go in a push/pop scope on the same solver: they start from a
+            state that can be anything, so every block's arithmetic on them is really up for grabs, and leaving them
+            asserted made every base check after them around 100 times slower.
+        The smallest k that proves the property is reported.
+
+    Strengthening the step (both only rule out states that can't happen, so the proof stays sound)
+        Simple paths: every step frame has to be a different state from the ones before it, so a loop that could
+            spin forever on made up values eventually runs out of new states.  These are only added for the
+            pairs of frames a step model actually repeats (all k^2 pairs up front slow down every check after them).
+        Definitely initialized registers: a forward pass over the (looping) block CFG finds the registers
+            every path into each block has already set.  A step frame at that block has them initialized, so the
+            step doesn't start inside a loop with the loop counter never set.
+
+    Like bounded_model_check, this is about safety (never breaking, and exit_property every time it exits),
+        so a loop that never exits but never breaks anything holds too.
+"""
+from Bounded_Model_Checking import *
+
+def definitely_initialized(block_graph, start_block, num_regs, symbolic_registers = ()):
+    """
+    Returns
+    -------
+    initialized_before : TYPE : Dict (Basic_Block -> frozenset of Ints)
+        The registers set along every path into each block that can be reached
+    """
+    registers_set = {}
+    for block in block_graph:
+        registers_set[block] = frozenset(instruction.target_reg for instruction in block.block_instructions
+                                         if instruction.instruction_class in register_setting_classes
+                                         and instruction.target_reg < num_regs)
+
+    initialized_before = {start_block: frozenset(symbolic_registers)}
+    work_list = [start_block]
+    while work_list:
+        block = work_list.pop()
+        initialized_after = initialized_before[block] | registers_set[block]
+        for next_block in block_graph.successors(block):
+            if next_block not in initialized_before:
+                initialized_before[next_block] = initialized_after
+            elif initialized_before[next_block] <= initialized_after:
+                continue
+            else:
+                initialized_before[next_block] = initialized_before[next_block] & initialized_after
+            work_list.append(next_block)
+    return initialized_before
+
+def state_invariant(encoding, initialized_before, frame_number, prefix):
+    # Holds in every state the program can actually reach (see the top of the file)
+    pc, registers, initialized = encoding.frame(frame_number, prefix)
+    invariant = [ULE(pc, encoding.ERROR)]
+    for block, register_numbers in initialized_before.items():
+        if register_numbers:
+            invariant.append(Implies(pc == encoding.block_number[block], And([initialized[register_number] for register_number in register_numbers])))
+    return And(invariant)
+
+def different_states(first_state, second_state):
+    first_pc, first_registers, first_initialized = first_state
+    second_pc, second_registers, second_initialized = second_state
+    return Or([first_pc != second_pc] + [first != second for first, second in zip(first_registers, second_registers)] +
+              [first != second for first, second in zip(first_initialized, second_initialized)])
+
+def repeated_states(model, encoding, k):
+    # Pairs of step frames the model put in exactly the same state
+    first_frame = {}
+    repeats = []
+    for frame_number in range(k + 1):
+        pc, registers, initialized = encoding.frame(frame_number, "step_")
+        state = tuple(str(model.eval(term, model_completion = True)) for term in [pc] + registers + initialized)
+        if state in first_frame:
+            repeats.append((first_frame[state], frame_number))
+        else:
+            first_frame[state] = frame_number
+    return repeats
+
+def step_case(solver, encoding, initialized_before, exit_property, k, distinct_pairs, step_timeout):
+    """
+    The inductive step for k, in its own scope on the solver
+
+    Parameters
+    ----------
+    distinct_pairs : TYPE : Set of (Int, Int)
+        Step frames that have to be different states (simple paths, lazily: a pair only gets added once a model
+        puts both frames in the same state, instead of all k^2 pairs up front).  Kept from one k to the next.
+
+    step_timeout : TYPE : Int
+        Milliseconds the solver gets for each step check
+
+    Returns
+    -------
+    TYPE : z3 CheckSatResult
+        unsat if the property is k-inductive, unknown if step_timeout ran out first
+    """
+    solver.push()
+    solver.add(state_invariant(encoding, initialized_before, 0, "step_"))
+    for frame_number in range(k):
+        solver.add(Not(encoding.bad(frame_number, exit_property, "step_")), encoding.transition(frame_number, "step_"),
+                   state_invariant(encoding, initialized_before, frame_number + 1, "step_"))
+    solver.add(encoding.bad(k, exit_property, "step_"))
+    solver.add([different_states(encoding.frame(first, "step_"), encoding.frame(second, "step_")) for first, second in distinct_pairs])
+    solver.set("timeout", step_timeout)
+    while True:
+        step_result = solver.check()
+        if step_result != sat:
+            break
+        repeats = repeated_states(solver.model(), encoding, k)
+        if not repeats:
+            break
+        distinct_pairs.update(repeats)
+        solver.add([different_states(encoding.frame(first, "step_"), encoding.frame(second, "step_")) for first, second in repeats])
+    solver.set("timeout", 4294967295)
+    solver.pop()
+    return step_result
+
+def k_induction(instructions, num_regs = 4, reg_size = 8, inputs = [], exit_property = None, max_k = 200,
+                symbolic_registers = (), step_timeout = 1000, cfg_backend = "networkx", reporter = None):
+    """
+    Parameters
+    ----------
+    instructions, num_regs, reg_size, inputs, exit_property, symbolic_registers, cfg_backend, reporter :
+        Same as bounded_model_check
+
+    max_k : TYPE : Int, optional
+        Most frames to try for both the base case and the inductive step
+
+    step_timeout : TYPE : Int, optional
+        Milliseconds each inductive step check gets.  Running out only means that k didn't prove it,
+        and the next k is tried (the base case has no timeout).
+
+    Returns
+    -------
+    result : TYPE : Verification_Result object
+        status is "violated" (a counterexample from the base case, like bounded_model_check), "holds", or "unknown".
+        result.depth is the smallest k that decided it, and result.proof says how a "holds" was shown
+        ("k-induction", or "every path exited" when the base case ran out of paths first).
+    """
+    if reporter is None:
+        reporter = Silent_Reporter()
+    instruction_list = get_runtime_parameters(inputs)
+    instruction_list.extend(instructions)
+    reporter.program_listing(instruction_list)
+
+    start_time = time.time()
+    program = Program_Holder(instruction_list, reg_size, num_regs, cfg_backend = cfg_backend, reporter = reporter,
+                             abstract_interpretation = False)
+    encoding = Frame_Encoding(program.block_graph, program.start_block, num_regs, reg_size)
+    initialized_before = definitely_initialized(program.block_graph, program.start_block, num_regs, symbolic_registers)
+    graph_made = time.time()
+
+    solver = Solver()
+    solver.add(encoding.initial_state(symbolic_registers))
+    distinct_pairs = set()
+    final_values, path, error_location, error_message = None, [], None, ""
+    status, proof = "unknown", ""
+    for k in range(max_k + 1):
+        # Base case
+        violation = FreshBool('violation')
+        solver.add(Implies(violation, encoding.bad(k, exit_property)))
+        if solver.check(violation) == sat:
+            status = "violated"
+            final_values, path, error_location, error_message = encoding.counterexample(solver.model(), k)
+            if error_location is None:
+                error_message = "Exit property doesn't hold"
+            else:
+                final_values = None
+            break
+        still_running = FreshBool('running')
+        solver.add(Implies(still_running, encoding.running(k)))
+        if solver.check(still_running) == unsat:
+            status, proof = "holds", "every path exited"
+            break
+
+        # Inductive step
+        if step_case(solver, encoding, initialized_before, exit_property, k, distinct_pairs, step_timeout) == unsat:
+            status, proof = "holds", "k-induction"
+            break
+
+        if k < max_k:
+            solver.add(encoding.transition(k))
+    end_time = time.time()
+
+    result = Verification_Result(final_values, status, path, error_location, error_message,
+                                 {"cfg": graph_made - start_time, "formula": 0, "solve": end_time - graph_made,
+                                  "total": end_time - start_time}, len(instruction_list))
+    result.depth = k
+    result.proof = proof
+    reporter.results(result)
+    return result
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:18:04 2026
+
+@author: joshc
+
+Loops in any CFG, for the backward jumps (bounded loops) the kernel has allowed since 5.3
+
+    Every eBPF jump used to go forward, so the block graph had no cycles, and create_program could just walk
+        blocks until one had no successors.  A backward jump closes a loop, and this finds them:
+
+        1) Strongly connected components (Tarjan 1972), iteratively with an explicit stack, so deep CFGs
+            don't hit the recursion limit.  Any component with more than one node (or a node jumping to itself)
+            is a loop.
+        2) The header of a loop is its first node in reverse postorder (the node the loop is entered through,
+            which dominates the rest of the loop whenever there is only one way in).
+            Back edges are the edges from inside the loop to its header.
+        3) Loop nesting forest: taking the header out of a loop and finding components again in what is left
+            gives the loops nested inside it, down to the innermost ones (the same idea as Havlak 1997).
+
+    Like Dominators.py, the graph only needs successors(node), so nx.DiGraph and Array_Block_Graph both work,
+        and nodes that can't be reached from start are left out.
+"""
+from Dominators import *
+
+class Loop:
+    def __init__(self, header, body, parent = None):
+        """
+        Parameters
+        ----------
+        header : TYPE : Node
+            Where the loop is entered, and where every back edge goes
+
+        body : TYPE : Set of nodes
+            Every node in the loop (header included, nested loops included)
+
+        parent : TYPE : Loop object, optional
+            The loop this one is nested in
+        """
+        self.header = header
+        self.body = body
+        self.parent = parent
+        self.children = []
+        self.depth = 1 if parent is None else parent.depth + 1
+        self.back_edges = []
+
+def strongly_connected_components(graph, nodes):
+    """
+    Tarjan's algorithm on the part of graph holding nodes
+
+    Parameters
+    ----------
+    graph : TYPE : Any graph with successors
+
+    nodes : TYPE : List of nodes
+        Only edges between these count, and components are searched from them in this order
+
+    Returns
+    -------
+    components : TYPE : List of Lists of nodes
+        Every strongly connected component, a component always comes after the components it reaches
+    """
+    node_set = set(nodes)
+    index, lowlink = {}, {}
+    on_stack = set()
+    component_stack = []
+    components = []
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        component_stack.append(root)
+        on_stack.add(root)
+        work_stack = [(root, iter(graph.successors(root)))]
+        while work_stack:
+            node, successors = work_stack[-1]
+            for next_node in successors:
+                if next_node not in node_set:
+                    continue
+                if next_node not in index:
+                    index[next_node] = lowlink[next_node] = len(index)
+                    component_stack.append(next_node)
+                    on_stack.add(next_node)
+                    work_stack.append((next_node, iter(graph.successors(next_node))))
+                    break
+                if next_node in on_stack:
+                    lowlink[node] = min(lowlink[node], index[next_node])
+            else:
+                work_stack.pop()
+                if work_stack:
+                    parent = work_stack[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = component_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    components.reverse()
+    return components
+
+def find_loops(graph, start):
+    """
+    Parameters
+    ----------
+    graph : TYPE : Any graph with successors/predecessors
+
+    start : TYPE : Node
+        The entry of the graph
+
+    Returns
+    -------
+    loops : TYPE : List of Loop objects
+        Every loop (outer loops before the loops nested in them), with their back edges and nesting filled in
+    """
+    order = reverse_postorder(graph, start)
+    rpo_number = {node: number for number, node in enumerate(order)}
+    loops = []
+
+    # (nodes left to search, the loop they are inside)
+    work_list = [(order, None)]
+    while work_list:
+        region, parent = work_list.pop()
+        for component in strongly_connected_components(graph, region):
+            header = min(component, key = rpo_number.get)
+            if len(component) == 1 and header not in graph.successors(header):
+                continue
+            loop = Loop(header, set(component), parent)
+            loop.back_edges = [(node, header) for node in sorted(component, key = rpo_number.get)
+                               if header in graph.successors(node)]
+            if parent is not None:
+                parent.children.append(loop)
+            loops.append(loop)
+            work_list.append((sorted(loop.body - {header}, key = rpo_number.get), loop))
+    return loops
+
+def back_edge_set(loops):
+    return {back_edge for loop in loops for back_edge in loop.back_edges}
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:05:13 2026
+
+@author: joshc
+
+Memory for LDX/STX/ST: the 512 byte eBPF stack and the context r1 points to
+
+Where things are
+    Programs that touch memory start the way the kernel starts them: r10 holds the frame pointer
+        (the top of the stack, stack bytes are [FRAME_POINTER - STACK_SIZE, FRAME_POINTER)) and r1 holds
+        the context pointer (CONTEXT_SIZE bytes starting at CONTEXT_POINTER).  Both are fixed constants,
+        so "LDXW 2 10 -8" reads a known address.  Touching anything else is a problem, the same as the kernel
+        verifier turning the program down.
+
+Known values
+    known_values maps an SSA id to the plain int that register version is known to hold (the entry pointers,
+        and anything worked out only from those and immediates, like r2 = r10, r2 += -16).  Only addresses
+        look at it, the register constraints going to the solver are the same as always.
+
+Byte blasted memory (the fast path)
+    While every address is a known constant, memory is a dict from address to the z3 8 bit term stored there,
+        so spilling a register and filling it back is just Extract and Concat, with no array theory at all.
+    Context bytes are fresh 8 bit variables ("ctx_{offset}"), made the first time they are read, so the solver
+        treats the context as any possible input.  Stack bytes that were never written can't be read.
+
+Array memory (the slow path)
+    The first time an address isn't a known constant (a pointer moved by a register value), every byte
+        so far is stored into a z3 Array (64 bit address -> 8 bit byte), and every access after that is a
+        Select/Store on it.  Those accesses come with a bounds condition the solver has to rule out instead.
+        Reading stack bytes nothing wrote can't be caught in this mode.
+
+Loads and stores are little endian, and loads zero extend into the register.
+"""
+from z3 import *
+
+STACK_SIZE = 512
+FRAME_POINTER = 0x10000
+CONTEXT_POINTER = 0x20000
+CONTEXT_SIZE = 256
+
+# Pointers are whole 64 bit registers
+MEMORY_ADDRESS_SIZE = 64
+
+# Registers holding a pointer when the program starts: register number -> value
+entry_pointers = {10: FRAME_POINTER, 1: CONTEXT_POINTER}
+
+memory_regions = ((FRAME_POINTER - STACK_SIZE, FRAME_POINTER), (CONTEXT_POINTER, CONTEXT_POINTER + CONTEXT_SIZE))
+
+def entry_pointer_values(num_regs):
+    """
+    Returns
+    -------
+    TYPE : Dict
+        register number -> starting pointer value, for the entry pointers the program has registers for
+    """
+    return {register_number: value for register_number, value in entry_pointers.items() if register_number < num_regs}
+
+def access_problem(address, size):
+    """
+    Parameters
+    ----------
+    address : TYPE : Int
+        First byte of the access
+
+    size : TYPE : Int
+        Number of bytes
+
+    Returns
+    -------
+    TYPE : String
+        Why the access isn't allowed ("" if every byte is inside the stack or the context)
+    """
+    for low, high in memory_regions:
+        if low <= address and address + size <= high:
+            return ""
+    return "Memory access outside of the stack and the context"
+
+def is_stack_address(address):
+    return FRAME_POINTER - STACK_SIZE <= address < FRAME_POINTER
+
+def split_into_bytes(value, size):
+    # Lowest byte first, constants stay constants so a filled spill is still known
+    if is_bv_value(value):
+        value = value.as_long()
+        return [BitVecVal((value >> (8 * byte)) & 0xff, 8) for byte in range(size)]
+    return [Extract(8 * byte + 7, 8 * byte, value) for byte in range(size)]
+
+def join_bytes(memory_bytes):
+    # Lowest byte first in, one 8 * len(memory_bytes) bit term out
+    if all(is_bv_value(memory_byte) for memory_byte in memory_bytes):
+        value = sum(memory_byte.as_long() << (8 * byte) for byte, memory_byte in enumerate(memory_bytes))
+        return BitVecVal(value, 8 * len(memory_bytes))
+    if len(memory_bytes) == 1:
+        return memory_bytes[0]
+    return Concat(*reversed(memory_bytes))
+
+class Stack_And_Context_Memory:
+    def __init__(self):
+        # address -> z3 8 bit term, until the first address that isn't known
+        self.stored_bytes = {}
+        # z3 Array (address -> byte) after that
+        self.memory_array = None
+        # SSA id -> int (see the top of the file)
+        self.known_values = {}
+
+    def address_of(self, base_ssa_id, offset):
+        """
+        Returns
+        -------
+        TYPE : Int or None
+            The address base + offset if the base register version has a known value
+        """
+        base = self.known_values.get(base_ssa_id)
+        if base is None:
+            return None
+        return (base + offset) & (2 ** MEMORY_ADDRESS_SIZE - 1)
+
+    def in_bounds(self, address, size):
+        # z3 condition for every byte of the access being inside one region
+        return Or([And(UGE(address, low), ULE(address, high - size)) for low, high in memory_regions])
+
+    def switch_to_array(self):
+        self.memory_array = Array('memory', BitVecSort(MEMORY_ADDRESS_SIZE), BitVecSort(8))
+        for address, memory_byte in self.stored_bytes.items():
+            self.memory_array = Store(self.memory_array, address, memory_byte)
+        self.stored_bytes = None
+
+    def load(self, address, size):
+        """
+        Parameters
+        ----------
+        address : TYPE : Int or z3 bitVec
+            First byte to read, an int if it is known
+
+        size : TYPE : Int
+            Number of bytes (1, 2, 4 or 8)
+
+        Returns
+        -------
+        value : TYPE : z3 bitVec (8 * size bits) or None
+            The bytes read (None if there is a problem)
+
+        in_bounds : TYPE : z3 Boolean or None
+            For addresses that aren't known, what the solver has to show always holds
+
+        problem : TYPE : String
+            Why the load isn't allowed ("" if it is)
+        """
+        if isinstance(address, int):
+            problem = access_problem(address, size)
+            if problem:
+                return None, None, problem
+            if self.memory_array is None:
+                memory_bytes = []
+                for byte_address in range(address, address + size):
+                    memory_byte = self.stored_bytes.get(byte_address)
+                    if memory_byte is None:
+                        if is_stack_address(byte_address):
+                            return None, None, "Reading stack memory that was never written"
+                        memory_byte = BitVec(f'ctx_{byte_address - CONTEXT_POINTER}', 8)
+                        self.stored_bytes[byte_address] = memory_byte
+                    memory_bytes.append(memory_byte)
+                return join_bytes(memory_bytes), None, ""
+            address, in_bounds = BitVecVal(address, MEMORY_ADDRESS_SIZE), None
+        else:
+            if self.memory_array is None:
+                self.switch_to_array()
+            in_bounds = self.in_bounds(address, size)
+        return join_bytes([Select(self.memory_array, address + byte) for byte in range(size)]), in_bounds, ""
+
+    def store(self, address, size, value):
+        """
+        Parameters
+        ----------
+        address : TYPE : Int or z3 bitVec
+            First byte to write, an int if it is known
+
+        size : TYPE : Int
+            Number of bytes (1, 2, 4 or 8)
+
+        value : TYPE : z3 bitVec
+            Only the low size bytes get stored
+
+        Returns
+        -------
+        in_bounds : TYPE : z3 Boolean or None
+            For addresses that aren't known, what the solver has to show always holds
+
+        problem : TYPE : String
+            Why the store isn't allowed ("" if it is)
+        """
+        memory_bytes = split_into_bytes(value, size)
+        if isinstance(address, int):
+            problem = access_problem(address, size)
+            if problem:
+                return None, problem
+            if self.memory_array is None:
+                for byte, memory_byte in enumerate(memory_bytes):
+                    self.stored_bytes[address + byte] = memory_byte
+                return None, ""
+            address, in_bounds = BitVecVal(address, MEMORY_ADDRESS_SIZE), None
+        else:
+            if self.memory_array is None:
+                self.switch_to_array()
+            in_bounds = self.in_bounds(address, size)
+        for byte, memory_byte in enumerate(memory_bytes):
+            self.memory_array = Store(self.memory_array, address + byte, memory_byte)
+        return in_bounds, ""
+
+class Concrete_Memory:
+    # Plain int version for execute_concrete: only known addresses, and nothing unknown can be read
+    def __init__(self):
+        self.stored_bytes = {}
+
+    def load(self, address, size):
+        # None if the load needs something only z3 can report on (context bytes, unwritten stack, out of bounds)
+        if access_problem(address, size):
+            return None
+        value = 0
+        for byte in range(size):
+            memory_byte = self.stored_bytes.get(address + byte)
+            if memory_byte is None:
+                return None
+            value |= memory_byte << (8 * byte)
+        return value
+
+    def store(self, address, size, value):
+        # False if the store is out of bounds
+        if access_problem(address, size):
+            return False
+        for byte in range(size):
+            self.stored_bytes[address + byte] = (value >> (8 * byte)) & 0xff
+        return True
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:34:43 2026
+
+@author: joshc
+
+Path merging version of create_program
+
+    create_program walks the CFG one block at a time, asking the solver which way every jump goes.
+    jump_command in FOL_Verifier.py covered both sides of a jump with If(...), but did it by running the
+        rest of the program once for each side, which doubles with every jump.
+
+    create_merged_program visits every basic block exactly once, in program order (every jump goes
+        forward, so that is a topological order of the block graph), and builds one formula for every path:
+
+        Block reachability
+            reached[start] is True.  Every other block is reached if any predecessor was reached and
+            the jump out of that predecessor went its way:
+                reached[block] = Or(And(reached[pred], edge condition from pred) for every pred)
+
+        Register values at joins
+            The CFG is put into full SSA form first (basic_block_CFG_and_phi_function_setup with build_ssa = True):
+            phi_function_locations says which registers can come into a block with different values, each of
+            those gets a phi function named r{register_number}_{block_ID}_phi, and renaming over the dominator tree
+            tells every block its starting register names and which name each predecessor hands each phi.
+            A phi function is an If chain over the incoming edges:
+                r{n}_{block_ID}_phi == If(edge 1 taken, name from pred 1, If(edge 2 taken, name from pred 2, ...))
+
+        Register values inside a block
+            Same SSA names as create_program (r{register_number}_{instruction}), each tied to its value
+            with one constraint, so the formula grows with the size of the program, not the number of paths.
+            Block reachability gets a name the same way (reached_{block_id}).
+            
+        All of those constraints together are a single formula for the whole program (Merged_Program.formula)
+
+    The solver is only checked once, at the end.  The model gives the final register values (merged over
+        every EXIT), and which blocks were reached, so the path taken and any problem instruction
+        (reading an uninitialized register, an input that doesn't fit...) come back the same as create_program.
+"""
+from FOL_from_BPF import *
+
+class Merged_Program:
+    def __init__(self, block_graph, start_block, num_regs, reg_size, reg_bitVec_table, reporter):
+        """
+        Parameters
+        ----------
+        block_graph : TYPE : nx.DiGraph or Array_Block_Graph
+            The block CFG, already in SSA form (basic_block_CFG_and_phi_function_setup with build_ssa = True)
+
+        start_block : TYPE : Basic_Block object
+
+        num_regs, reg_size : TYPE : Int
+
+        reg_bitVec_table : TYPE : Register_BitVec_Table object
+            The SSA register bitVecs from the CFG setup
+
+        reporter : TYPE : Silent_Reporter object
+        """
+        self.block_graph = block_graph
+        self.start_block = start_block
+        self.num_regs = num_regs
+        self.reg_size = reg_size
+        self.reg_bv_table = reg_bitVec_table
+        self.reporter = reporter
+
+        # Every SSA assignment, added to the solver all at once
+        self.constraints = []
+
+        # Per block: reached condition, and the fall through condition of the last jump
+        self.reached = {}
+        self.fall_through = {}
+        
+        # When each phi function could be holding an uninitialized register
+        self.phi_uninitialized = {}
+
+        # (block, instruction number, message, condition) for everything that would break the program if reached
+        self.problems = []
+        self.exit_blocks = []
+
+    def blocks_in_program_order(self):
+        blocks = [block for block in self.block_graph if block is not self.start_block]
+        return [self.start_block] + sorted(blocks, key = lambda block: block.block_id)
+
+    def edge_condition(self, previous_block, block):
+        last_instruction = previous_block.block_instructions[-1]
+        # (a jump with an offset of 0 ends up at the next block either way)
+        if last_instruction.instruction_class != Instruction_Class.JUMP or last_instruction.offset == 0:
+            return BoolVal(True)
+        if block.initial_instruction == previous_block.final_instruction + 1:
+            return self.fall_through[previous_block]
+        return Not(self.fall_through[previous_block])
+
+    def register_value(self, ssa_id):
+        """
+        Returns
+        -------
+        (value, uninitialized) : TYPE : (z3 BitVec or None, z3 Boolean or False)
+            The bitVec for an SSA id, and when it could still be holding nothing
+            (UNINITIALIZED never is, a phi function is uninitialized if it came in along an edge that was)
+        """
+        if ssa_id == UNINITIALIZED:
+            return None, BoolVal(True)
+        return self.reg_bv_table[ssa_id], self.phi_uninitialized.get(ssa_id, False)
+
+    def registers_before_block(self, block):
+        """
+        Returns
+        -------
+        reached : TYPE : z3 Boolean
+            When control can get to this block
+
+        registers : TYPE : List of (z3 BitVec or None, z3 Boolean or False)
+            Value of each register coming into the block, and when that register is still uninitialized
+        """
+        if block is self.start_block:
+            return BoolVal(True), [self.register_value(ssa_id) for ssa_id in block.register_names_before_block_executes]
+
+        incoming_edges = {}
+        for previous_block in self.block_graph.predecessors(block):
+            if previous_block not in self.reached:
+                raise ValueError(f'Block {block.name} is reached by a backward jump, which path merging can\'t handle yet')
+            incoming_edges[previous_block] = And(self.reached[previous_block], self.edge_condition(previous_block, block))
+        if len(incoming_edges) == 0:
+            return BoolVal(False), [(None, BoolVal(True)) for _ in range(self.num_regs)]
+
+        # Named, so the reached conditions of later blocks (and reading the path out of the model) 
+            # don't have to go back through every earlier block's condition
+        reached = Bool(f'reached_{block.block_id}')
+        self.constraints.append(reached == Or(list(incoming_edges.values())))
+
+        # Phi functions pick the incoming value from whichever edge was taken
+        for register_number, phi_id in block.phi_function_named_registers.items():
+            incoming = [(edge_taken, self.register_value(block.phi_function_operands[register_number].get(previous_block, UNINITIALIZED)))
+                        for previous_block, edge_taken in incoming_edges.items()]
+            merged_value = merge_register_values(incoming)
+            if merged_value is not None:
+                self.constraints.append(self.reg_bv_table[phi_id] == merged_value)
+            self.phi_uninitialized[phi_id] = merge_uninitialized(incoming)
+        return reached, [self.register_value(ssa_id) for ssa_id in block.register_names_before_block_executes]
+
+    def read_register(self, block, instruction, registers, register_number, reached):
+        value, uninitialized = registers[register_number]
+        if uninitialized is not False:
+            self.problems.append((block, instruction.instruction_number,
+                                  "Attempting to execute instruction using non-initialized register", And(reached, uninitialized)))
+        if value is None:
+            value = FreshConst(BitVecSort(self.reg_size), f'r{register_number}_uninitialized')
+        return value
+
+    def add_block(self, block):
+        self.reporter.block_start(block)
+        reached, registers = self.registers_before_block(block)
+        self.reached[block] = reached
+        for instruction in block.block_instructions:
+            self.reporter.instruction(instruction)
+            # An EXIT is always the last instruction of its block (see identify_leaders), there is nothing to add for it
+            if instruction.instruction_class == Instruction_Class.EXIT:
+                continue
+            if instruction.opcode == Jump_Condition.JA and instruction.instruction_class == Instruction_Class.JUMP:
+                self.fall_through[block] = BoolVal(False)
+                continue
+            if instruction.instruction_class in (Instruction_Class.LOAD, Instruction_Class.STORE):
+                # The memory model follows a single path (see Memory_Model.py), it isn't merged over joins yet
+                self.problems.append((block, instruction.instruction_number, 
+                                      "Memory instructions aren't supported when merging paths", reached))
+                if instruction.instruction_class == Instruction_Class.LOAD:
+                    registers[instruction.target_reg] = (self.reg_bv_table[instruction.target_reg_new_name], False)
+                continue
+            if instruction.input_value_is_const:
+                source_val = instruction.input_value_bitVec_Constant
+            else:
+                source_val = self.read_register(block, instruction, registers, instruction.input_value, reached)
+
+            if instruction.instruction_class == Instruction_Class.JUMP:
+                target_reg_val = self.read_register(block, instruction, registers, instruction.target_reg, reached)
+                try:
+                    self.fall_through[block] = fall_through_condition(instruction, target_reg_val, source_val)
+                    problem_message = "" if self.fall_through[block] is not None else "Jump keyword isn't a valid form for this program"
+                except Z3Exception:
+                    problem_message = "Attempting to execute instruction using an input value that doesn't fit in the register"
+                if problem_message:
+                    self.problems.append((block, instruction.instruction_number, problem_message, reached))
+                    self.fall_through[block] = BoolVal(True)
+                continue
+
+            target_reg_old_val = None
+            if instruction.opcode != ALU_Op.MOV:
+                target_reg_old_val = self.read_register(block, instruction, registers, instruction.target_reg, reached)
+            target_reg_new_val = self.reg_bv_table[instruction.target_reg_new_name]
+            try:
+                new_value = alu_operation(instruction, target_reg_old_val, source_val)
+                problem_message = "" if new_value is not None else "Keyword isn't a valid form for this program"
+                if new_value is not None:
+                    self.constraints.append(target_reg_new_val == new_value)
+            except Z3Exception:
+                problem_message = "Attempting to execute instruction using an input value that doesn't fit in the register"
+            if problem_message:
+                self.problems.append((block, instruction.instruction_number, problem_message, reached))
+            registers[instruction.target_reg] = (target_reg_new_val, False)
+
+        # Falling off the end of the program counts as an exit too
+        if len(block.output_links) == 0 or block.block_instructions[-1].instruction_class == Instruction_Class.EXIT:
+            self.exit_blocks.append(block)
+
+    def final_registers(self):
+        final_registers = []
+        for register_number in range(self.num_regs):
+            incoming = [(self.reached[block], self.register_value(block.register_names_after_block_executes[register_number]))
+                        for block in self.exit_blocks]
+            final_registers.append((merge_register_values(incoming), merge_uninitialized(incoming)))
+        return final_registers
+
+    def formula(self):
+        # The whole program (every path) as a single FOL formula
+        return And(self.constraints)
+
+def merge_register_values(incoming):
+    """
+    Parameters
+    ----------
+    incoming : TYPE : List of (z3 Boolean, (value, uninitialized))
+        When each incoming edge is taken, and the register along it
+
+    Returns
+    -------
+    merged_value : TYPE : z3 BitVec or None
+        If chain picking the register's value from whichever edge was taken (None if it is never initialized)
+    """
+    values = [(edge_taken, value) for edge_taken, (value, uninitialized) in incoming if value is not None]
+    if len(values) == 0:
+        return None
+    merged_value = values[-1][1]
+    for edge_taken, value in reversed(values[:-1]):
+        if not value.eq(merged_value):
+            merged_value = If(edge_taken, value, merged_value)
+    return merged_value
+
+def merge_uninitialized(incoming):
+    uninitialized = [And(edge_taken, uninitialized) for edge_taken, (value, uninitialized) in incoming if uninitialized is not False]
+    return Or(uninitialized) if uninitialized else False
+
+# Conditions are left as plain False when they can't happen, so they don't all need a trip through the model
+def condition_holds(model, condition):
+    if condition is False:
+        return False
+    return is_true(model.eval(condition, model_completion = True))
+
+def create_merged_program(instructions, num_regs = 4, reg_size = 8, inputs = [], cfg_backend = "networkx", reporter = None):
+    """
+    Same inputs and Verification_Result as create_program, but every path through the program
+        goes into one formula and the solver is only checked once (see the top of the file)
+    """
+    if reporter is None:
+        reporter = Silent_Reporter()
+    instruction_list = get_runtime_parameters(inputs)
+    instruction_list.extend(instructions)
+    reporter.program_listing(instruction_list)
+
+    start_time = time.time()
+    block_graph, reg_bitVec_table, start_block = \
+        basic_block_CFG_and_phi_function_setup(instruction_list, reg_size, num_regs, cfg_backend, build_ssa = True)
+    graph_made = time.time()
+
+    program = Merged_Program(block_graph, start_block, num_regs, reg_size, reg_bitVec_table, reporter)
+    try:
+        for block in program.blocks_in_program_order():
+            program.add_block(block)
+    except ValueError as backward_jump:
+        end_time = time.time()
+        result = Verification_Result(status = "error", error_message = str(backward_jump),
+                                     timings = {"cfg": graph_made - start_time, "formula": end_time - graph_made,
+                                                "solve": 0, "total": end_time - start_time},
+                                     number_of_instructions = len(instruction_list))
+        reporter.results(result)
+        return result
+    final_registers = program.final_registers()
+    formula_made = time.time()
+
+    solver = Solver()
+    solver.add(program.formula())
+    final_values, path, status = None, [], "unsat"
+    error_location, error_message = None, ""
+    if solver.check() == sat:
+        model = solver.model()
+        status = "sat"
+        for block in program.blocks_in_program_order():
+            if condition_holds(model, program.reached[block]):
+                path.append(block.initial_instruction)
+
+        # The first problem along the path stops the program, like it does in create_program
+        for block, instruction_number, problem_message, condition in program.problems:
+            if condition_holds(model, condition):
+                if error_location is None or instruction_number < error_location:
+                    error_location, error_message = instruction_number, problem_message
+        if error_location is not None:
+            status = "error"
+            path = [leader for leader in path if leader <= error_location]
+        else:
+            final_values = []
+            for value, uninitialized in final_registers:
+                if value is None or condition_holds(model, uninitialized):
+                    final_values.append(None)
+                else:
+                    final_values.append(model.eval(value, model_completion = True).as_long())
+    end_time = time.time()
+
+    result = Verification_Result(final_values, status, path, error_location, error_message,
+                                 {"cfg": graph_made - start_time, "formula": formula_made - graph_made,
+                                  "solve": end_time - formula_made, "total": end_time - start_time},
+                                 len(instruction_list))
+    reporter.results(result)
+    return result
@@ -18,7 +18,7 @@ networkX library -- https://networkx.github.io/documentation/stable/install.html
 z3Py library -- https://github.com/Z3Prover/z3
     pip install z3-solver
     
-time, copy, re  -- should be included with Python    
+time, re, sys  -- should be included with Python    
 
 
 ----------------------------------------------        
@@ -56,7 +56,89 @@ FOL_from_BPF:
         
         It will automatically place those ints in registers 1-5, but currently has no error checking
             for improper or extra inputs.
-       
+
+    create_program doesn't print anything on its own, it returns a Verification_Result holding
+        the final register values, sat/unsat status, the path of blocks taken, where the program broke
+        (if it did), and how long each step took.  Passing reporter = Console_Reporter() prints the
+        program, every block and instruction as it is checked, and the final values like it used to.
+
+    execute_concrete takes the exact same inputs as create_program, and returns the same 
+        Verification_Result, but runs the program on plain Python ints instead of
+        building z3 formulas.  Use it whenever every register gets its value from immediates (like all of
+        the SmartNic tests), it is around 100x faster.  If it finds a value it can't know concretely, 
+        it hands the program over to create_program on its own.
+        
+        Differential Testing Suite.py checks that the two always agree.
+
+Loops:
+
+    Jumps can have negative offsets, which jump backward and make a loop (JNEXC 1 0 -3 goes back to 2 instructions
+        before itself).  Loops.py finds the loops and their back edges, and create_program/execute_concrete
+        go around each loop up to loop_bound times (64 by default) every time it is entered:
+            create_program(instructions, 4, 64, loop_bound = 1000)
+        A loop that would run more than that breaks the program ("Loop ran more than 64 times").
+        create_merged_program doesn't handle loops.
+
+Bounded_Model_Checking:
+
+    Checks every path through a looping program at once, one block deeper at a time, in a single solver,
+        and stops as soon as the answer is known:
+            bounded_model_check(instructions, 4, 8, exit_property = lambda registers: ULE(registers[0], 21),
+                                symbolic_registers = (1,), max_depth = 200)
+        "violated" comes back with the path, final values and problem instruction of a counterexample,
+        "holds" means every path exited within result.depth blocks, and "unknown" means max_depth ran out first.
+        symbolic_registers start out holding any value, every other register starts uninitialized.
+        Memory instructions aren't supported here yet.
+
+K_Induction:
+
+    Proves the same kind of property for every number of loop trips, so a loop running thousands of times
+        (or a symbolic number of times) doesn't need thousands of frames:
+            k_induction(instructions, 4, 64, exit_property = lambda registers: UGE(registers[0], 4000))
+        Same results as bounded_model_check, plus result.depth is the smallest k that proved it, and result.proof
+        says whether that was "k-induction" or "every path exited".  Each inductive step check gets step_timeout
+        milliseconds (1000 by default), a step that runs out just moves on to the next k.
+
+Abstract_Interpretation:
+
+    create_program runs decide_jumps over the block CFG before walking it: a tnum (from Sammy's tnum.py) and
+        signed/unsigned bounds for every register, rerun around loops until nothing changes.  Jumps that always go
+        one way never reach the solver, only the rest do.  result.jumps_decided_statically and 
+        result.jumps_checked_by_solver show the split, and abstract_interpretation = False asks the solver every time.
+        tnum.py works on plain ints (fast, for this pass) or z3 BitVecs (for proofs) with the same methods, covering all of
+        kernel tnum.c.  Running it directly proves every operation sound with z3.
+
+Memory_Model:
+
+    The 512 byte stack and the context, for LDX/STX/ST.  Programs using them start with r10 holding the 
+        frame pointer and r1 the context pointer (so give them num_regs = 11 and reg_size = 64).
+        Accesses at known addresses (r10 plus a constant, even through other registers) are modeled byte by byte,
+        anything else switches memory over to a z3 Array.  Reading stack memory that was never written, or going
+        outside the stack and the context, breaks the program.  create_merged_program doesn't handle memory yet.
+
+BPF_Bytecode_Loader:
+
+    Loads compiled programs instead of keyword strings.  load_bpf_file takes either a clang compiled
+        object file (clang -target bpf -c prog.c -o prog.o, pick the program with section = "xdp" or similar
+        if there is more than one) or a raw array of 8 byte struct bpf_insn, and hands back a list that goes
+        straight into create_program, execute_concrete or create_merged_program like a keyword list would.
+
+    The 16 byte LD_IMM64 instruction comes in as LDDW, which can also be written by hand:
+        LDDW 1 1311768467463790320     --> Loads the whole 64 bit constant into register 1
+
+BPF_C_Macro_Extractor:
+
+    Pulls programs written with the kernel instruction macros (BPF_MOV64_IMM, BPF_ALU64_REG, BPF_JMP_IMM, ...)
+        out of C source, both struct bpf_insn prog[] = {...} arrays (like samples/bpf/sock_example.c) and
+        the .insns = {...} of the kernel verifier selftests.  #defines in the file are expanded first.
+
+        for program in scan_source_tree("linux/tools/testing/selftests/bpf"):
+            if program.instructions is not None:
+                create_program(program.instructions, 11, 64)
+
+    Programs with operands it can't work out (sizeof, offsetof, unknown names) come back with program.problem
+        set instead of instructions.  translate_to_bpf_in_c goes the other way, keyword program to macros.
+
 ----------------------------------------------        
 
 Input Expectations:
@@ -73,10 +155,21 @@ They are currently limited to a specific subset of the eBPF instruction set:
 Calculation Instructions:
     
     ADD  (Adding two values)
+    SUB  (Subtracting the source from the register)
+    MUL  (Multiplying two values)
+    DIV  (Unsigned division, dividing by 0 gives 0 like the kernel does)
+    MOD  (Unsigned modulo, modulo by 0 leaves the register alone)
+    AND, OR, XOR  (Bitwise operations)
+    NEG  (Negating the register, the source is ignored)
     MOV  (Moving a value into a register)
     LSH  (Left shifting a value, and placing it in a register)
     RSH  (Arithmetical right shifting of a value, and placing it in a register)
     LRSH (Logical right shifting of a value, and placing it in a register
+    END  (Byte order conversion, the immediate is the width (16, 32 or 64 bits) to keep:
+            END32XC converts to little endian (only cuts the value down), END32XY to big endian (swaps the bytes),
+            and END64XC always swaps)
+    
+    The keyword has to be written exactly, "ADDR64XC" or "XOR" spelled "OR" won't be mistaken for another operation.
     
 Branching Conditions (Jump instructions):
 
@@ -84,19 +177,33 @@ Branching Conditions (Jump instructions):
     JEQ  (jump if equal)
     JGT  (jump if greater than or equal)
     JSGT (jump if greater than or equal (signed))
+    JGE, JLT, JLE      (the rest of the unsigned comparisons)
+    JSGE, JSLT, JSLE   (the rest of the signed comparisons)
+    JSET (jump if the two values have any bits in common)
+    JA   (always jump, written as JA 0 0 {offset})
+    
+    A negative offset jumps backward (a loop, see Loops above).
+    
+    Any of them with 32 in the keyword (JEQ32XC, JSLT32XY...) only compare the low 32 bits of both sides.
+
+Memory Instructions ({size} is B, H, W or DW for 1, 2, 4 or 8 bytes):
+
+    LDX{size} dst src offset    (load from the address in src + offset into dst, zero extended)
+    STX{size} dst src offset    (store the low bytes of src at the address in dst + offset)
+    ST{size} dst imm offset     (store the low bytes of the immediate at the address in dst + offset)
 
 ****BIT SIZE****    
 Keywords can be used in either full 64 bit instructions (for any immediate/register values)
-or 32 bit instructons(for imm/register values) with one exception (ARSH32 is broken as of 9/3/20).
+or 32 bit instructons(for imm/register values).  32 bit instructions only use the low 32 bits of the
+registers, and zero the top 32 bits of the result, like the kernel's 32 bit subregisters.
 
 ****IMM/REGISTER OPERATION****
 To indicate a immediate value to register operation, use XC
 To indicate a register to register operation, use XY
 
-***Known Bug***
-This program will not do a 32 bit arithmetic rightshift operation correctly.
-As of right now, it will reference the 64th bit in the register to check for sign changes,
-    not the 32nd bit.  Someone should probably fix this. 
+***Fixed Bug***
+This program used to do 32 bit arithmetic rightshifts incorrectly, referencing the 64th bit in the 
+    register to check for sign changes, not the 32nd bit.  Fixed as of 10/18/26.
 
 All of the above instructions can be used with immediate integer or hex-valued inputs,
     or can reference a live register that has been activated by the previous instructions 
@@ -112,10 +219,12 @@ Examples:
     JNE64XC 1 -1 4  --> This compares the value stored in register 1 with the 64 bit value '-1'.
                             If they are not equal, the program skips the next 4 instructions
                         
-    ARSH32XY 3 2    --> DON'T DO THIS YET (ARSH32 is broken as of 9/3/20)
-                        When this works correctly, it will right shift the lower 32 bits
-                            of register 3 by 2 spaces and store the result in the 
+    ARSH32XC 3 2    --> This will arithmetically right shift the lower 32 bits
+                            of register 3 by 2 spaces (copying bit 31) and store the result in the 
                             lower 32 bits of register 3.
+                            
+    STXDW 10 3 -8   --> This spills all 64 bits of register 3 to the 8 bytes just below the frame pointer
+    LDXW 4 10 -8    --> This reads the low 32 bits of that spill back into register 4
 
 ----------------------------------------------     
    
@@ -125,19 +234,22 @@ Lets use test 1 and test 13 from the smartnic testing suite.
     (https://github.com/smartnic/superopt/blob/master/src/isa/ebpf/inst_test.cc)
     
 I've directly copied it from the code, comments and all, but removed the line breaks only.
-    FOL_from_BPF has a small regular expression translator which will strip out superflous
+    translate_smartnic_to_python_stars_comments (SmartNic_Parser.py) will strip out superflous
     information and output the string in our prefered keyword strings. 
-    It works fine for /**/ comment blocks, but cannot handle // comments yet.
+    It handles /**/ and // comments and line breaks, so whole files work too:
+        with open("inst_test.cc") as test_file:
+            for program in iter_smartnic_programs(test_file):
+                create_program(program, 2, 64)
 
 from FOL_from_BPF import *
 print("-"*20)
 instructions1 = "{inst(MOV64XC, 0, 0xffffffff),  /* mov64 r0, 0xffffffff */                         inst(ADD64XY, 0, 0),           /* add64 r0, r0 */                         inst(EXIT),                    /* exit, return r0 */                        };"
 new_inst = translate_smartnic_to_python_stars_comments(instructions1)
-create_program(new_inst, 2, 64)
+create_program(new_inst, 2, 64, reporter = Console_Reporter())
 print("-"*20)
 instructions13 = "{inst(MOV32XC, 0, -1),         /* r0 = 0xffffffff */                          inst(JGTXC, 0, 0, 1),         /* if r0 <= 0, ret r0 = 0xffffffff */                          inst(EXIT),                          inst(MOV64XC, 1, -1),         /* else r1 = 0xffffffffffffffff */                          inst(JGTXY, 1, 0, 1),         /* if r1 <= r0, ret r0 = 0xffffffff */                          inst(EXIT),                          inst(MOV64XC, 0, 0),          /* else r0 = 0 */                          inst(EXIT),                   /* exit, return r0 */                         };"
 new_inst = translate_smartnic_to_python_stars_comments(instructions13)
-create_program(new_inst, 2, 64)
+create_program(new_inst, 2, 64, reporter = Console_Reporter())
 print("-"*20)
 
 The program would output the following:
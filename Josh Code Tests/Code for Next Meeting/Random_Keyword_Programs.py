@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:06:28 2026
+
+@author: joshc
+
+Same idea as Random_Program_Creation in Non Meeting Stuff, but writing programs in the
+    current keyword form used by FOL_from_BPF (MOV64XC 1 5, JNEXY 2 1 3, ...)
+
+The same three constraints are kept on every program.
+    1) The first instructions are mov commands to initialize every register
+    2) The second to last instruction cannot be a jump, since the offset would
+        make it reference outside the instruction list
+    3) The last command is an exit command
+
+Initializing everything up front (instead of as registers get picked) means a jump can't skip over
+    the only mov into a register, so every program runs all the way through without hitting
+    uninitialized registers.
+
+random_loop_program wraps the same kind of instructions in a counted loop (a backward jump), with the last
+    register as the loop counter, which nothing else in the body writes to.
+"""
+import random
+
+alu_keywords = ["ADD", "SUB", "MUL", "DIV", "MOD", "AND", "OR", "XOR", "NEG", "MOV", "LSH", "RSH", "ARSH", "END"]
+shift_keywords = ["LSH", "RSH", "ARSH"]
+jump_keywords = ["JNE", "JEQ", "JGT", "JSGT", "JGE", "JSGE", "JLT", "JLE", "JSLT", "JSLE", "JSET", "JA"]
+
+def random_source(number_of_registers):
+    """
+    Returns
+    -------
+    source_value : TYPE : Int
+        A 32 bit immediate, or a register number
+
+    source_kind : TYPE : String
+        XC for immediates, XY for registers
+    """
+    if random.randint(0, 2) == 2:
+        return random.randint(0, number_of_registers - 1), "XY"
+    return random.randint(-2 ** 31, 2 ** 31 - 1), "XC"
+
+def random_alu_instruction(number_of_registers, destinations):
+    keyword = random.choice(alu_keywords)
+    bit_size = random.choice(["32", "64"])
+    if keyword in shift_keywords:
+        source_value, source_kind = random.randint(0, 63 if bit_size == "64" else 31), "XC"
+    elif keyword == "END":
+        # The immediate is the width to convert, XC/XY picks little/big endian (the 64 bit form always swaps, only as XC)
+        source_value, source_kind = random.choice([16, 32, 64]), random.choice(["XC", "XY"]) if bit_size == "32" else "XC"
+    else:
+        source_value, source_kind = random_source(number_of_registers)
+    destination = random.randint(0, destinations - 1)
+    return f'{keyword}{bit_size}{source_kind} {destination} {source_value}'
+
+def random_loop_program(body_size, number_of_registers, seed = None, most_trips = 8):
+    """
+    Parameters
+    ----------
+    body_size : TYPE : int
+        How many random instructions go inside the loop
+
+    number_of_registers : TYPE : int
+        How many registers the program can manipulate (the last one counts the loop down)
+
+    seed : TYPE : int, optional
+        Seed for the random choices, so a program can be made again
+
+    most_trips : TYPE : int, optional
+        The loop body runs between 1 and most_trips times
+
+    Returns
+    -------
+    instruction_list : TYPE : List of Strings
+        Keyword form instructions, ready for create_program with 64 bit registers
+    """
+    if seed is not None:
+        random.seed(seed)
+    counter = number_of_registers - 1
+    instruction_list = [f'MOV64XC {register} {random.randint(-2 ** 31, 2 ** 31 - 1)}' for register in range(counter)]
+    instruction_list.append(f'MOV64XC {counter} {random.randint(1, most_trips)}')
+    body = []
+    for instruction_number in range(body_size):
+        instructions_left = body_size - instruction_number - 1
+        if instructions_left > 0 and random.randint(0, 5) == 0:
+            # Forward jumps stay inside the body, so they can't skip the counter
+            source_value, source_kind = random_source(number_of_registers)
+            keyword = random.choice(jump_keywords[:-1])
+            body.append(f'{keyword}{source_kind} {random.randint(0, counter)} {source_value} {random.randint(1, instructions_left)}')
+        else:
+            body.append(random_alu_instruction(number_of_registers, counter))
+    instruction_list += body
+    instruction_list += [f'SUB64XC {counter} 1', f'JNEXC {counter} 0 {-(body_size + 2)}', "EXIT"]
+    return instruction_list
+
+def random_keyword_program(number_of_instructions, number_of_registers, seed = None):
+    """
+    Parameters
+    ----------
+    number_of_instructions : TYPE : int
+        How many instructions the program will have (at least number_of_registers + 1)
+
+    number_of_registers : TYPE : int
+        How many registers the program can manipulate
+
+    seed : TYPE : int, optional
+        Seed for the random choices, so a program can be made again
+
+    Returns
+    -------
+    instruction_list : TYPE : List of Strings
+        Keyword form instructions, ready for create_program with 64 bit registers
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    instruction_list = [f'MOV64XC {register} {random.randint(-2 ** 31, 2 ** 31 - 1)}' 
+                        for register in range(number_of_registers)]
+
+    for instruction_number in range(number_of_registers, number_of_instructions - 1):
+        instructions_left = number_of_instructions - instruction_number - 2
+        if instructions_left > 0 and random.randint(0, 3) == 0:
+            keyword = random.choice(jump_keywords)
+            source_value, source_kind = random_source(number_of_registers)
+            destination = random.randint(0, number_of_registers - 1)
+            offset = random.randint(1, instructions_left)
+            if keyword == "JA":
+                instruction_list.append(f'JA 0 0 {offset}')
+            else:
+                # JMP32 jumps only compare the low 32 bits
+                bit_size = random.choice(["", "32"])
+                instruction_list.append(f'{keyword}{bit_size}{source_kind} {destination} {source_value} {offset}')
+            continue
+
+        instruction_list.append(random_alu_instruction(number_of_registers, number_of_registers))
+
+    instruction_list.append("EXIT")
+    return instruction_list
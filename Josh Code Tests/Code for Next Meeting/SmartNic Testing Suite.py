@@ -41,10 +41,10 @@ for instruction in test_list_with_stars[4:]:
 
 for num, instruction in enumerate(tests_1_to_4, 1):
     print("*"*20+f"\nInstruction Test #{num}\n")
-    create_program(instruction, 2, 64)
+    create_program(instruction, 2, 64, reporter = Console_Reporter())
 for num, instruction in enumerate(tests_11_to_15, 11):
     print("*"*20+f"\nInstruction Test #{num}\n")
-    create_program(instruction, 2, 64)
+    create_program(instruction, 2, 64, reporter = Console_Reporter())
 
 """
 Test 1:
@@ -71,8 +71,8 @@ Test 11:
     Expected:   r0 =    0x7fffffff (hex)
                         2147483647 (decimal)
 Test 12:
-    Output:     r0 =    2147483647 (decimal)
-                        0x7fffffff (hex)
+    Output:     r0 =    4294967295 (decimal)
+                        0xffffffff (hex)
                         
     Expected:   r0 =    0xffffffff (hex)
                         4294967295 (decimal)
@@ -89,9 +89,10 @@ Test 15:
     Output:     r0 =    0
     Expected:   r0 =    0  
 
-Passed: 8
+Passed: 9
 Attempted: 9    
 
-Reasons for Failed Tests:
-    12) problems with arsh32 taking the front bit of the 64bit register value, not the 32 bit value
+Fixed Tests:
+    12) arsh32 used to take the front bit of the 64bit register value, not the 32 bit value
+        (32 bit instructions now work on a real 32 bit subregister, fixed 10/18/26)
 """
\ No newline at end of file
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:13:26 2026
+
+@author: joshc
+
+Reads programs written as SmartNic superopt inst(...) calls
+    (https://github.com/smartnic/superopt/blob/master/src/isa/ebpf/inst_test.cc), like
+        inst p[] = {inst(MOV64XC, 0, 0xffffffff),  // mov64 r0, 0xffffffff
+                    inst(EXIT),                    /* exit, return r0 */
+                   };
+
+    translate_smartnic_to_python_stars_comments used to strip /* */ comments with one regular expression
+        over a single line string, so // comments, comments holding a *, and line breaks all broke it.
+
+    This goes one line at a time instead (from a string, or straight from an open file), through a tokenizer that
+        understands both comment styles (a /* */ comment can run over any number of lines) and skips string literals.
+        Everything is a generator, so a whole inst_test.cc sized file is never held as a list of strings:
+
+        smartnic_tokens             Every word/number/punctuation token outside of comments
+        iter_smartnic_arguments     (program number, [keyword, operand text, ...]) for each inst(...) call
+        iter_smartnic_instructions  (program number, Decoded_Instruction) for each inst(...) call, ready for create_program
+        iter_smartnic_programs      One list of Decoded_Instructions per {...} holding inst(...) calls
+
+Operand order
+    Most superopt instructions take (dst, src, offset), the same as our keyword form.
+    Stores are inst(ST*/STX*, dst, offset, src), so their operands are moved around to the
+        "STX{size} dst src offset" order BPF_Bytecode_Loader uses, JA's only operand is its offset,
+        and CALL's is the helper function number.
+"""
+import io, re, itertools
+from Basic_Block_CFG_Creator import *
+
+# Whole /* */ comments on one line, // comments and string/char literals come back from findall as "",
+    # and the only things kept are the start of a comment that runs onto later lines ("/*"), 
+    # words/numbers (with any sign) and the punctuation around inst(...) calls
+token_pattern = re.compile(r'/\*.*?\*/|//.*|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|(/\*|[-+\w]+|[(),{};])')
+
+def source_lines(source):
+    # Strings are read through StringIO, so even a huge string is only ever looked at one line at a time
+    if isinstance(source, str):
+        return io.StringIO(source)
+    return source
+
+def smartnic_tokens(source):
+    """
+    Parameters
+    ----------
+    source : TYPE : String, or anything giving lines of text (an open file)
+
+    Yields
+    ------
+    token : TYPE : String
+        Each token outside of comments and literals, in order
+    """
+    in_comment = False
+    for line in source_lines(source):
+        if in_comment:
+            comment_end = line.find("*/")
+            if comment_end == -1:
+                continue
+            in_comment = False
+            line = line[comment_end + 2:]
+        for token in token_pattern.findall(line):
+            if token == "/*":
+                # No */ later on this line (the whole comment pattern would have matched instead)
+                in_comment = True
+                break
+            if token:
+                yield token
+
+def iter_smartnic_arguments(source):
+    """
+    Yields
+    ------
+    (program_number, arguments) : TYPE : (Int, List of strings)
+        The keyword and operands of one inst(...) call, as written (operand order is left alone).
+        Program numbers count up every time a } closes a group holding inst(...) calls.
+    """
+    program_number = 0
+    found_instruction = False
+    previous_token = None
+    tokens = smartnic_tokens(source)
+    for token in tokens:
+        # "inst" is also the type name in "inst p[] = {...}", only inst followed by ( is an instruction
+        if token == "(" and previous_token == "inst":
+            arguments, argument = [], ""
+            for token in tokens:
+                if token == ")":
+                    break
+                if token == ",":
+                    arguments.append(argument)
+                    argument = ""
+                else:
+                    argument += token
+            if argument:
+                arguments.append(argument)
+            found_instruction = True
+            yield program_number, arguments
+        elif token == "}" and found_instruction:
+            program_number += 1
+            found_instruction = False
+        previous_token = token
+
+def keyword_operands(arguments):
+    """
+    Parameters
+    ----------
+    arguments : TYPE : List of strings
+        From iter_smartnic_arguments
+
+    Returns
+    -------
+    TYPE : List of strings
+        The same arguments in keyword form order (target register, input value, offset), see the top of the file
+    """
+    keyword = arguments[0]
+    if keyword.startswith("ST") and len(arguments) == 4:
+        return [keyword, arguments[1], arguments[3], arguments[2]]
+    if keyword == "JA":
+        return [keyword, "0", "0"] + arguments[1:]
+    if keyword == "CALL":
+        return [keyword, "0"] + arguments[1:]
+    return arguments
+
+def iter_smartnic_instructions(source):
+    """
+    Yields
+    ------
+    (program_number, instruction) : TYPE : (Int, Decoded_Instruction)
+        Every inst(...) call, already split up, so Instruction_Info has nothing left to parse
+    """
+    for program_number, arguments in iter_smartnic_arguments(source):
+        arguments = keyword_operands(arguments)
+        try:
+            operands = [get_input_value(operand) for operand in arguments[1:4]]
+        except ValueError:
+            raise ValueError(f'inst({", ".join(arguments)}) in program {program_number} has an operand that isn\'t a number')
+        operands += [0] * (3 - len(operands))
+        yield program_number, Decoded_Instruction(arguments[0], *operands)
+
+def iter_smartnic_programs(source):
+    """
+    Yields
+    ------
+    program_list : TYPE : List of Decoded_Instructions
+        One whole program at a time, for create_program (or any other keyword program function)
+    """
+    for program_number, program in itertools.groupby(iter_smartnic_instructions(source), key = lambda numbered: numbered[0]):
+        yield [instruction for program_number, instruction in program]
+
+def translate_smartnic_to_python_stars_comments(instruction_input):
+    """
+    Parameters
+    ----------
+    instruction_input : TYPE : String (or open file)
+        A single program, "{inst(MOV64XC, 0, 0xffffffff), /* comments */ inst(EXIT),};"
+
+    Returns
+    -------
+    TYPE : List of strings
+        The first program in keyword form, operands written the same way they were in the inst(...) calls
+    """
+    program = next(itertools.groupby(iter_smartnic_arguments(instruction_input), key = lambda numbered: numbered[0]), (0, []))[1]
+    return [" ".join(keyword_operands(arguments)) for program_number, arguments in program]
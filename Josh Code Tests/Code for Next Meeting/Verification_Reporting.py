@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:24:48 2026
+
+@author: joshc
+
+What create_program/execute_concrete hand back, and how (or if) they print while running.
+
+Verification_Result
+    Everything found about one run of a program, as data:
+        final_values        List of ints (None for uninitialized registers), None unless the path was sat
+        status              "sat", "unsat", "error" (an instruction broke the program),
+                                or "crash" (the verifier itself threw, only from verify_many)
+        path                Leader instruction numbers of the basic blocks visited, in order
+        error_location      Instruction number that broke the program (None if nothing did)
+        error_message       What went wrong at error_location
+        timings             Seconds spent in each phase ("cfg", "formula", "solve" for z3, and always "total")
+
+Reporters
+    Printing every instruction, block transition and register takes a real share of the runtime on
+        large programs, so nothing prints unless a reporter is passed in.
+    Silent_Reporter (the default) ignores everything, Console_Reporter prints the same running
+        commentary create_program always used to.
+"""
+
+class Verification_Result:
+    def __init__(self, final_values = None, status = "error", path = None, error_location = None,
+                 error_message = "", timings = None, number_of_instructions = 0):
+        self.final_values = final_values
+        self.status = status
+        self.path = path if path is not None else []
+        self.error_location = error_location
+        self.error_message = error_message
+        self.timings = timings if timings is not None else {"total": 0}
+        self.number_of_instructions = number_of_instructions
+
+        # Position in the input list, only set by verify_many
+        self.program_number = None
+
+    def __str__(self):
+        summary = f'{self.status} after {len(self.path)} blocks, final values {self.final_values}'
+        if self.error_location is not None:
+            summary += f', broke at instruction {self.error_location}: {self.error_message}'
+        return summary + ' (%0.3f seconds)' %(self.timings["total"])
+
+# Names for the phases in Verification_Result.timings, as printed after the total
+timing_labels = {"cfg": 'Time to make CFG: \t\t', "formula": 'Time to create FOL: \t', "solve": 'Time to Evaluate: \t\t'}
+
+class Silent_Reporter:
+    def program_listing(self, instruction_list):
+        pass
+
+    def block_start(self, block):
+        pass
+
+    def instruction(self, instruction):
+        pass
+
+    def instruction_problem(self, instruction, problem_message):
+        pass
+
+    def stopping_early(self, block):
+        pass
+
+    def control_moves(self, block):
+        pass
+
+    def concrete_fallback(self):
+        pass
+
+    def results(self, result):
+        pass
+
+class Console_Reporter(Silent_Reporter):
+    def __init__(self, output = None):
+        """
+        Parameters
+        ----------
+        output : TYPE : file object, optional
+            Where to print to.  The default None is sys.stdout
+        """
+        self.output = output
+
+    def program_listing(self, instruction_list):
+        print(f'Number of Instructions: {len(instruction_list)}', file = self.output)
+        print("The full program in Python keyword format is:\n", file = self.output)
+        for number, ins in enumerate(instruction_list):
+            print ("\t"+ str(number) + ":\t" + str(ins), file = self.output)
+
+    def block_start(self, block):
+        print(f'\nAdding instructions in block: {block.name}', file = self.output)
+
+    def instruction(self, instruction):
+        print(f'\tChecking Instruction: {instruction.instruction_number}: {instruction.full_instruction}', file = self.output)
+
+    def instruction_problem(self, instruction, problem_message):
+        if problem_message:
+            print(f'\n***  {problem_message}  ***', file = self.output)
+        print(f'-->  Instruction {instruction.instruction_number} caused a problem, and broke the program  <--', file = self.output)
+
+    def stopping_early(self, block):
+        print(f'-->  Stopping program run early in block {block.name}  <--', file = self.output)
+
+    def control_moves(self, block):
+        print(f'Control moves to block: {block.name}', file = self.output)
+
+    def concrete_fallback(self):
+        print("***  Program has values that aren't concrete, evaluating it with z3 instead  ***", file = self.output)
+
+    def results(self, result):
+        if result.status in ["sat", "unsat"]:
+            print("\n--> Program Results <--", file = self.output)
+        if result.status == "sat":
+            print("\tModel found the following results:", file = self.output)
+            for reg_num, value in enumerate(result.final_values):
+                if value is not None:
+                    print(f'\t\tFinal Value for Register {reg_num}: {value}', file = self.output)
+                else:
+                    print(f'\t\tFinal Value for Register {reg_num}: Not Initialized', file = self.output)
+        elif result.status == "unsat":
+            print ("Model couldn't find a solution for the program: \n\tUNSATISFIABLE", file = self.output)
+
+        print('--> Total Run Time: \t\t%0.3f seconds <--' %(result.timings["total"]), file = self.output)
+        for phase, label in timing_labels.items():
+            if phase in result.timings:
+                print(f'--> {label}%0.3f seconds <--' %(result.timings[phase]), file = self.output)
@@ -3,17 +3,20 @@
 Created on Sat Aug  8 20:38:59 2020
 
 @author: joshc
+
+Dominators and dominance frontiers come from Dominators.py in Code for Next Meeting
+    (iterative Cooper-Harvey-Kennedy), instead of listing every path through the program
 """
-import time
+import os, sys, time
 from collections import defaultdict 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Code for Next Meeting"))
+from Dominators import *
 
 class Node_Info:
     def __init__ (self, instruction, number):
         self.full_instruction = instruction
         self.node_number = number
         self.pred_nodes = []
-        self.pred_set = set()
-        self.paths_to_node = []
         self.dominated_by = set()
         self.dominance_frontier_nodes = set()
         self.phi_func = []
@@ -36,13 +39,6 @@ class Node_Info:
         print(f'Instruction: {self.full_instruction}')
         print(f'Source: {self.input_value}\tTarget: {self.target_reg}')
         # print(f'Direct Pred Nodes: {self.pred_nodes}')
-        # print(f'Pred node Set: {self.pred_set}')
-        # print(f'Paths to Node: {len(self.paths_to_node)}')
-        # for path in self.paths_to_node:
-        #     print("New Path:")
-        #     for node in path:
-        #         print(node, end = " ")
-        #     print()    
         # print(f'Dominator Nodes: {self.dominated_by}')
         print(f'Dominance Frontier: {self.dominance_frontier_nodes}')
         print(f'{self.phi_func}')
@@ -53,31 +49,18 @@ class Node_Info:
 class Graph: 
     def __init__(self): 
         self.graph = defaultdict(list)  
+        self.reverse_graph = defaultdict(list)
    
     def addEdge(self, start, end): 
         self.graph[start].append(end) 
+        self.reverse_graph[end].append(start)
     
-    """Modified Backtracking algo, code from https://www.python.org/doc/essays/graphs/
-    
-    This code blows up if tracing more than 64 instructions.  Figure out a better 
-        way to find sub paths.  Either use tail recursion, or some type of 
-        memoization of past paths.
+    # What Dominators.py needs to walk the graph
+    def successors(self, node):
+        return self.graph[node]
     
-    Depending on how monday meeting goes, will optimize more in future, tonight's focus
-        is still on getting the phi function placement to work'
-    """
-    def find_all_paths(self, start, end, path=[]):
-        path = path + [start]
-        if start == end:
-            return [path]
-        
-        paths = []
-        for node in self.graph[start]:
-            if node not in path:
-                newpaths = self.find_all_paths(node, end, path)
-                for newpath in newpaths:
-                    paths.append(newpath)
-        return paths        
+    def predecessors(self, node):
+        return self.reverse_graph[node]
         
 # Define what nodes can be reached from another node
 def find_all_edges(node_list):
@@ -91,37 +74,19 @@ def find_all_edges(node_list):
     return node_list
 
 
-def establish_dominators(node_list): 
+def instruction_graph(node_list):
     g = Graph()
     for node in node_list:
         for pred_node in node.pred_nodes:
             # print(f'Adding edge from s: {pred_node} to d: {node.node_number}')
             g.addEdge(pred_node, node.node_number)
-    # print()
-            
-    # Find out what paths lead to a specific node from the initial node
-    for d, node in enumerate(node_list):
-        node.paths_to_node = g.find_all_paths(0, d)
-    
-    # Using all possible paths, get the set of dominator nodes and predecessor nodes
-    for node in node_list:
-        sets_from_paths = []
-        for path in node.paths_to_node:
-            sets_from_paths.append(set(path))
-        node.dominated_by = set.intersection(*sets_from_paths)
-        node.pred_set = set.union(*sets_from_paths)
-        node.pred_set.remove(node.node_number)
-    
-    return node_list
+    return g
 
-# Find the dominance frontier of each node
-def node1_sdom_node2_check(node1, node2):
-    """
-    Checking if node1 sdom node2 for use in Dominance Frontier selection
-    
-    ie, return True if node1 is in the dominator set of node 2, and node1 == node 2
-    """
-    return (node1.node_number in node2.dominated_by) and (node1.node_number != node2.node_number)  
+def establish_dominators(node_list): 
+    # Nodes that can't be reached from node 0 aren't dominated by anything
+    for node_number, dominated_by in dominators(instruction_graph(node_list), 0).items():
+        node_list[node_number].dominated_by = dominated_by
+    return node_list
     
 def find_dominance_frontier(node_list):
     """
@@ -130,21 +95,11 @@ def find_dominance_frontier(node_list):
         DF(node D) = {N | There exists a node Pred, which is a predecessor of node N such that
                  node D dominates node Pred, and node d doesn't strictly dominate node N'}
         
-        The predecessor nodes of node N would be any node on a path that leads to N
-        So after establishing path, we should also take the union of the paths to be searched
-        
+    Found by walking up the dominator tree from the preds of every join node (see Dominators.py),
+        instead of checking every pair of nodes against every path
     """
-    # Finding the dominance frontier of checking_node (node D)
-    for checking_node in node_list:
-
-        # possible_DF_Node  is node N
-        for possible_DF_node in node_list:
-            
-            if not node1_sdom_node2_check(checking_node, possible_DF_node):
-                # Check the prednode set for any node that is dominated by checking_node
-                for node in possible_DF_node.pred_set:
-                    if checking_node.node_number in node_list[node].dominated_by:
-                        checking_node.dominance_frontier_nodes.add(possible_DF_node.node_number)
+    for node_number, frontier in dominance_frontiers(instruction_graph(node_list), 0).items():
+        node_list[node_number].dominance_frontier_nodes = frontier
     return node_list
 
 # Do the whole Phi Function Algo
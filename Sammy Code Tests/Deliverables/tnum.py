@@ -25,25 +25,54 @@ The actual tnum.c code instead uses 'value' for min, and 'mask' for range. Whens
 starting out, I continued to use min and range because they were conducive to my
 understanding. As time progressed, I began to use mask and value every so often
 so that it's easier to translate back and forth between this and the source code.
+
+Two backends, one source
+  min and range can be plain Python ints or z3 BitVecs, and every method works on
+  either one. Ints are what the abstract interpreter (Abstract_Interpretation.py)
+  runs on, since it only needs the answer and z3 terms are 40-200 times slower to build
+  (report_tnum_throughput in the Runtime Testing Suite).
+  z3 terms are what the soundness proofs at the bottom of the file run on.
+
+  The width comes from the BitVecs (their size), or from the width argument for ints
+  (64 by default, an eBPF register). Int tnums are cut back down to width bits every
+  time one is made, so they wrap around exactly like the BitVecs (and like the u64s in tnum.c).
+
+  Everything from kernel/bpf/tnum.c is here: tnum_const, tnum_range and tnum_unknown
+  make tnums, and the rest are methods (add, sub, mult, the bitwise ops, shifts,
+  arshift, cast, the subreg ops, intersect, union and tnum_in). mult is the current
+  kernel tnum_mul (the one that only adds the masks up), not the hma version.
 '''
 from z3 import *
 
-#throughout the project we will assume every bitvector is of this length
-bitLength = 4
-
 class tnum:
-
-    #INPUT - both fields should be BitVec/BitVecVal
-    def __init__(self, m, r):
+    __slots__ = ("min", "range", "width")
+
+    #INPUT - both fields are ints, or BitVec/BitVecVal (an int next to a BitVec is turned into a BitVecVal)
+    #        width is only used for ints, BitVecs already have a size
+    def __init__(self, m, r, width = 64):
+        if isinstance(m, BitVecRef) or isinstance(r, BitVecRef):
+            width = m.size() if isinstance(m, BitVecRef) else r.size()
+            if not isinstance(m, BitVecRef):
+                m = BitVecVal(m, width)
+            if not isinstance(r, BitVecRef):
+                r = BitVecVal(r, width)
+        else:
+            full = (1 << width) - 1
+            m &= full
+            r &= full
         self.min = m
         self.range = r
+        self.width = width
 
     #not actually aware of when this method is used
     def __str__(self):
         return "<min: " + str(self.min) + ", range: " + str(self.range) + ">"
 
+    #RETURN - True if this tnum is made of z3 terms instead of ints
+    def is_symbolic(self):
+        return isinstance(self.min, BitVecRef)
 
-    #RETURN - a z3 expression for whether this is a valid tnum
+    #RETURN - a z3 expression (or a bool for ints) for whether this is a valid tnum
     def validate(self):
         """
         intended result: every 1-bit of self.range is a 0-bit in self.min
@@ -57,28 +86,47 @@ class tnum:
         unknownCheck = self.min & ~self.range
         return self.min == unknownCheck
 
-        
-    #ACTION - does a logical shift left on both the min and the range of this tnum
+    #RETURN - this tnum shifted left by i (a new tnum, this one isn't changed)
     def lshift(self, i):
-        self.min <<= i
-        self.range <<= i
-        
-    #ACTION - does a logical shift right on both the min and the range of this tnum
+        return tnum(self.min << i, self.range << i, self.width)
+
+    #RETURN - this tnum logically shifted right by i (a new tnum, this one isn't changed)
     def rshift(self, i):
-        LShR(self.min, i)
-        LShR(self.range, i)
+        return tnum(logical_rshift(self.min, i), logical_rshift(self.range, i), self.width)
+
+    #RETURN - this tnum arithmetically shifted right by i, for a 64 bit ALU instruction (insn_bitness = width)
+    #         or a 32 bit one (only the low 32 bits are shifted, and the result is zero extended)
+    def arshift(self, i, insn_bitness = None):
+        """
+        Shifting the value and the mask by the same amount works because the sign bit is copied down:
+            if the sign bit is known, the mask copies a 0 and the value copies the sign,
+            if it's unknown, the mask copies 1s and every copied bit is unknown
+        """
+        if insn_bitness is None or insn_bitness > self.width:
+            insn_bitness = self.width
+        return tnum(signed_rshift(self.min, i, insn_bitness), signed_rshift(self.range, i, insn_bitness), self.width)
 
-    #RETURN - a z3 expression for if this tnum is a constant (range/mask is 0)
+    #RETURN - a z3 expression (or a bool) for if this tnum is a constant (range/mask is 0)
     def is_const(self):
         return self.range == 0
 
-    #RETURN - a z3 expression for if this tnum is both a constant and equal to a specific constant
+    #RETURN - a z3 expression (or a bool) for if this tnum is both a constant and equal to a specific constant
     def eq_const(self, c):
-        return And(self.is_const(), self.min == c)
+        return both(self.is_const(), self.min == c)
+
+    #RETURN - a z3 expression (or a bool) for if every bit is unknown
+    def is_unknown(self):
+        return self.range == (1 << self.width) - 1
 
-    #RETURN - a z3 expression for if this tnum is equal to another tnum. Don't use == !!!
+    #RETURN - a z3 expression (or a bool) for if this tnum is equal to another tnum. Don't use == !!!
     def tnum_eq(self, other):
-        return And(self.min == other.min, self.range == other.range)
+        return both(self.min == other.min, self.range == other.range)
+
+    #RETURN - a z3 expression (or a bool) for if every value this tnum can hold is a multiple of size (a power of 2)
+    def is_aligned(self, size):
+        if not size:
+            return True
+        return ((self.min | self.range) & (size - 1)) == 0
 
     #INPUT - another tnum
     #RETURN - the sum of this tnum and the other input
@@ -102,31 +150,70 @@ class tnum:
         sm = self.range + other.range
         sv = self.min + other.min
 
-        sigma = self.range + self.min + other.range + other.min
+        sigma = sm + sv
         chi = sigma ^ sv
         mu = chi | self.range | other.range
-        
-        return tnum(sv & (~mu), mu)
+
+        return tnum(sv & (~mu), mu, self.width)
 
     #INPUT - another tnum
     #RETURN - this tnum minus the other given tnum
     def sub(self, other):
-        dv = self.min - other.min;
-        
+        dv = self.min - other.min
+
         alpha = dv + self.range
         beta = dv - other.range
         chi = alpha ^ beta
         mu = chi | self.range | other.range
 
-        return tnum(dv & (~mu), mu)
+        return tnum(dv & (~mu), mu, self.width)
 
-    #If erroring, look at the hma subfunction first
     #INPUT - another tnum
     #RETURN - this tnum multiplied by the other given tnum
     def mult(self, other):
-        pi = self.min * other.min
-        acc = hma(tnum(pi, 0), self.range, other.range | other.min)
-        return hma(acc, other.range, self.min)
+        """
+        The current kernel tnum_mul: the known parts are multiplied once (acc_v), and the masks are added up
+            bit by bit of self (acc_m), so there is only one add per bit instead of two like hma had.
+
+        original code:
+
+        struct tnum tnum_mul(struct tnum a, struct tnum b)
+            u64 acc_v = a.value * b.value;
+            struct tnum acc_m = TNUM(0, 0);
+
+            while (a.value || a.mask) {
+                if (a.value & 1)
+                    acc_m = tnum_add(acc_m, TNUM(0, b.mask));
+                else if (a.mask & 1)
+                    acc_m = tnum_add(acc_m, TNUM(0, b.value | b.mask));
+                a = tnum_rshift(a, 1);
+                b = tnum_lshift(b, 1);
+            }
+            return tnum_add(TNUM(acc_v, 0), acc_m);
+
+        z3 terms can't be checked for zero while building, so they go around all width times,
+            with If picking the add (once a runs out of bits, neither add happens)
+        """
+        a, b = self, other
+        acc_v = a.min * b.min
+        acc_m = tnum(0, 0, self.width)
+        if not self.is_symbolic() and not other.is_symbolic():
+            while a.min or a.range:
+                if a.min & 1:
+                    acc_m = acc_m.add(tnum(0, b.range, self.width))
+                elif a.range & 1:
+                    acc_m = acc_m.add(tnum(0, b.min | b.range, self.width))
+                a = a.rshift(1)
+                b = b.lshift(1)
+        else:
+            for _ in range(self.width):
+                known_one = Extract(0, 0, a.min) == 1
+                unknown = Extract(0, 0, a.range) == 1
+                added = acc_m.add(tnum(0, If(known_one, b.range, b.min | b.range), self.width))
+                acc_m = tnum(If(Or(known_one, unknown), added.min, acc_m.min), If(Or(known_one, unknown), added.range, acc_m.range))
+                a = a.rshift(1)
+                b = b.lshift(1)
+        return tnum(acc_v, 0, self.width).add(acc_m)
 
     #INPUT - another tnum
     #RETURN - the logical AND of this tnum and another tnum
@@ -134,51 +221,84 @@ class tnum:
         alpha = self.min | self.range
         beta = other.min | other.range
         v = self.min & other.min
-        return tnum(v, alpha & beta & ~v)
+        return tnum(v, alpha & beta & ~v, self.width)
 
     #INPUT - another tnum
     #RETURN - the logical OR of this tnum and another tnum
     def tnum_or(self, other):
         v = self.min | other.min
         mu = self.range | other.range
-        return tnum(v, mu & ~v)
+        return tnum(v, mu & ~v, self.width)
 
     #INPUT - another tnum
     #RETURN - the logical XOR of this tnum and another tnum
     def tnum_xor(self, other):
         v = self.min ^ other.min
         mu = self.range | other.range
-        return tnum(v & ~mu, mu)
+        return tnum(v & ~mu, mu, self.width)
 
     #INPUT - another tnum
-    #RETURN - the intersection of this tnum and another tnum
+    #RETURN - the intersection of this tnum and another tnum (the values both of them can hold)
     def intersect(self, other):
         v = self.min | other.min
         mu = self.range & other.range
-        return tnum(v & ~mu, mu)
+        return tnum(v & ~mu, mu, self.width)
+
+    #INPUT - another tnum
+    #RETURN - the union of this tnum and another tnum (every value either of them can hold)
+    def union(self, other):
+        v = self.min & other.min
+        mu = (self.min ^ other.min) | self.range | other.range
+        return tnum(v & ~mu, mu, self.width)
+
+    #INPUT - size in bytes
+    #RETURN - this tnum cut down to its low size bytes (the rest are known 0)
+    def cast(self, size):
+        if size * 8 >= self.width:
+            return self
+        low_bytes = (1 << (size * 8)) - 1
+        return tnum(self.min & low_bytes, self.range & low_bytes, self.width)
+
+    #RETURN - the low 32 bits (the subregister) of this tnum
+    def subreg(self):
+        return self.cast(4)
+
+    #RETURN - this tnum with the low 32 bits known to be 0
+    def clear_subreg(self):
+        return self.rshift(32).lshift(32)
+
+    #INPUT - another tnum
+    #RETURN - the high bits of this tnum, with the low 32 bits of subreg
+    def with_subreg(self, subreg):
+        return self.clear_subreg().tnum_or(subreg.subreg())
+
+    #INPUT - an int (or a BitVec)
+    #RETURN - the high bits of this tnum, with the low 32 bits known to be value
+    def const_subreg(self, value):
+        return self.with_subreg(tnum(value, 0, self.width))
 
     #INPUT - another tnum
-    #RETURN - a z3 equation for if the other tnum is contained within this tnum (the values it represents are a subset of this tnum's values)
+    #RETURN - a z3 equation (or a bool) for if the other tnum is contained within this tnum (the values it represents are a subset of this tnum's values)
     def tnum_in(self, other):
         """
         if (other.range & ~self.range) is not 0:
             return False
 
             > Requirement to return True: other.range & ~self.range == 0
-            
+
             > Conceptually: Ensures no overlap between known bits of self and unknown bits of other. This means that every variable
             bit in other is also variable in self.
-        
+
         other.min &= ~self.range
 
             > Conceptually: If the bit is unknown in self, then it will be 0 in ~self.range. This will result in a 0 after the '&'
             operation for every unknown bit. Known bits in self will be 1 in ~self.range; thus, all bits in other.min at known
             locations will be propagated forward (0 & 1 = 0, 1 & 1 = 1)
-        
+
         return self.min == other.min
 
             > Requirement to return True: self.min == other.min & ~self.range
-            
+
             > Conceptually: Look at previous step. If the bit is unknown in self.range, it will always be set to 0. This is what
             we require from the tnum.min field. If th bit is known in self.range, it will be set to its value and compared against
             the value in self.min. If there's a discrepancy, then other must contain a known bit which differs from a known bit
@@ -188,116 +308,146 @@ class tnum:
         maskOverlap = other.range & ~self.range
         knownBits = other.min & ~self.range
 
-        return And((maskOverlap == 0), (self.min == knownBits))
-
-    
+        return both(maskOverlap == 0, self.min == knownBits)
 
-#works?
+#RETURN - a tnum holding exactly value
+def tnum_const(value, width = 64):
+    return tnum(value, 0, width)
 
+#RETURN - a tnum where every bit is unknown
+def tnum_unknown(width = 64):
+    return tnum(0, (1 << width) - 1, width)
 
-#INPUT - acc: tnum | value: BitVec | mask: BitVec
-#RETURN - the result of the intermediate algorithm
-def hma(acc, value, mask):
+#INPUT - unsigned bounds, ints or BitVecs
+#RETURN - a tnum holding every value from low to high
+def tnum_range(low, high, width = 64):
     """
-    half-multiply, a static intermediate step to multiply
-
-    Idea: While the mask is nonzero (it has at least one 1), check the rightmost bit. If it's a 1, then add the value to the accumulator.
-            Then, rightshift the mask (move one bit further in) and leftshift the value (you're working with the 2^n+1 bit, so multiply
-            your value by 2)
+    The bits above the highest bit where low and high differ are the same for every value in between,
+        and everything from that bit down could be anything.
 
     original code:
 
-    static struct tnum hma(struct tnum acc, u64 value, u64 mask)
-        while (mask) {
-            if (mask & 1)
-                acc = tnum_add(acc, TNUM(0, value));
-            mask >>= 1;
-            value <<= 1;
-        }
-        return acc;
-
-    ~~~~~~~~~~~~~~~~~~
-
-    our code:
+    struct tnum tnum_range(u64 min, u64 max)
+        u64 chi = min ^ max, delta;
+        u8 bits = fls64(chi);
+        if (bits > 63)
+            return tnum_unknown;
+        delta = (1ULL << bits) - 1;
+        return TNUM(min & ~delta, delta);
 
-    hma(a, v, m):
-        for i from 1 -> bitlength:
-            if mask[i] == 1
-                accumulate()
-            value <<= 1
-        return acc
-
-    Note - Objects persist across python methods, as they would in Java.
-            This means that we have to copy the values into a new object
-            before editing/using them.
-
-
-            ...or maybe not I'm not positive
+    fls64 has no z3 version, so for BitVecs every bit below the highest one is filled in by
+        ORing chi with itself shifted down 1, 2, 4, ... bits (which gives the same delta)
     """
-    
-    for i in range(0, bitLength):
-        bit = z3.Extract(i, i, mask)
-        
-        if(bit == BitVecVal(0, 1)):
-            acc = tnum_add(acc, tnum(0, value))
-
-        value <<= 1
-
-    return acc
-    
-    
+    chi = low ^ high
+    if isinstance(chi, BitVecRef):
+        shift = 1
+        while shift < chi.size():
+            chi = chi | LShR(chi, shift)
+            shift *= 2
+        delta = chi
+    else:
+        delta = (1 << chi.bit_length()) - 1
+    return tnum(low & ~delta, delta, width)
+
+#the operations ints and BitVecs don't share
+
+def logical_rshift(value, i):
+    if isinstance(value, BitVecRef):
+        return LShR(value, i)
+    return value >> i
+
+def signed_rshift(value, i, width):
+    if isinstance(value, BitVecRef):
+        if value.size() > width:
+            return ZeroExt(value.size() - width, Extract(width - 1, 0, value) >> i)
+        return value >> i
+    value &= (1 << width) - 1
+    return ((value - (value >> (width - 1) << width)) >> i) & ((1 << width) - 1)
+
+def both(first, second):
+    if isinstance(first, BoolRef) or isinstance(second, BoolRef):
+        return And(first, second)
+    return first and second
+
 #             #
 #             #
 # Tests below #
 #             #
 #             #
 
-"""
-solver = Solver()
-
-n1 = tnum(BitVecVal(12, bitLength), BitVecVal(0, bitLength))
-n2 = tnum(BitVecVal(4, bitLength), BitVecVal(0, bitLength))
-n3 = tnum(BitVec("n3_value", bitLength), BitVec("n3_range", bitLength))
-
-solver.add(n3.tnum_eq(n1.sub(n2)))
-
-if solver.check() == sat:
-   m = solver.model()
-   print(m)
-#"""
-
-
-
-#clear solver
-solver = Solver()
-num1 = tnum(BitVec("num1", bitLength), BitVecVal(0, bitLength))
-num2 = tnum(BitVec("num2", bitLength), BitVecVal(0, bitLength))
-num3 = tnum(BitVec("num3", bitLength), BitVecVal(0, bitLength))
-
-t1 = tnum(BitVec("t1_value", bitLength), BitVec("t1_mask", bitLength))
-t2 = tnum(BitVec("t2_value", bitLength), BitVec("t2_mask", bitLength))
-t3 = tnum(BitVec("t3_value", bitLength), BitVec("t3_mask", bitLength))
-
-solver.add(t1.tnum_in(num1))
-solver.add(t2.tnum_in(num2))
-solver.add(Not(t3.tnum_in(num3)))
-
-#specific operation goes here
-solver.add(num3.tnum_eq(num1.sub(num2)))
-solver.add(t3.tnum_eq(t1.sub(t2)))
-
-#check
-if solver.check() == sat:
-    m = solver.model()
-    print(m)
-else:
-    print("The subtraction operation seems to work correctly.")
-
-#"""
+#INPUT - the name of an operation, and how many bits wide to check it
+#RETURN - a counterexample model if the operation isn't sound at that width, None if z3 proved it is
+def check_soundness(operation, width = 8):
+    """
+    Sound means: for any two tnums, and any two numbers in them, the operation on the numbers
+        lands in the operation on the tnums. So Not(sound) being unsat is a proof for every
+        tnum at that width.
 
-"""
-error?
-num1 = 108 = 01101100 = 44?
-num2 = 58 =  00111000 = 58?
-num3 = 120 = 10100110 = 36?
-"""
+    These run on exactly the same methods the abstract interpreter uses, just with BitVecs in them.
+    """
+    solver = Solver()
+    num1 = BitVec("num1", width)
+    num2 = BitVec("num2", width)
+    t1 = tnum(BitVec("t1_value", width), BitVec("t1_mask", width))
+    t2 = tnum(BitVec("t2_value", width), BitVec("t2_mask", width))
+    shift = width // 2 - 1
+
+    solver.add(t1.validate(), t2.validate())
+    solver.add(t1.tnum_in(tnum(num1, 0)))
+    solver.add(t2.tnum_in(tnum(num2, 0)))
+
+    if operation == "add":
+        result, number = t1.add(t2), num1 + num2
+    elif operation == "sub":
+        result, number = t1.sub(t2), num1 - num2
+    elif operation == "mult":
+        result, number = t1.mult(t2), num1 * num2
+    elif operation == "and":
+        result, number = t1.tnum_and(t2), num1 & num2
+    elif operation == "or":
+        result, number = t1.tnum_or(t2), num1 | num2
+    elif operation == "xor":
+        result, number = t1.tnum_xor(t2), num1 ^ num2
+    elif operation == "lshift":
+        result, number = t1.lshift(shift), num1 << shift
+    elif operation == "rshift":
+        result, number = t1.rshift(shift), LShR(num1, shift)
+    elif operation == "arshift":
+        result, number = t1.arshift(shift), num1 >> shift
+    elif operation == "arshift32":
+        #a 32 bit instruction, scaled down to half of width
+        result, number = t1.arshift(shift, width // 2), ZeroExt(width // 2, Extract(width // 2 - 1, 0, num1) >> shift)
+    elif operation == "cast":
+        size = max(1, width // 16)
+        result, number = t1.cast(size), num1 & ((1 << (8 * size)) - 1)
+    elif operation == "intersect":
+        #a number in both tnums is in the intersection
+        solver.add(t2.tnum_in(tnum(num1, 0)))
+        result, number = t1.intersect(t2), num1
+    elif operation == "union":
+        #both numbers are in the union
+        result, number = t1.union(t2), num1
+        solver.add(Or(Not(result.tnum_in(tnum(num1, 0))), Not(result.tnum_in(tnum(num2, 0)))))
+        return solver.model() if solver.check() == sat else None
+    elif operation == "range":
+        #every number from low to high is in the range
+        low, high = If(ULE(num1, num2), num1, num2), If(ULE(num1, num2), num2, num1)
+        number = BitVec("num3", width)
+        solver.add(ULE(low, number), ULE(number, high))
+        result = tnum_range(low, high)
+    solver.add(Not(result.tnum_in(tnum(number, 0))))
+
+    if solver.check() == sat:
+        return solver.model()
+    return None
+
+if __name__ == "__main__":
+    for operation in ["add", "sub", "mult", "and", "or", "xor", "lshift", "rshift", "arshift", "arshift32", "cast",
+                      "intersect", "union", "range"]:
+        #mult past 8 bits doesn't finish in minutes (the published tnum_mul proofs stop at 8 bits too)
+        for width in [8, 64] if operation != "mult" else [8]:
+            counterexample = check_soundness(operation, width)
+            if counterexample is None:
+                print(f"The {operation} operation seems to work correctly at {width} bits.")
+            else:
+                print(f"The {operation} operation is wrong at {width} bits: {counterexample}")